@@ -13,6 +13,7 @@ if project_root not in sys.path:
 
 from gui.login import LoginFrame # On importe un Cadre (Frame) et non une Fenêtre
 from gui.main_window import MainView
+from gui import data_loader
 from models.database import database
 from models.auth import auth
 from models.settings import settings
@@ -25,7 +26,8 @@ class App(ctk.CTk):
         loaded_settings = settings.load_settings()
         settings.apply_settings(loaded_settings)
 
-        # Initialisation de la BDD
+        # Initialisation de la BDD (profil de connexion lu dans settings.json)
+        database.set_database_profile(loaded_settings.get("database"))
         database.initialize_database()
         auth.add_first_admin_user()
 
@@ -83,6 +85,8 @@ class App(ctk.CTk):
         self.geometry(f"{window_width}x{window_height}+{center_x}+{center_y}")
 
     def on_closing(self):
+        data_loader.shutdown()
+        database.close_connection()
         self.destroy()
 
 
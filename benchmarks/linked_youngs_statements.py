@@ -0,0 +1,84 @@
+# Fichier : benchmarks/linked_youngs_statements.py
+# Description : Compte les requêtes SQL exécutées par les listes qui résolvent les jeunes liés
+#               (transmissions, trajets) et échoue si ce nombre grandit avec le nombre de lignes.
+#               Travaille sur une base temporaire, jamais sur mecs_app.db.
+#               Usage : python benchmarks/linked_youngs_statements.py
+
+import math
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.database import database
+from models.database.links import MAX_IDS_PER_QUERY
+from models.transmissions.transmissions import get_transmissions_for_period, get_latest_transmissions
+from models.trips.trips import get_all_trips
+
+SIZES = (10, 100, 1200)
+DAY = "2024-03-04"
+
+def fill_database(nb_rows):
+    """Crée nb_rows transmissions du jour DAY et nb_rows trajets, chacun lié à deux jeunes."""
+    with database.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO services (id, nom_service) VALUES (1, 'Service test')")
+        cursor.execute("INSERT INTO users (id, nom, prenom, identifiant, mot_de_passe, niveau_authentification, service_id) "
+                       "VALUES (1, 'Martin', 'Léa', 'lmartin', '-', 'admin', 1)")
+        cursor.execute("INSERT INTO vehicles (id, marque, modele, plaque_immatriculation, nombre_places) VALUES (1, 'Renault', 'Trafic', 'AA-000-AA', 9)")
+        cursor.executemany("INSERT INTO youngs (id, nom, prenom, statut_accueil, service_id) VALUES (?, ?, ?, 'accueilli', 1)",
+                           [(i, f"Élève{i}", f"Prénom{i}") for i in range(1, 21)])
+        for i in range(1, nb_rows + 1):
+            cursor.execute("INSERT INTO transmissions (id, service_id, user_id, datetime_transmission, categorie, contenu) "
+                           "VALUES (?, 1, 1, ?, 'Quotidien', 'Transmission de test')", (i, f"{DAY} {i % 24:02d}:{i % 60:02d}"))
+            cursor.execute("INSERT INTO trips (id, date_trajet, heure_depart, heure_retour, service_id, user_id, vehicle_id, km_depart, km_retour) "
+                           "VALUES (?, ?, '09:00', '10:00', 1, 1, 1, 0, 10)", (i, DAY))
+            for young_id in (i % 20 + 1, (i + 7) % 20 + 1):
+                cursor.execute("INSERT INTO transmission_young_link (transmission_id, young_id) VALUES (?, ?)", (i, young_id))
+                cursor.execute("INSERT INTO trip_young_link (trip_id, young_id) VALUES (?, ?)", (i, young_id))
+        conn.commit()
+
+def count_statements(func, *args):
+    """Exécute func(*args) et retourne (nombre de requêtes, durée en ms, nombre de lignes)."""
+    statements = []
+    with database.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            start = time.perf_counter()
+            rows = func(*args)
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            conn.set_trace_callback(None)
+    return len(statements), elapsed, len(rows)
+
+def main():
+    failures = []
+    for nb_rows in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            database.DATABASE_NAME = os.path.join(directory, "bench.db")
+            database.initialize_database()
+            fill_database(nb_rows)
+
+            # Une requête pour les lignes, puis une par lot de MAX_IDS_PER_QUERY identifiants
+            expected = 1 + math.ceil(nb_rows / MAX_IDS_PER_QUERY)
+            cases = [
+                ("get_transmissions_for_period", get_transmissions_for_period, (DAY, DAY, 1), expected),
+                ("get_latest_transmissions", get_latest_transmissions, (15, 1), 2),
+                ("get_all_trips", get_all_trips, (), expected),
+            ]
+            for name, func, args, max_statements in cases:
+                nb_statements, elapsed, nb_results = count_statements(func, *args)
+                status = "ok" if nb_statements <= max_statements else "ÉCHEC"
+                print(f"{name:30} {nb_rows:5} lignes : {nb_statements:3} requêtes (max {max_statements}), "
+                      f"{nb_results:5} résultats, {elapsed:7.2f} ms  {status}")
+                if nb_statements > max_statements:
+                    failures.append(name)
+            database.close_connection()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
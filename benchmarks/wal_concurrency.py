@@ -0,0 +1,74 @@
+# Fichier : benchmarks/wal_concurrency.py
+# Description : Compare la concurrence lecture/écriture entre deux connexions selon le mode
+#               de journal (DELETE, l'ancien comportement, puis WAL) avec le profil de connexion
+#               de l'application. Travaille sur une base temporaire, jamais sur mecs_app.db.
+#               Usage : python benchmarks/wal_concurrency.py [durée par mode en secondes]
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.database import database
+
+NB_ROWS = 50000
+
+def prepare_database():
+    conn = database.create_connection()
+    conn.execute("CREATE TABLE bench (id INTEGER PRIMARY KEY, contenu TEXT NOT NULL)")
+    conn.executemany("INSERT INTO bench (contenu) VALUES (?)", (("x" * 200,) for _ in range(NB_ROWS)))
+    conn.commit()
+    conn.close()
+
+def run(journal_mode, duration):
+    with tempfile.TemporaryDirectory() as directory:
+        database.DATABASE_NAME = os.path.join(directory, "bench.db")
+        database.set_database_profile({"journal_mode": journal_mode})
+        prepare_database()
+        timings = measure(duration)
+
+    print(f"journal_mode={journal_mode}")
+    for name, values in timings.items():
+        values.sort()
+        mean = sum(values) / len(values) * 1000
+        p95 = values[int(len(values) * 0.95)] * 1000
+        print(f"  {name:9} : {len(values) / duration:8.1f} op/s   moyenne {mean:7.2f} ms   p95 {p95:7.2f} ms   max {values[-1] * 1000:7.2f} ms")
+
+def measure(duration):
+    """Un poste lit la table entière en boucle pendant qu'un autre enregistre des lignes une à une."""
+    stop = threading.Event()
+    timings = {'lecture': [], 'écriture': []}
+
+    def reader():
+        conn = database.create_connection()
+        while not stop.is_set():
+            start = time.perf_counter()
+            conn.execute("SELECT SUM(length(contenu)) FROM bench").fetchone()
+            timings['lecture'].append(time.perf_counter() - start)
+        conn.close()
+
+    def writer():
+        conn = database.create_connection()
+        while not stop.is_set():
+            start = time.perf_counter()
+            conn.execute("INSERT INTO bench (contenu) VALUES (?)", ("y" * 200,))
+            conn.commit()
+            timings['écriture'].append(time.perf_counter() - start)
+        conn.close()
+
+    threads = [threading.Thread(target=reader), threading.Thread(target=writer)]
+    for thread in threads: thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads: thread.join()
+    return timings
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for mode in ("DELETE", "WAL"):
+        run(mode, duration)
@@ -1,16 +1,18 @@
 # Fichier : gui/agenda_view.py
-# Description : Interface graphique de l'agenda hebdomadaire (Version Stable).
+# Description : Interface graphique de l'agenda (vues journée, semaine et mois).
 
 import customtkinter as ctk
 from tkinter import Menu, messagebox
-from datetime import date, timedelta, datetime
+from datetime import date, timedelta
 import locale
 from .event_form import EventForm
 from .calendar_popup import CalendarPopup
-from models.events.events import get_events_for_period, delete_event
-from models.tasks_hebdo.tasks_hebdo import get_tasks_for_day
+from models.events.events import get_events_by_day, delete_event, add_event_exception
+from models.tasks_hebdo.tasks_hebdo import get_week_schedule
 from models.permissions.permissions import get_user_details
 from models.services.services import get_all_services_for_form
+from . import data_loader
+from .period_cache import PeriodCache
 
 try:
     locale.setlocale(locale.LC_TIME, 'fr_FR.UTF-8')
@@ -20,6 +22,17 @@ except locale.Error:
     except locale.Error:
         print("Locale 'fr_FR' non disponible.")
 
+# Nombre d'événements affichés dans une case de la vue mensuelle avant le renvoi "+ n autres"
+MONTH_CELL_MAX_EVENTS = 3
+VIEW_MODES = {"Journée": "day", "Semaine": "week", "Mois": "month"}
+
+def shift_month(day, months):
+    """Décale une date d'un nombre de mois en ramenant le jour au dernier jour du mois si besoin."""
+    month_index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(month_index, 12)
+    next_month_start = date(year + (month + 1) // 12, (month + 1) % 12 + 1, 1)
+    return date(year, month + 1, min(day.day, (next_month_start - timedelta(days=1)).day))
+
 class AgendaView(ctk.CTkFrame):
     def __init__(self, parent, user_info):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
@@ -32,6 +45,8 @@ class AgendaView(ctk.CTkFrame):
         self.current_date = date.today()
         self.view_mode = "week" 
         self.selected_service_id = None
+        # Période affichée et périodes voisines préchargées (voir gui/period_cache.py)
+        self.period_cache = PeriodCache(self.load_period_data, ('events', 'tasks_hebdo', 'youngs'))
         
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
@@ -69,8 +84,9 @@ class AgendaView(ctk.CTkFrame):
         right_nav_frame.grid(row=0, column=2, sticky="e")
         self.today_button = ctk.CTkButton(right_nav_frame, text="Aujourd'hui", command=self.go_to_today, height=28)
         self.today_button.pack(side="left", padx=10)
-        self.toggle_view_button = ctk.CTkButton(right_nav_frame, text="Vue Journée", command=self.toggle_view, height=28)
-        self.toggle_view_button.pack(side="left", padx=10)
+        self.view_selector = ctk.CTkSegmentedButton(right_nav_frame, values=list(VIEW_MODES), command=self.on_view_mode_change, height=28)
+        self.view_selector.set("Semaine")
+        self.view_selector.pack(side="left", padx=10)
         
         self.calendar_container = ctk.CTkFrame(self, fg_color="transparent")
         self.calendar_container.grid(row=1, column=0, padx=5, pady=5, sticky="nsew")
@@ -84,6 +100,13 @@ class AgendaView(ctk.CTkFrame):
         self.day_view_frame.grid_rowconfigure(0, weight=1)
         self.day_view_frame.grid_columnconfigure(0, weight=1)
         
+        self.month_view_frame = ctk.CTkFrame(self.calendar_container, fg_color="transparent")
+        for i in range(7):
+            self.month_view_frame.grid_columnconfigure(i, weight=1, uniform="month_column")
+            ctk.CTkLabel(self.month_view_frame, text=(date(2024, 1, 1) + timedelta(days=i)).strftime('%A').capitalize(),
+                         font=ctk.CTkFont(weight="bold")).grid(row=0, column=i, sticky="ew")
+        self.month_cells = []
+
         self.day_widgets = []
         for i in range(7):
             container = ctk.CTkFrame(self.week_view_frame, border_width=1)
@@ -101,29 +124,68 @@ class AgendaView(ctk.CTkFrame):
 
     def update_view_layout(self):
         """Ajuste la visibilité des cadres et les textes des boutons."""
+        for frame in (self.day_view_frame, self.week_view_frame, self.month_view_frame):
+            frame.grid_forget()
         if self.view_mode == "week":
-            self.day_view_frame.grid_forget()
             self.week_view_frame.grid(row=0, column=0, sticky="nsew")
-            self.toggle_view_button.configure(text="Vue Journée")
             start_of_week = self.current_date - timedelta(days=self.current_date.weekday())
             self.date_label.configure(text=f"Semaine du {start_of_week.strftime('%d/%m/%Y')} au {(start_of_week + timedelta(days=6)).strftime('%d/%m/%Y')}")
             self.update_week_content()
         elif self.view_mode == "day":
-            self.week_view_frame.grid_forget()
             self.day_view_frame.grid(row=0, column=0, sticky="nsew")
-            self.toggle_view_button.configure(text="Vue Semaine")
             self.date_label.configure(text=self.current_date.strftime('%A %d %B %Y').capitalize())
             self.update_day_view_content()
+        elif self.view_mode == "month":
+            self.month_view_frame.grid(row=0, column=0, sticky="nsew")
+            self.date_label.configure(text=self.current_date.strftime('%B %Y').capitalize())
+            self.update_month_content()
+
+    def period_for(self, day):
+        """Renvoie (premier jour, nombre de jours) de la période de la vue courante qui contient 'day'."""
+        if self.view_mode == "day":
+            return day, 1
+        if self.view_mode == "week":
+            return day - timedelta(days=day.weekday()), 7
+        # Mois : grille de semaines complètes, du lundi au dimanche
+        first_of_month = day.replace(day=1)
+        grid_start = first_of_month - timedelta(days=first_of_month.weekday())
+        last_of_month = shift_month(first_of_month, 1) - timedelta(days=1)
+        nb_days = (last_of_month - grid_start).days + 1
+        return grid_start, nb_days + (7 - nb_days % 7) % 7
+
+    def period_key(self, day):
+        """Clé du cache de navigation (arguments de load_period_data) pour la période contenant 'day'."""
+        start, nb_days = self.period_for(day)
+        user_service_id = self.user_service_id if self.view_mode != "month" else None
+        return (start, nb_days, self.selected_service_id, user_service_id)
+
+    def shifted_date(self, step):
+        """Date courante décalée d'une période (step = 1 ou -1) selon la vue affichée."""
+        if self.view_mode == "month":
+            return shift_month(self.current_date, step)
+        return self.current_date + timedelta(days=step * (1 if self.view_mode == "day" else 7))
+
+    def prefetch_neighbours(self):
+        """Précharge en arrière-plan les périodes précédente et suivante."""
+        self.period_cache.prefetch(self, [self.period_key(self.shifted_date(step)) for step in (-1, 1)])
 
     def update_week_content(self):
-        start_of_week = self.current_date - timedelta(days=self.current_date.weekday())
-        week_events = get_events_for_period(start_of_week.isoformat(), (start_of_week + timedelta(days=6)).isoformat(), service_id=self.selected_service_id)
+        key = self.period_key(self.current_date)
+        start_of_week = key[0]
         
         for i in range(7):
             self.week_view_frame.grid_columnconfigure(i, weight=1, uniform="day_column")
-            day_date = start_of_week + timedelta(days=i)
             self.day_widgets[i]["container"].grid(row=0, column=i, sticky="nsew", padx=2, pady=2)
-            self.create_day_column_content(self.day_widgets[i]["container"], day_date, week_events)
+        if not self.period_cache.load(self, key, lambda data: self.on_week_data_loaded(start_of_week, data), async_key="agenda"):
+            for i in range(7):
+                data_loader.show_loading(self.day_widgets[i]["container"])
+
+    def on_week_data_loaded(self, start_of_week, data):
+        events_by_day, week_schedule = data
+        for i in range(7):
+            day_date = start_of_week + timedelta(days=i)
+            self.create_day_column_content(self.day_widgets[i]["container"], day_date, events_by_day.get(day_date.isoformat(), []), week_schedule)
+        self.prefetch_neighbours()
     
     def update_day_view_content(self):
         for widget in self.day_view_frame.winfo_children(): widget.destroy()
@@ -131,9 +193,75 @@ class AgendaView(ctk.CTkFrame):
         day_container = ctk.CTkFrame(self.day_view_frame, border_width=1)
         day_container.grid(row=0, column=0, sticky="nsew")
         
-        self.create_day_column_content(day_container, self.current_date)
+        day_date = self.current_date
+        if not self.period_cache.load(self, self.period_key(day_date), lambda data: self.on_day_data_loaded(day_container, day_date, data),
+                                      async_key="agenda"):
+            data_loader.show_loading(day_container)
 
-    def create_day_column_content(self, container, day_date, events_list=None):
+    def on_day_data_loaded(self, day_container, day_date, data):
+        events_by_day, week_schedule = data
+        self.create_day_column_content(day_container, day_date, events_by_day.get(day_date.isoformat(), []), week_schedule)
+        self.prefetch_neighbours()
+
+    def update_month_content(self):
+        """Affiche le mois courant sur une grille de semaines complètes (du lundi au dimanche)."""
+        key = self.period_key(self.current_date)
+        grid_start, nb_days = key[0], key[1]
+        month = self.current_date.month
+
+        for cell in self.month_cells: cell.destroy()
+        self.month_cells = []
+        for i in range(6):
+            self.month_view_frame.grid_rowconfigure(i + 1, weight=1 if i < nb_days // 7 else 0)
+
+        if not self.period_cache.load(self, key, lambda data: self.on_month_data_loaded(grid_start, nb_days, month, data[0]), async_key="agenda"):
+            loading = ctk.CTkLabel(self.month_view_frame, text="Chargement...", text_color="gray")
+            loading.grid(row=1, column=0, columnspan=7, pady=20)
+            self.month_cells.append(loading)
+
+    def on_month_data_loaded(self, grid_start, nb_days, month, events_by_day):
+        for cell in self.month_cells: cell.destroy()
+        self.month_cells = []
+        today = date.today()
+        for i in range(nb_days):
+            day_date = grid_start + timedelta(days=i)
+            cell = ctk.CTkFrame(self.month_view_frame, border_width=2 if day_date == today else 1,
+                                border_color=ctk.ThemeManager.theme["CTkButton"]["fg_color"][0] if day_date == today else "gray20")
+            cell.grid(row=i // 7 + 1, column=i % 7, sticky="nsew", padx=1, pady=1)
+            self.month_cells.append(cell)
+
+            ctk.CTkButton(cell, text=str(day_date.day), width=28, height=20, fg_color="transparent",
+                          text_color=("gray10", "gray90") if day_date.month == month else "gray50",
+                          command=lambda d=day_date: self.show_day(d)).pack(anchor="nw", padx=2, pady=2)
+
+            day_events = events_by_day.get(day_date.isoformat(), [])
+            for event in day_events[:MONTH_CELL_MAX_EVENTS]:
+                ctk.CTkButton(cell, text=f"{event['debut_dt'].strftime('%H:%M')} {event['nom_evenement']}", anchor="w",
+                              height=18, font=ctk.CTkFont(size=10),
+                              command=lambda eid=event['id']: self.open_event_form(event_id=eid)).pack(fill="x", padx=2, pady=1)
+            if len(day_events) > MONTH_CELL_MAX_EVENTS:
+                ctk.CTkLabel(cell, text=f"+ {len(day_events) - MONTH_CELL_MAX_EVENTS} autres", font=ctk.CTkFont(size=10),
+                             text_color="gray").pack(anchor="w", padx=4)
+        self.prefetch_neighbours()
+
+    def show_day(self, day_date):
+        """Ouvre la vue journée sur le jour choisi dans la vue mensuelle."""
+        self.current_date = day_date
+        self.view_selector.set("Journée")
+        self.on_view_mode_change("Journée")
+
+    @staticmethod
+    def load_period_data(start_date, nb_days, service_id, user_service_id):
+        """
+        Récupère les événements de la période regroupés par jour et le planning des tâches hebdomadaires
+        (une requête pour toute la semaine, mise en cache par service). Exécutée hors du thread Tk.
+        """
+        end_date = start_date + timedelta(days=nb_days - 1)
+        events_by_day = get_events_by_day(start_date, end_date, service_id=service_id)
+        week_schedule = get_week_schedule(user_service_id) if user_service_id else None
+        return events_by_day, week_schedule
+
+    def create_day_column_content(self, container, day_date, day_events=None, week_schedule=None):
         for widget in container.winfo_children(): widget.destroy()
         
         container.grid_rowconfigure(2, weight=1); container.grid_columnconfigure(0, weight=1)
@@ -144,11 +272,12 @@ class AgendaView(ctk.CTkFrame):
         events_scroll = ctk.CTkScrollableFrame(container, label_text="")
         events_scroll.grid(row=2, column=0, padx=5, pady=5, sticky="nsew")
         
-        if events_list is None:
-            events_list = get_events_for_period(day_date.isoformat(), day_date.isoformat(), service_id=self.selected_service_id)
+        if day_events is None:
+            day_events = get_events_by_day(day_date, day_date, service_id=self.selected_service_id)[day_date.isoformat()]
         
-        day_name_fr = day_date.strftime("%A").lower()
-        hebdo_tasks = get_tasks_for_day(day_name_fr, self.user_service_id) if self.user_service_id else []
+        if week_schedule is None and self.user_service_id:
+            week_schedule = get_week_schedule(self.user_service_id)
+        hebdo_tasks = week_schedule[day_date.weekday()] if week_schedule else []
         if hebdo_tasks:
             for task in hebdo_tasks: ctk.CTkLabel(hebdo_frame, text=f"- {task[1]}", anchor="w", font=ctk.CTkFont(size=11)).pack(fill="x", padx=5, pady=1)
         else:
@@ -157,37 +286,43 @@ class AgendaView(ctk.CTkFrame):
         add_button = ctk.CTkButton(events_scroll, text="+ Ajouter", height=20, command=lambda d=day_date: self.open_event_form(initial_date=d))
         add_button.pack(fill="x", padx=5, pady=5)
         
-        events_for_this_day = [e for e in events_list if datetime.fromisoformat(e['debut_datetime']).date() == day_date]
-        for event in sorted(events_for_this_day, key=lambda e: e['debut_datetime']):
+        for event in day_events:
             event_id = event.get('id')
             nom = event.get('nom_evenement')
-            debut_dt = datetime.fromisoformat(event['debut_datetime'])
+            debut_dt = event['debut_dt']
             young_names = event.get('young_names')
             
             display_text = f"{debut_dt.strftime('%H:%M')} - {nom}"
+            if event.get('recurrent'): display_text += " ↻"
             if young_names: display_text += f"\n({young_names})"
             event_widget = ctk.CTkButton(events_scroll, text=display_text, anchor="w", command=lambda eid=event_id: self.open_event_form(event_id=eid))
             event_widget.pack(fill="x", padx=5, pady=(0, 3))
             
             context_menu = Menu(event_widget, tearoff=0)
             context_menu.add_command(label="Modifier", command=lambda eid=event_id: self.open_event_form(event_id=eid))
-            context_menu.add_command(label="Supprimer", command=lambda eid=event_id: self.delete_event_action(eid))
+            if event.get('recurrent'):
+                context_menu.add_command(label="Supprimer cette occurrence",
+                                         command=lambda eid=event_id, day=event['date_occurrence']: self.delete_occurrence_action(eid, day))
+                context_menu.add_command(label="Supprimer toute la série", command=lambda eid=event_id: self.delete_event_action(eid))
+            else:
+                context_menu.add_command(label="Supprimer", command=lambda eid=event_id: self.delete_event_action(eid))
             event_widget.bind("<Button-3>", lambda e, menu=context_menu: menu.tk_popup(e.x_root, e.y_root))
 
         if day_date == date.today(): container.configure(border_color=ctk.ThemeManager.theme["CTkButton"]["fg_color"][0], border_width=2)
         else: container.configure(border_color="gray20", border_width=1)
             
-    def toggle_view(self):
-        self.view_mode = "day" if self.view_mode == "week" else "week"
+    def on_view_mode_change(self, choice):
+        self.view_mode = VIEW_MODES[choice]
         self.update_agenda_display()
 
-    def go_to_previous(self):
-        self.current_date -= timedelta(days=1 if self.view_mode == "day" else 7)
+    def shift_period(self, step):
+        """Avance (step = 1) ou recule (step = -1) d'une période selon la vue affichée."""
+        self.current_date = self.shifted_date(step)
         self.update_agenda_display()
 
-    def go_to_next(self):
-        self.current_date += timedelta(days=1 if self.view_mode == "day" else 7)
-        self.update_agenda_display()
+    def go_to_previous(self): self.shift_period(-1)
+
+    def go_to_next(self): self.shift_period(1)
         
     def go_to_today(self): self.current_date = date.today(); self.update_agenda_display()
     
@@ -205,4 +340,11 @@ class AgendaView(ctk.CTkFrame):
         if messagebox.askyesno("Confirmation", "Supprimer cet événement ?", parent=self):
             if delete_event(event_id): self.update_agenda_display()
             else: messagebox.showerror("Erreur", "La suppression a échoué.", parent=self)
-    def refresh_list(self): self.update_agenda_display()
+    def delete_occurrence_action(self, event_id, occurrence_date):
+        if messagebox.askyesno("Confirmation", "Supprimer cette occurrence de l'événement récurrent ?", parent=self):
+            if add_event_exception(event_id, occurrence_date): self.update_agenda_display()
+            else: messagebox.showerror("Erreur", "La suppression a échoué.", parent=self)
+    def refresh_list(self):
+        # Rafraîchissement explicite : la période affichée est relue, seules les voisines restent en cache
+        self.period_cache.discard(self.period_key(self.current_date))
+        self.update_agenda_display()
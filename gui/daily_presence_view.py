@@ -7,6 +7,8 @@ from datetime import date, timedelta
 from models.daily_life.daily_life import get_presence_for_date, save_day_presence, save_professional_meals
 from models.permissions.permissions import get_all_users, get_users_for_service
 from utils import date_util
+from .keyed_rows import KeyedRows
+from .period_cache import PeriodCache
 import locale
 
 try:
@@ -25,8 +27,12 @@ class DailyPresenceView(ctk.CTkFrame):
         self.service_id_filter = None
 
         self.current_date = date.today()
-        self.young_row_widgets = []
-        self.pro_row_widgets = []
+        # Jour dont les valeurs sont affichées (diffère de current_date pendant un chargement)
+        self.displayed_date = None
+        self.presence_cache = PeriodCache(get_presence_for_date, ('daily_life', 'youngs'))
+        self.presence_options = ['Présent (journée)', 'Présent (midi)', 'Présent (soir)', 'Absent (journée)', 'Permis famille', 'Fugue', 'Hôpital']
+        self.young_meal_options = ['normal', 'sans_porc', 'vegetarien', 'aucun']
+        self.pro_meal_options = ['aucun', 'normal', 'sans_porc', 'vegetarien']
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1) # Cadre des jeunes
@@ -54,6 +60,17 @@ class DailyPresenceView(ctk.CTkFrame):
         self.pro_scroll_frame = ctk.CTkScrollableFrame(self, label_text="Repas des Professionnels")
         self.pro_scroll_frame.grid(row=2, column=0, padx=10, pady=5, sticky="nsew")
         self.pro_scroll_frame.grid_columnconfigure((1, 2), weight=1)
+
+        for i, header in enumerate(["Jeune", "Statut de Présence", "Repas Midi", "Repas Soir"]):
+            ctk.CTkLabel(self.young_scroll_frame, text=header, font=ctk.CTkFont(weight="bold")).grid(row=0, column=i, padx=5, pady=5, sticky="ew")
+        for i, header in enumerate(["Professionnel", "Repas Midi", "Repas Soir"]):
+            ctk.CTkLabel(self.pro_scroll_frame, text=header, font=ctk.CTkFont(weight="bold")).grid(row=0, column=i, padx=5, pady=5, sticky="ew")
+
+        # Les lignes sont réconciliées par identifiant : un rafraîchissement ne recrée que ce qui a changé.
+        self.young_rows = KeyedRows(self.young_scroll_frame, key=lambda y: y['young_id'], create_row=self.create_young_row,
+                                    update_row=self.update_young_row, first_row=1, empty_text="Aucun jeune accueilli.")
+        self.pro_rows = KeyedRows(self.pro_scroll_frame, key=lambda u: u['user_id'], create_row=self.create_pro_row,
+                                  update_row=self.update_pro_row, first_row=1, empty_text="Aucun professionnel.")
         
         # --- Bouton de sauvegarde unique ---
         save_button = ctk.CTkButton(self, text="Enregistrer Toutes les Modifications", command=self.save_all_changes)
@@ -72,77 +89,78 @@ class DailyPresenceView(ctk.CTkFrame):
         self.populate_pros_meals()
     
     def populate_youngs_presence(self):
-        for widget in self.young_scroll_frame.winfo_children(): widget.destroy()
-        self.young_row_widgets.clear()
-        
-        headers = ["Jeune", "Statut de Présence", "Repas Midi", "Repas Soir"]
-        for i, header in enumerate(headers):
-            ctk.CTkLabel(self.young_scroll_frame, text=header, font=ctk.CTkFont(weight="bold")).grid(row=0, column=i, padx=5, pady=5, sticky="ew")
-
-        day_data = get_presence_for_date(self.current_date.isoformat(), service_id=self.service_id_filter)
-        presence_options = ['Présent (journée)', 'Présent (midi)', 'Présent (soir)', 'Absent (journée)', 'Permis famille', 'Fugue', 'Hôpital']
-        meal_options = ['normal', 'sans_porc', 'vegetarien', 'aucun']
-
-        for i, young_data in enumerate(day_data, start=1):
-            row = {"young_id": young_data['young_id']}
-            row['name_label'] = ctk.CTkLabel(self.young_scroll_frame, text=f"{young_data['prenom']} {young_data['nom'].upper()}")
-            row['name_label'].grid(row=i, column=0, padx=5, pady=5, sticky="w")
-            
-            row['presence_menu'] = ctk.CTkOptionMenu(self.young_scroll_frame, values=presence_options, command=lambda c, y_id=row['young_id']: self.on_presence_change(c, y_id))
-            status = young_data.get('presence_status', 'Présent (journée)')
-            row['presence_menu'].set(status)
-            row['presence_menu'].grid(row=i, column=1, padx=5, pady=5, sticky="ew")
-            
-            row['midi_menu'] = ctk.CTkOptionMenu(self.young_scroll_frame, values=meal_options)
-            row['midi_menu'].set(young_data.get('repas_midi', 'normal'))
-            row['midi_menu'].grid(row=i, column=2, padx=5, pady=5, sticky="ew")
-            
-            row['soir_menu'] = ctk.CTkOptionMenu(self.young_scroll_frame, values=meal_options)
-            row['soir_menu'].set(young_data.get('repas_soir', 'normal'))
-            row['soir_menu'].grid(row=i, column=3, padx=5, pady=5, sticky="ew")
-            
-            self.young_row_widgets.append(row)
-            self.on_presence_change(status, young_data['young_id'])
+        shown_date = self.current_date
+        key = (shown_date.isoformat(), self.service_id_filter)
+        if not self.presence_cache.load(self, key, lambda day_data: self.display_youngs_presence(shown_date, key[1], day_data), async_key="presence"):
+            self.young_rows.show_message("Chargement...")
+
+    def display_youngs_presence(self, shown_date, service_id, day_data):
+        # La date fait partie de l'élément : changer de jour réapplique les valeurs même si elles sont identiques.
+        self.young_rows.reconcile([dict(young_data, date=shown_date) for young_data in day_data])
+        self.displayed_date = shown_date
+        self.presence_cache.prefetch(self, [((shown_date + timedelta(days=step)).isoformat(), service_id) for step in (-1, 1)])
+
+    def create_young_row(self, container, i):
+        row = {}
+        row['name_label'] = ctk.CTkLabel(container, text="")
+        row['name_label'].grid(row=i, column=0, padx=5, pady=5, sticky="w")
+        row['presence_menu'] = ctk.CTkOptionMenu(container, values=self.presence_options)
+        row['presence_menu'].grid(row=i, column=1, padx=5, pady=5, sticky="ew")
+        row['midi_menu'] = ctk.CTkOptionMenu(container, values=self.young_meal_options)
+        row['midi_menu'].grid(row=i, column=2, padx=5, pady=5, sticky="ew")
+        row['soir_menu'] = ctk.CTkOptionMenu(container, values=self.young_meal_options)
+        row['soir_menu'].grid(row=i, column=3, padx=5, pady=5, sticky="ew")
+        return row
+
+    def update_young_row(self, row, young_data):
+        row['young_id'] = young_data['young_id']
+        row['name_label'].configure(text=f"{young_data['prenom']} {young_data['nom'].upper()}")
+        row['presence_menu'].configure(command=lambda c, r=row: self.apply_presence_state(r, c))
+        status = young_data.get('presence_status', 'Présent (journée)')
+        row['presence_menu'].set(status)
+        row['midi_menu'].set(young_data.get('repas_midi', 'normal'))
+        row['soir_menu'].set(young_data.get('repas_soir', 'normal'))
+        self.apply_presence_state(row, status)
             
     def populate_pros_meals(self):
-        for widget in self.pro_scroll_frame.winfo_children(): widget.destroy()
-        self.pro_row_widgets.clear()
-        
-        headers = ["Professionnel", "Repas Midi", "Repas Soir"]
-        for i, header in enumerate(headers):
-            ctk.CTkLabel(self.pro_scroll_frame, text=header, font=ctk.CTkFont(weight="bold")).grid(row=0, column=i, padx=5, pady=5, sticky="ew")
-
         all_users = get_users_for_service(self.service_id_filter) if self.service_id_filter else get_all_users()
-        meal_options = ['aucun', 'normal', 'sans_porc', 'vegetarien']
-        for i, user in enumerate(all_users, start=1):
-            widgets = {'user_id': user[0]}
-            ctk.CTkLabel(self.pro_scroll_frame, text=f"{user[2]} {user[1].upper()}").grid(row=i, column=0, padx=5, pady=5, sticky="w")
-            widgets['midi_menu'] = ctk.CTkOptionMenu(self.pro_scroll_frame, values=meal_options); widgets['midi_menu'].grid(row=i, column=1, padx=5, pady=5, sticky="ew")
-            widgets['soir_menu'] = ctk.CTkOptionMenu(self.pro_scroll_frame, values=meal_options); widgets['soir_menu'].grid(row=i, column=2, padx=5, pady=5, sticky="ew")
-            self.pro_row_widgets.append(widgets)
-
-    def on_presence_change(self, choice, young_id):
-        for row in self.young_row_widgets:
-            if row['young_id'] == young_id:
-                midi_state = "disabled"; soir_state = "disabled"
-                if "Présent (journée)" in choice: midi_state = "normal"; soir_state = "normal"
-                elif "Présent (midi)" in choice: midi_state = "normal"
-                elif "Présent (soir)" in choice: soir_state = "normal"
-                row['midi_menu'].configure(state=midi_state)
-                row['soir_menu'].configure(state=soir_state)
-                break
+        self.pro_rows.reconcile([{'user_id': user[0], 'prenom': user[2], 'nom': user[1], 'date': self.current_date} for user in all_users])
+
+    def create_pro_row(self, container, i):
+        widgets = {}
+        widgets['name_label'] = ctk.CTkLabel(container, text=""); widgets['name_label'].grid(row=i, column=0, padx=5, pady=5, sticky="w")
+        widgets['midi_menu'] = ctk.CTkOptionMenu(container, values=self.pro_meal_options); widgets['midi_menu'].grid(row=i, column=1, padx=5, pady=5, sticky="ew")
+        widgets['soir_menu'] = ctk.CTkOptionMenu(container, values=self.pro_meal_options); widgets['soir_menu'].grid(row=i, column=2, padx=5, pady=5, sticky="ew")
+        return widgets
+
+    def update_pro_row(self, widgets, user):
+        widgets['user_id'] = user['user_id']
+        widgets['name_label'].configure(text=f"{user['prenom']} {user['nom'].upper()}")
+        widgets['midi_menu'].set(self.pro_meal_options[0])
+        widgets['soir_menu'].set(self.pro_meal_options[0])
+
+    def apply_presence_state(self, row, choice):
+        midi_state = "disabled"; soir_state = "disabled"
+        if "Présent (journée)" in choice: midi_state = "normal"; soir_state = "normal"
+        elif "Présent (midi)" in choice: midi_state = "normal"
+        elif "Présent (soir)" in choice: soir_state = "normal"
+        row['midi_menu'].configure(state=midi_state)
+        row['soir_menu'].configure(state=soir_state)
 
     def save_all_changes(self):
         """Récupère et sauvegarde toutes les données de la page."""
+        if self.displayed_date != self.current_date:
+            messagebox.showwarning("Chargement en cours", "Les présences de cette journée sont en cours de chargement.")
+            return
         youngs_data = []
-        for row in self.young_row_widgets:
+        for row in self.young_rows.rows():
             status = row['presence_menu'].get()
             midi = row['midi_menu'].get() if row['midi_menu'].cget("state") == "normal" else 'aucun'
             soir = row['soir_menu'].get() if row['soir_menu'].cget("state") == "normal" else 'aucun'
             youngs_data.append({"young_id": row['young_id'], "presence_status": status, "repas_midi": midi, "repas_soir": soir})
 
         pros_data = []
-        for row in self.pro_row_widgets:
+        for row in self.pro_rows.rows():
             pros_data.append({'user_id': row['user_id'], 'repas_midi': row['midi_menu'].get(), 'repas_soir': row['soir_menu'].get()})
 
         success_youngs = save_day_presence(self.current_date.isoformat(), youngs_data)
@@ -156,4 +174,7 @@ class DailyPresenceView(ctk.CTkFrame):
 
     def go_to_previous_day(self): self.current_date -= timedelta(days=1); self.refresh_view()
     def go_to_next_day(self): self.current_date += timedelta(days=1); self.refresh_view()
-    def refresh_list(self): self.refresh_view()
+    def refresh_list(self):
+        # Rafraîchissement explicite : le jour affiché est relu, seuls les jours voisins restent en cache
+        self.presence_cache.discard((self.current_date.isoformat(), self.service_id_filter))
+        self.refresh_view()
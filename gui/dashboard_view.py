@@ -11,6 +11,8 @@ from models.tasks.tasks import get_all_tasks_with_details
 from models.transmissions.transmissions import get_latest_transmissions
 from models.permissions.permissions import get_user_details
 from utils import date_util
+from . import data_loader
+from .keyed_rows import KeyedRows
 
 try:
     locale.setlocale(locale.LC_TIME, 'fr_FR.UTF-8')
@@ -58,70 +60,96 @@ class DashboardView(ctk.CTkFrame):
         self.transmissions_frame = ctk.CTkScrollableFrame(self.right_column_frame, label_text="💬  Dernières Transmissions")
         self.transmissions_frame.grid(row=1, column=0, sticky="nsew")
 
+        for frame in (self.agenda_frame, self.urgent_tasks_frame, self.transmissions_frame):
+            frame.grid_columnconfigure(0, weight=1)
+        self.agenda_rows = KeyedRows(self.agenda_frame, key=lambda e: (e['id'], e['debut_datetime']), create_row=self.create_event_row,
+                                     update_row=self.update_event_row, empty_text="Aucun événement pour votre service aujourd'hui.")
+        self.task_rows = KeyedRows(self.urgent_tasks_frame, key=lambda t: t['id'], create_row=self.create_task_row,
+                                   update_row=self.update_task_row, empty_text="Aucune tâche urgente.")
+        self.transmission_rows = KeyedRows(self.transmissions_frame, key=lambda t: t['id'], create_row=self.create_transmission_row,
+                                           update_row=self.update_transmission_row, empty_text="Aucune transmission récente.")
+
         self.refresh_list()
 
     def refresh_list(self):
-        """Met à jour toutes les sections du tableau de bord."""
+        """Met à jour toutes les sections du tableau de bord (requêtes exécutées en arrière-plan)."""
         service_filter = self.user_service_id if self.user_level == 'standard' else None
         
-        self.populate_agenda_today(service_filter)
-        self.populate_urgent_tasks(service_filter)
-        self.populate_latest_transmissions(service_filter)
-
-    def populate_agenda_today(self, service_id):
-        for widget in self.agenda_frame.winfo_children():
-            widget.destroy()
-            
+        # Le message de chargement n'est affiché qu'au premier affichage : ensuite les
+        # anciennes lignes restent visibles et seules les différences sont appliquées.
+        for rows in (self.agenda_rows, self.task_rows, self.transmission_rows):
+            if not rows.rendered: rows.show_message("Chargement...")
+        data_loader.run_async(self, self.load_dashboard_data, service_filter, callback=self.on_dashboard_data_loaded, key="dashboard")
+
+    @staticmethod
+    def load_dashboard_data(service_id):
+        """Récupère les données des trois sections. Exécutée hors du thread Tk."""
         today_iso = date.today().isoformat()
         events_data = get_events_for_period(today_iso, today_iso, service_id=service_id)
-        
-        if not events_data:
-            ctk.CTkLabel(self.agenda_frame, text="Aucun événement pour votre service aujourd'hui.", text_color="gray").pack(pady=20)
-            return
-
-        for event in events_data:
-            debut_dt = datetime.fromisoformat(event['debut_datetime'])
-            nom = event['nom_evenement']
-            young_names = event.get('young_names')
-            
-            text = f"{debut_dt.strftime('%H:%M')} - {nom}"
-            if young_names:
-                text += f"  ({young_names})"
-                
-            event_label = ctk.CTkLabel(self.agenda_frame, text=text, anchor="w")
-            event_label.pack(fill="x", padx=10, pady=4)
-
-    def populate_urgent_tasks(self, service_id):
-        for widget in self.urgent_tasks_frame.winfo_children(): widget.destroy()
-        all_tasks_data = get_all_tasks_with_details(service_id=service_id)
-        urgent_tasks = [task for task in all_tasks_data if task.get('statut') == 'urgent']
-        if not urgent_tasks:
-            ctk.CTkLabel(self.urgent_tasks_frame, text="Aucune tâche urgente.", text_color="gray").pack(pady=20)
-            return
-        for task in urgent_tasks:
-            date_limite_fr = date_util.format_date_to_french(task['date_limite'])
-            task_frame = ctk.CTkFrame(self.urgent_tasks_frame, fg_color="transparent")
-            task_frame.pack(fill="x", padx=5, pady=5)
-            ctk.CTkLabel(task_frame, text=f"Limite au {date_limite_fr}", font=ctk.CTkFont(size=11, weight="bold"), text_color="#D32F2F").pack(anchor="w", padx=10)
-            ctk.CTkLabel(task_frame, text=task['tache_a_realiser'], anchor="w", justify="left").pack(fill="x", anchor="w", padx=10, pady=(0,5))
-            
-    def populate_latest_transmissions(self, service_id):
-        for widget in self.transmissions_frame.winfo_children(): widget.destroy()
+        urgent_tasks = get_all_tasks_with_details(service_id=service_id, urgent_only=True)
         latest_transmissions = get_latest_transmissions(limit=15, service_id=service_id)
-        if not latest_transmissions:
-            ctk.CTkLabel(self.transmissions_frame, text="Aucune transmission récente.", text_color="gray").pack(pady=20)
-            return
-        for trans in latest_transmissions:
-            trans_frame = ctk.CTkFrame(self.transmissions_frame, fg_color="transparent")
-            trans_frame.pack(fill="x", padx=5, pady=(5, 10))
-            trans_frame.grid_columnconfigure(1, weight=1) 
+        return events_data, urgent_tasks, latest_transmissions
+
+    def on_dashboard_data_loaded(self, data):
+        events_data, urgent_tasks, latest_transmissions = data
+        self.populate_agenda_today(events_data)
+        self.populate_urgent_tasks(urgent_tasks)
+        self.populate_latest_transmissions(latest_transmissions)
+
+    def populate_agenda_today(self, events_data):
+        self.agenda_rows.reconcile(events_data)
+
+    def create_event_row(self, container, i):
+        row = {'label': ctk.CTkLabel(container, text="", anchor="w")}
+        row['label'].grid(row=i, column=0, sticky="ew", padx=10, pady=4)
+        return row
+
+    def update_event_row(self, row, event):
+        debut_dt = datetime.fromisoformat(event['debut_datetime'])
+        text = f"{debut_dt.strftime('%H:%M')} - {event['nom_evenement']}"
+        if event.get('young_names'):
+            text += f"  ({event['young_names']})"
+        row['label'].configure(text=text)
+
+    def populate_urgent_tasks(self, urgent_tasks):
+        self.task_rows.reconcile(urgent_tasks)
+
+    def create_task_row(self, container, i):
+        row = {'frame': ctk.CTkFrame(container, fg_color="transparent")}
+        row['frame'].grid(row=i, column=0, sticky="ew", padx=5, pady=5)
+        row['date_label'] = ctk.CTkLabel(row['frame'], text="", font=ctk.CTkFont(size=11, weight="bold"), text_color="#D32F2F")
+        row['date_label'].pack(anchor="w", padx=10)
+        row['task_label'] = ctk.CTkLabel(row['frame'], text="", anchor="w", justify="left")
+        row['task_label'].pack(fill="x", anchor="w", padx=10, pady=(0,5))
+        return row
+
+    def update_task_row(self, row, task):
+        date_limite_fr = date_util.format_date_to_french(task['date_limite'])
+        label = "En retard depuis le" if task['statut'] == 'en retard' else "Limite au"
+        row['date_label'].configure(text=f"{label} {date_limite_fr}")
+        row['task_label'].configure(text=task['tache_a_realiser'])
             
-            color_dot = ctk.CTkFrame(trans_frame, fg_color=self.color_map.get(trans.get('couleur'), "gray50"), width=10, height=10, corner_radius=5)
-            color_dot.grid(row=0, column=0, rowspan=3, padx=(5,10), sticky="ns")
+    def populate_latest_transmissions(self, latest_transmissions):
+        self.transmission_rows.reconcile(latest_transmissions)
 
-            dt_obj = datetime.fromisoformat(trans['datetime_transmission'])
-            header_text = f"{dt_obj.strftime('%d/%m %H:%M')} - {trans['nom_service']} - par {trans['user_prenom']}"
-            ctk.CTkLabel(trans_frame, text=header_text, font=ctk.CTkFont(size=11, slant="italic"), text_color="gray").grid(row=0, column=1, sticky="w")
-            
-            ctk.CTkLabel(trans_frame, text=f"Concernés : {trans.get('linked_youngs', 'Général')}", font=ctk.CTkFont(size=11, weight="bold")).grid(row=1, column=1, sticky="w")
-            ctk.CTkLabel(trans_frame, text=trans['contenu'], wraplength=300, justify="left", anchor="w").grid(row=2, column=1, sticky="w", pady=(2,0))
+    def create_transmission_row(self, container, i):
+        row = {'frame': ctk.CTkFrame(container, fg_color="transparent")}
+        row['frame'].grid(row=i, column=0, sticky="ew", padx=5, pady=(5, 10))
+        row['frame'].grid_columnconfigure(1, weight=1) 
+        
+        row['color_dot'] = ctk.CTkFrame(row['frame'], width=10, height=10, corner_radius=5)
+        row['color_dot'].grid(row=0, column=0, rowspan=3, padx=(5,10), sticky="ns")
+        row['header'] = ctk.CTkLabel(row['frame'], text="", font=ctk.CTkFont(size=11, slant="italic"), text_color="gray")
+        row['header'].grid(row=0, column=1, sticky="w")
+        row['youngs'] = ctk.CTkLabel(row['frame'], text="", font=ctk.CTkFont(size=11, weight="bold"))
+        row['youngs'].grid(row=1, column=1, sticky="w")
+        row['content'] = ctk.CTkLabel(row['frame'], text="", wraplength=300, justify="left", anchor="w")
+        row['content'].grid(row=2, column=1, sticky="w", pady=(2,0))
+        return row
+
+    def update_transmission_row(self, row, trans):
+        row['color_dot'].configure(fg_color=self.color_map.get(trans.get('couleur'), "gray50"))
+        dt_obj = datetime.fromisoformat(trans['datetime_transmission'])
+        row['header'].configure(text=f"{dt_obj.strftime('%d/%m %H:%M')} - {trans['nom_service']} - par {trans['user_prenom']}")
+        row['youngs'].configure(text=f"Concernés : {trans.get('linked_youngs', 'Général')}")
+        row['content'].configure(text=trans['contenu'])
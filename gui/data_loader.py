@@ -0,0 +1,126 @@
+# Fichier : gui/data_loader.py
+# Description : Exécute les appels aux modèles dans un pool de threads et renvoie
+#               les résultats sur le thread Tk via after(), pour ne jamais bloquer l'interface.
+
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import customtkinter as ctk
+
+# Deux workers suffisent : SQLite sérialise les écritures et chaque thread
+# dispose de sa propre connexion (voir models/database/database.py).
+MAX_WORKERS = 2
+POLL_INTERVAL_MS = 30
+
+_executor = None
+_results = queue.Queue()
+_latest_tokens = {}
+_pending = 0
+_poll_widget = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="mecs-data")
+    return _executor
+
+
+def run_async(widget, func, *args, callback=None, error_callback=None, key=None, **kwargs):
+    """
+    Exécute func(*args, **kwargs) en arrière-plan puis appelle callback(résultat)
+    sur le thread Tk. Doit être appelée depuis le thread Tk.
+    Si key est fourni, seule la dernière demande faite par ce widget pour cette clé
+    est livrée : les résultats devenus obsolètes (changement de date, de filtre...) sont ignorés.
+    Le callback n'est pas appelé si le widget a été détruit entre-temps.
+    """
+    global _pending, _poll_widget
+    token_key, token = None, None
+    if key is not None:
+        token_key = (str(widget), key)
+        token = _latest_tokens.get(token_key, 0) + 1
+        _latest_tokens[token_key] = token
+
+    def task():
+        try:
+            _results.put((widget, token_key, token, callback, error_callback, func(*args, **kwargs), None))
+        except Exception as e:
+            _results.put((widget, token_key, token, callback, error_callback, None, e))
+
+    _get_executor().submit(task)
+    _pending += 1
+    if _poll_widget is None:
+        _poll_widget = widget.winfo_toplevel()
+        _poll_widget.after(POLL_INTERVAL_MS, _dispatch_results)
+
+
+def cancel(widget, key):
+    """Abandonne la demande en cours de ce widget pour cette clé : son résultat ne sera pas livré."""
+    token_key = (str(widget), key)
+    if token_key in _latest_tokens:
+        _latest_tokens[token_key] += 1
+
+
+def _dispatch_results():
+    """Livre les résultats disponibles sur le thread Tk et se reprogramme tant qu'il en reste."""
+    global _pending, _poll_widget
+    try:
+        _deliver_results()
+    finally:
+        # Toujours reprogrammer (ou libérer) le relevé : sinon plus aucun résultat ne serait livré
+        rescheduled = False
+        if _pending > 0 and _poll_widget is not None:
+            try:
+                _poll_widget.after(POLL_INTERVAL_MS, _dispatch_results)
+                rescheduled = True
+            except Exception:
+                pass
+        if not rescheduled:
+            _poll_widget = None
+
+
+def _deliver_results():
+    """Appelle les callbacks des résultats reçus ; une exception dans l'un n'empêche pas la livraison des autres."""
+    global _pending
+    while True:
+        try:
+            widget, token_key, token, callback, error_callback, result, error = _results.get_nowait()
+        except queue.Empty:
+            break
+        _pending -= 1
+        if token_key is not None:
+            if _latest_tokens.get(token_key) != token:
+                continue
+            del _latest_tokens[token_key]
+        try:
+            if not widget.winfo_exists():
+                continue
+        except Exception:
+            continue
+        try:
+            if error is not None:
+                print(f"Erreur lors du chargement en arrière-plan : {error}")
+                if error_callback:
+                    error_callback(error)
+            elif callback:
+                callback(result)
+        except Exception as e:
+            print(f"Erreur lors de l'affichage d'un chargement en arrière-plan : {e}")
+            traceback.print_exc()
+
+
+def show_loading(frame, text="Chargement..."):
+    """Vide un cadre et y affiche un texte d'attente pendant l'exécution d'une requête."""
+    for widget in frame.winfo_children():
+        widget.destroy()
+    label = ctk.CTkLabel(frame, text=text, text_color="gray")
+    label.pack(pady=20)
+    return label
+
+
+def shutdown():
+    """Arrête le pool de threads en abandonnant les requêtes pas encore démarrées."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
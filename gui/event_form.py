@@ -6,8 +6,13 @@ from tkinter import messagebox
 from datetime import datetime
 # CORRECTION: Imports directs et spécifiques pour éviter les conflits
 from models.events.events import add_event, update_event, get_event_details
+from models.events.recurrence import normalize_rule
 from models.youngs.youngs import get_all_youngs
 from models.permissions.permissions import get_all_users
+from utils import date_util
+
+REPETITIONS = {"Aucune": None, "Tous les jours": "daily", "Toutes les semaines": "weekly", "Tous les mois": "monthly"}
+WEEKDAY_LABELS = ["Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim"]
 
 class EventForm(ctk.CTkToplevel):
     def __init__(self, parent, user_info, event_id=None, initial_date=None):
@@ -21,7 +26,7 @@ class EventForm(ctk.CTkToplevel):
         self.result = False
 
         self.title("Ajouter un Événement" if event_id is None else "Modifier un Événement")
-        self.geometry("700x750")
+        self.geometry("700x900")
         self.resizable(True, True)
 
         self.grid_columnconfigure(0, weight=1)
@@ -40,6 +45,9 @@ class EventForm(ctk.CTkToplevel):
         self.widgets = {}
         self.young_checkboxes = {}
         self.professionals_map = {}
+        self.weekday_vars = []
+        # Occurrences supprimées de la série, conservées lors d'une modification
+        self.recurrence_exceptions = []
 
         self.create_widgets()
 
@@ -70,6 +78,9 @@ class EventForm(ctk.CTkToplevel):
         self.professionals_map = {f"{user[2]} {user[1].upper()}": user[0] for user in professionals_data}
         pro_names = list(self.professionals_map.keys())
         self.add_option_menu(row, "user_id_menu", "Professionnel concerné (facultatif)", ["Aucun"] + pro_names)
+        row += 1
+
+        self.add_recurrence_widgets(row)
         
         all_youngs_data = get_all_youngs()
         for i, young_data in enumerate(all_youngs_data):
@@ -108,6 +119,70 @@ class EventForm(ctk.CTkToplevel):
         minute_menu.pack(side="left")
         self.widgets[f"minute_{name_prefix}_menu"] = minute_menu
 
+    def add_recurrence_widgets(self, row):
+        """Ajoute la saisie de la règle de répétition (fréquence, intervalle, jours, fin)."""
+        self.add_option_menu(row, "repetition_menu", "Répétition", list(REPETITIONS))
+        row += 1
+
+        ctk.CTkLabel(self.form_frame, text="Détails de la répétition").grid(row=row, column=0, padx=10, pady=10, sticky="nw")
+        details_frame = ctk.CTkFrame(self.form_frame, fg_color="transparent")
+        details_frame.grid(row=row, column=1, padx=10, pady=5, sticky="ew")
+
+        interval_frame = ctk.CTkFrame(details_frame, fg_color="transparent")
+        interval_frame.pack(fill="x", pady=2)
+        ctk.CTkLabel(interval_frame, text="Toutes les").pack(side="left")
+        self.widgets['intervalle_entry'] = ctk.CTkEntry(interval_frame, width=50)
+        self.widgets['intervalle_entry'].insert(0, "1")
+        self.widgets['intervalle_entry'].pack(side="left", padx=5)
+        ctk.CTkLabel(interval_frame, text="période(s)").pack(side="left")
+
+        weekdays_frame = ctk.CTkFrame(details_frame, fg_color="transparent")
+        weekdays_frame.pack(fill="x", pady=2)
+        for label in WEEKDAY_LABELS:
+            var = ctk.StringVar(value="off")
+            ctk.CTkCheckBox(weekdays_frame, text=label, variable=var, onvalue="on", offvalue="off", width=60).pack(side="left")
+            self.weekday_vars.append(var)
+
+        end_frame = ctk.CTkFrame(details_frame, fg_color="transparent")
+        end_frame.pack(fill="x", pady=2)
+        ctk.CTkLabel(end_frame, text="Jusqu'au").pack(side="left")
+        self.widgets['date_fin_repetition_entry'] = ctk.CTkEntry(end_frame, placeholder_text="JJ-MM-AAAA", width=110)
+        self.widgets['date_fin_repetition_entry'].pack(side="left", padx=5)
+        ctk.CTkLabel(end_frame, text="ou après").pack(side="left")
+        self.widgets['nombre_entry'] = ctk.CTkEntry(end_frame, width=50)
+        self.widgets['nombre_entry'].pack(side="left", padx=5)
+        ctk.CTkLabel(end_frame, text="occurrences").pack(side="left")
+
+    def load_recurrence(self, recurrence):
+        self.widgets['repetition_menu'].set(next(label for label, value in REPETITIONS.items() if value == recurrence['frequence']))
+        self.widgets['intervalle_entry'].delete(0, "end")
+        self.widgets['intervalle_entry'].insert(0, str(recurrence['intervalle']))
+        for day in recurrence['jours_semaine']:
+            self.weekday_vars[day].set("on")
+        if recurrence['date_fin']:
+            self.widgets['date_fin_repetition_entry'].insert(0, date_util.format_date_to_french(recurrence['date_fin']))
+        if recurrence['nombre']:
+            self.widgets['nombre_entry'].insert(0, str(recurrence['nombre']))
+        self.recurrence_exceptions = recurrence['exceptions']
+
+    def get_recurrence(self):
+        """Construit la règle de répétition saisie (None si aucune). Lève ValueError si la saisie est invalide."""
+        frequence = REPETITIONS[self.widgets['repetition_menu'].get()]
+        if frequence is None:
+            return None
+        date_fin_str = self.widgets['date_fin_repetition_entry'].get()
+        date_fin = date_util.format_date_to_iso(date_fin_str)
+        if date_fin_str and not date_fin:
+            raise ValueError("La date de fin de répétition doit être au format JJ-MM-AAAA.")
+        return normalize_rule({
+            'frequence': frequence,
+            'intervalle': self.widgets['intervalle_entry'].get(),
+            'jours_semaine': [day for day, var in enumerate(self.weekday_vars) if var.get() == "on"] if frequence == "weekly" else [],
+            'date_fin': date_fin,
+            'nombre': self.widgets['nombre_entry'].get(),
+            'exceptions': self.recurrence_exceptions,
+        })
+
     def add_option_menu(self, row, name, label_text, values):
         label = ctk.CTkLabel(self.form_frame, text=label_text)
         label.grid(row=row, column=0, padx=10, pady=10, sticky="w")
@@ -148,6 +223,9 @@ class EventForm(ctk.CTkToplevel):
             if young_id in linked_youngs:
                 var.set("on")
 
+        if details.get('recurrence'):
+            self.load_recurrence(details['recurrence'])
+
     def submit(self):
         try:
             date_debut_str = self.widgets['date_debut_entry'].get()
@@ -176,13 +254,19 @@ class EventForm(ctk.CTkToplevel):
              messagebox.showerror("Erreur", "Le nom de l'événement est obligatoire.", parent=self)
              return
 
+        try:
+            recurrence = self.get_recurrence()
+        except ValueError as e:
+            messagebox.showerror("Répétition invalide", str(e), parent=self)
+            return
+
         selected_young_ids = [young_id for young_id, var in self.young_checkboxes.items() if var.get() == "on"]
 
         success = False
         if self.event_id is None:
-            success = add_event(data, selected_young_ids)
+            success = add_event(data, selected_young_ids, recurrence)
         else:
-            success = update_event(self.event_id, data, selected_young_ids)
+            success = update_event(self.event_id, data, selected_young_ids, recurrence)
             
         if success:
             self.result = True
@@ -0,0 +1,90 @@
+# Fichier : gui/keyed_rows.py
+# Description : Réconciliation par clé des lignes d'une liste : au rafraîchissement, seules
+#               les lignes ajoutées, modifiées ou supprimées touchent aux widgets.
+
+import tkinter
+import customtkinter as ctk
+
+
+class KeyedRows:
+    """
+    Gère les lignes affichées (placées avec grid) dans un conteneur.
+    create_row(container, row_index) crée les widgets d'une ligne et renvoie un dictionnaire ;
+    update_row(row, item) les met à jour avec un élément. key(item) identifie un élément.
+    Un élément inchangé (même clé, valeur égale) ne provoque aucun appel à update_row.
+    """
+    def __init__(self, container, key, create_row, update_row, first_row=0, empty_text=""):
+        self.container = container
+        self.key = key
+        self.create_row = create_row
+        self.update_row = update_row
+        self.first_row = first_row
+        self.empty_text = empty_text
+
+        self._rows = {}   # clé -> [ligne, élément, position]
+        self._order = []
+        self._message_label = None
+        self.rendered = False
+
+    def reconcile(self, items):
+        """Met l'affichage en conformité avec items en limitant les créations et destructions."""
+        new_keys = [self.key(item) for item in items]
+        kept = set(new_keys)
+        for key in [k for k in self._order if k not in kept]:
+            self._destroy_row(self._rows.pop(key)[0])
+
+        for position, (key, item) in enumerate(zip(new_keys, items)):
+            grid_row = self.first_row + position
+            entry = self._rows.get(key)
+            if entry is None:
+                row = self.create_row(self.container, grid_row)
+                self.update_row(row, item)
+                self._rows[key] = [row, item, grid_row]
+                continue
+            if entry[1] != item:
+                self.update_row(entry[0], item)
+                entry[1] = item
+            if entry[2] != grid_row:
+                self._move_row(entry[0], grid_row)
+                entry[2] = grid_row
+
+        self._order = new_keys
+        self.rendered = True
+        self.show_message(self.empty_text if not items else "")
+
+    def show_message(self, text):
+        """Affiche un message (liste vide, chargement...) sous les lignes éventuelles."""
+        if not text:
+            if self._message_label is not None:
+                self._message_label.destroy()
+                self._message_label = None
+            return
+        if self._message_label is None:
+            self._message_label = ctk.CTkLabel(self.container, text="", text_color="gray")
+            self._message_label.grid(row=self.first_row + len(self._order), column=0, columnspan=10, pady=20)
+        self._message_label.configure(text=text)
+
+    def rows(self):
+        """Renvoie les lignes dans l'ordre d'affichage."""
+        return [self._rows[key][0] for key in self._order]
+
+    def clear(self):
+        for key in self._order:
+            self._destroy_row(self._rows[key][0])
+        self._rows.clear()
+        self._order = []
+        self.rendered = False
+
+    def _widgets(self, row):
+        # Seuls les widgets placés directement dans le conteneur sont déplacés ou détruits,
+        # leurs enfants suivent.
+        return [w for w in row.values() if isinstance(w, tkinter.Misc) and w.master is self.container]
+
+    def _move_row(self, row, grid_row):
+        for widget in self._widgets(row):
+            if widget.winfo_manager() == "grid":
+                widget.grid(row=grid_row)
+
+    def _destroy_row(self, row):
+        for widget in self._widgets(row):
+            widget.destroy()
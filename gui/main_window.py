@@ -15,6 +15,7 @@ from .vehicle_list import VehicleListView
 from .trip_list import TripListView
 from .settings_view import SettingsView
 from .daily_life_dashboard_view import DailyLifeDashboardView
+from .search_view import SearchView
 
 class MainView(ctk.CTkFrame):
     def __init__(self, parent, user_info, logout_callback):
@@ -22,6 +23,7 @@ class MainView(ctk.CTkFrame):
         self.user_info = user_info
         self.logout_callback = logout_callback 
         self.views = {}
+        self.current_view_name = None
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
         self.setup_ui()
@@ -34,8 +36,13 @@ class MainView(ctk.CTkFrame):
 
         self.navigation_frame_label = ctk.CTkLabel(self.navigation_frame, text="  MENU", font=ctk.CTkFont(size=15, weight="bold"))
         self.navigation_frame_label.grid(row=0, column=0, padx=20, pady=20, sticky="w")
+
+        # --- Recherche globale (transmissions, rapports, projets) ---
+        self.search_entry = ctk.CTkEntry(self.navigation_frame, placeholder_text="🔍 Rechercher...")
+        self.search_entry.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="ew")
+        self.search_entry.bind("<Return>", lambda e: self.show_search_view())
         
-        current_row = 1
+        current_row = 2
 
         # --- Section Principale ---
         self.dashboard_button = self.create_nav_button("Tableau de Bord", self.show_dashboard_view)
@@ -98,14 +105,18 @@ class MainView(ctk.CTkFrame):
                              hover_color=("gray70", "gray30"), anchor="w", command=command)
 
     def show_view(self, view_class_constructor, name):
-        for view in self.views.values():
-            view.grid_forget()
+        if self.current_view_name in self.views and self.current_view_name != name:
+            self.views[self.current_view_name].grid_forget()
         
-        if name not in self.views:
+        # Une vue neuve se remplit dans son constructeur. Une vue déjà construite est
+        # réaffichée telle quelle et son refresh_list ne fait que réconcilier ses lignes.
+        is_new = name not in self.views
+        if is_new:
             self.views[name] = view_class_constructor(self.main_view_container)
         
+        self.current_view_name = name
         self.views[name].grid(row=0, column=0, sticky="nsew")
-        if hasattr(self.views[name], 'refresh_list') and callable(getattr(self.views[name], 'refresh_list')):
+        if not is_new and callable(getattr(self.views[name], 'refresh_list', None)):
             self.views[name].refresh_list()
 
     def show_dashboard_view(self): self.show_view(lambda parent: DashboardView(parent, self.user_info), "dashboard")
@@ -120,5 +131,11 @@ class MainView(ctk.CTkFrame):
     def show_professionals_view(self): self.show_view(lambda parent: ProfessionalsView(parent, self.user_info), "professionals")
     def show_services_view(self): self.show_view(lambda parent: ServicesView(parent, self.user_info), "services")
     def show_vehicles_view(self): self.show_view(lambda parent: VehicleListView(parent, self.user_info), "vehicles")
+    def show_search_view(self):
+        query = self.search_entry.get().strip()
+        if not query: return
+        is_new = "search" not in self.views
+        self.show_view(lambda parent: SearchView(parent, self.user_info, query), "search")
+        if not is_new: self.views["search"].search(query)
     def show_settings_view(self): self.show_view(lambda parent: SettingsView(parent, self.user_info), "settings")
 
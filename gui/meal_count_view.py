@@ -5,6 +5,8 @@ import customtkinter as ctk
 from datetime import date, timedelta
 from models.daily_life.daily_life import get_meal_counts_for_date
 from .weekly_meal_summary_view import WeeklyMealSummaryView
+from .period_cache import PeriodCache
+from . import data_loader
 import locale
 
 try:
@@ -21,6 +23,7 @@ class MealCountView(ctk.CTkFrame):
         self.user_info = user_info
         self.current_date = date.today()
         self.service_id_filter = None
+        self.counts_cache = PeriodCache(get_meal_counts_for_date, ('daily_life', 'youngs', 'users'))
         
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
@@ -61,15 +64,21 @@ class MealCountView(ctk.CTkFrame):
 
     def open_weekly_summary(self):
         start_of_week = self.current_date - timedelta(days=self.current_date.weekday())
-        WeeklyMealSummaryView(self, start_of_week)
+        WeeklyMealSummaryView(self, start_of_week, service_id=self.service_id_filter)
 
     def refresh_view(self):
         self.date_label.configure(text=self.current_date.strftime("%A %d %B %Y").capitalize())
-        self.populate_meal_count_table()
+        key = (self.current_date.isoformat(), self.service_id_filter)
+        if not self.counts_cache.load(self, key, lambda counts: self.on_counts_loaded(key, counts), async_key="meal_counts"):
+            data_loader.show_loading(self.table_frame)
 
-    def populate_meal_count_table(self):
+    def on_counts_loaded(self, key, counts):
+        self.populate_meal_count_table(counts)
+        shown_date = date.fromisoformat(key[0])
+        self.counts_cache.prefetch(self, [((shown_date + timedelta(days=step)).isoformat(), key[1]) for step in (-1, 1)])
+
+    def populate_meal_count_table(self, counts):
         for widget in self.table_frame.winfo_children(): widget.destroy()
-        counts = get_meal_counts_for_date(self.current_date.isoformat(), service_id=self.service_id_filter)
         headers = ["Catégorie", "Normal", "Sans Porc", "Végétarien", "TOTAL"]
         for i, header in enumerate(headers):
             ctk.CTkLabel(self.table_frame, text=header, font=ctk.CTkFont(weight="bold")).grid(row=0, column=i, padx=10, pady=5)
@@ -96,4 +105,7 @@ class MealCountView(ctk.CTkFrame):
 
     def go_to_previous_day(self): self.current_date -= timedelta(days=1); self.refresh_view()
     def go_to_next_day(self): self.current_date += timedelta(days=1); self.refresh_view()
-    def refresh_list(self): self.refresh_view()
+    def refresh_list(self):
+        # Rafraîchissement explicite : le jour affiché est relu, seuls les jours voisins restent en cache
+        self.counts_cache.discard((self.current_date.isoformat(), self.service_id_filter))
+        self.refresh_view()
@@ -0,0 +1,89 @@
+# Fichier : gui/period_cache.py
+# Description : Cache de navigation par période (jour, semaine...) : garde la période affichée
+#               et ses voisines préchargées en arrière-plan, pour que < / > s'affiche sans attente.
+
+from collections import OrderedDict
+from models.database.cache import get_data_stamp
+from . import data_loader
+
+# Période courante, précédente et suivante, plus quelques pages déjà visitées
+MAX_ENTRIES = 8
+
+
+class PeriodCache:
+    """
+    Mémorise les résultats de loader(*key) pour les dernières périodes consultées (éviction LRU).
+    dependencies liste les caches modèles (voir models/database/cache.py) dont dépendent les données :
+    une écriture qui les invalide, ou toute écriture d'un autre poste (PRAGMA data_version),
+    rend les entrées périmées, qui sont alors rechargées (voir get_data_stamp).
+    """
+    def __init__(self, loader, dependencies, max_entries=MAX_ENTRIES):
+        self.loader = loader
+        self.dependencies = dependencies
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # clé -> (marqueur de fraîcheur, données)
+        self._prefetching = set()
+
+    def get(self, key):
+        """Renvoie les données en cache pour la clé, ou None si absentes ou périmées."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != get_data_stamp(*self.dependencies):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def load(self, widget, key, callback, async_key=None):
+        """
+        Appelle callback(données) : immédiatement si la période est en cache,
+        sinon après un chargement en arrière-plan (voir data_loader.run_async).
+        Renvoie True si les données venaient du cache.
+        """
+        data = self.get(key)
+        if data is not None:
+            # Un chargement plus ancien encore en cours ne doit pas remplacer cet affichage
+            if async_key is not None:
+                data_loader.cancel(widget, async_key)
+            callback(data)
+            return True
+        stamp = get_data_stamp(*self.dependencies)
+
+        def on_loaded(result):
+            self._store(key, stamp, result)
+            callback(result)
+
+        data_loader.run_async(widget, self.loader, *key, callback=on_loaded, key=async_key)
+        return False
+
+    def prefetch(self, widget, keys):
+        """Charge en arrière-plan les périodes voisines qui ne sont pas déjà en cache."""
+        for key in keys:
+            if key in self._prefetching or self.get(key) is not None:
+                continue
+            self._prefetching.add(key)
+            stamp = get_data_stamp(*self.dependencies)
+
+            def on_loaded(result, key=key, stamp=stamp):
+                self._prefetching.discard(key)
+                self._store(key, stamp, result)
+
+            data_loader.run_async(widget, self.loader, *key, callback=on_loaded,
+                                  error_callback=lambda e, key=key: self._prefetching.discard(key))
+
+    def discard(self, key):
+        """Oublie une période : à appeler avant un rafraîchissement explicite, qui relit alors la base."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _store(self, key, stamp, data):
+        # Des données lues avant une écriture survenue pendant la requête ne sont pas conservées
+        if stamp != get_data_stamp(*self.dependencies):
+            return
+        self._entries[key] = (stamp, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
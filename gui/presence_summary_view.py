@@ -86,5 +86,13 @@ class PresenceSummaryView(ctk.CTkFrame):
             ctk.CTkLabel(self.table_frame, text=str(young_summary.get('Fugue', 0))).grid(row=i, column=4, padx=10, pady=5)
             ctk.CTkLabel(self.table_frame, text=str(young_summary.get('Hôpital', 0))).grid(row=i, column=5, padx=10, pady=5)
 
+        # --- Ligne des totaux : somme des lignes affichées (mêmes jeunes, sortis exclus) ---
+        total_row = len(summary_data) + 1
+        total_font = ctk.CTkFont(weight="bold")
+        ctk.CTkLabel(self.table_frame, text="TOTAL", font=total_font).grid(row=total_row, column=0, padx=10, pady=(10, 5), sticky="w")
+        for col, status in enumerate(['Présent', 'Absent (journée)', 'Permis famille', 'Fugue', 'Hôpital'], start=1):
+            total = sum(young_summary.get(status, 0) for young_summary in summary_data)
+            ctk.CTkLabel(self.table_frame, text=str(total), font=total_font).grid(row=total_row, column=col, padx=10, pady=(10, 5))
+
     def refresh_list(self):
         self.populate_summary_table()
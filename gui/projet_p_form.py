@@ -94,7 +94,7 @@ class ProjetPersonnaliseForm(ctk.CTkToplevel):
 
         self.add_objectif_item()
 
-    def add_objectif_item(self, objectif_text="", categorie_text=None, evaluation_text="", moyens_list=None):
+    def add_objectif_item(self, objectif_text="", categorie_text=None, evaluation_text="", moyens_list=None, objectif_id=None):
         if moyens_list is None or not moyens_list: moyens_list = [""]
 
         obj_frame = ctk.CTkFrame(self.objectifs_container, border_width=2, border_color="gray60")
@@ -143,8 +143,9 @@ class ProjetPersonnaliseForm(ctk.CTkToplevel):
         evaluation_box.pack(fill="x", expand=True, padx=10, pady=(0,10))
         evaluation_box.insert("0.0", evaluation_text)
         
+        # objectif_id : identifiant de l'objectif déjà enregistré (None pour un nouvel objectif)
         self.objectifs_widgets_list.append({
-            'frame': obj_frame, 'objectif': objectif_entry, 'categorie': categorie_menu,
+            'id': objectif_id, 'frame': obj_frame, 'objectif': objectif_entry, 'categorie': categorie_menu,
             'evaluation': evaluation_box, 'moyens': moyen_entries
         })
 
@@ -183,7 +184,8 @@ class ProjetPersonnaliseForm(ctk.CTkToplevel):
                     objectif_text=obj_dict.get('objectif', ''),
                     categorie_text=obj_dict.get('categorie'),
                     evaluation_text=obj_dict.get('evaluation', ''),
-                    moyens_list=obj_dict.get('moyens')
+                    moyens_list=obj_dict.get('moyens'),
+                    objectif_id=obj_dict.get('id')
                 )
 
     def submit(self):
@@ -205,6 +207,7 @@ class ProjetPersonnaliseForm(ctk.CTkToplevel):
             objectif_text = item_widgets['objectif'].get()
             if objectif_text:
                 data['objectifs'].append({
+                    'id': item_widgets['id'],
                     'objectif': objectif_text,
                     'categorie': item_widgets['categorie'].get(),
                     'evaluation': item_widgets['evaluation'].get("1.0", "end-1c"),
@@ -3,12 +3,16 @@
 
 import customtkinter as ctk
 from tkinter import messagebox
+from datetime import date, timedelta
 from .projet_p_form import ProjetPersonnaliseForm
 # CORRECTION: Imports plus spécifiques pour éviter les conflits
 from models.projet_p.projet_p import get_all_projets, get_projet_details, delete_projet, calculate_next_project_date
 from models.youngs.youngs import get_all_youngs
 from utils import date_util, pdf_export # Importer le module d'export
 
+# Délai avant l'échéance annuelle à partir duquel un projet est signalé à renouveler.
+RENEWAL_NOTICE_DAYS = 30
+
 class ProjetPView(ctk.CTkFrame):
     def __init__(self, parent, user_info):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
@@ -33,6 +37,11 @@ class ProjetPView(ctk.CTkFrame):
         self.filter_menu = ctk.CTkOptionMenu(self.control_frame, values=filter_options, command=self.refresh_list)
         self.filter_menu.pack(side="left", padx=5, pady=10)
 
+        self.due_var = ctk.BooleanVar(value=False)
+        self.due_checkbox = ctk.CTkCheckBox(self.control_frame, text=f"À renouveler sous {RENEWAL_NOTICE_DAYS} jours",
+                                            variable=self.due_var, command=self.refresh_list)
+        self.due_checkbox.pack(side="left", padx=20, pady=10)
+
         # --- Cadre des actions sur la sélection ---
         self.actions_frame = ctk.CTkFrame(self)
         self.actions_frame.grid(row=2, column=0, padx=10, pady=10, sticky="ew")
@@ -64,15 +73,13 @@ class ProjetPView(ctk.CTkFrame):
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
 
-        all_projets = get_all_projets()
-        
         selected_young_filter = self.filter_menu.get()
         young_id_filter = self.youngs_map.get(selected_young_filter) if selected_young_filter != "Tous les jeunes" else None
+        due_before = date.today() + timedelta(days=RENEWAL_NOTICE_DAYS) if self.due_var.get() else None
 
-        for i, projet in enumerate(all_projets):
-            if young_id_filter and projet['young_id'] != young_id_filter:
-                continue
-            
+        projets = get_all_projets(young_id=young_id_filter, due_before=due_before)
+
+        for i, projet in enumerate(projets):
             date_fr = date_util.format_date_to_french(projet['date_projet'])
             text = f"Projet pour {projet['prenom']} {projet['nom'].upper()} - Date d'enregistrement : {date_fr}"
             
@@ -4,8 +4,10 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from .report_form import ReportForm
+from .virtual_list import VirtualList, set_radio_row
+from . import data_loader
 # CORRECTION: Imports directs des fonctions pour éviter les ambiguïtés
-from models.reports.reports import get_all_reports, get_report_details, validate_report, delete_report
+from models.reports.reports import get_reports_page, get_report_for_export, validate_report, delete_report
 from models.youngs.youngs import get_all_youngs
 from utils import date_util, pdf_export # Importer le nouvel utilitaire
 
@@ -56,35 +58,50 @@ class ReportsView(ctk.CTkFrame):
 
 
         # --- Cadre scrollable pour la liste ---
-        self.scrollable_frame = ctk.CTkScrollableFrame(self, label_text="Liste des rapports et écrits")
-        self.scrollable_frame.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
-        self.scrollable_frame.grid_columnconfigure(0, weight=1)
-
         self.radio_var = ctk.IntVar(value=0)
+        self.report_list = VirtualList(self, row_height=34, create_row=self.create_report_row, update_row=self.update_report_row,
+                                       label_text="Liste des rapports et écrits", empty_text="Aucun rapport enregistré.",
+                                       on_reach_end=self.load_next_page)
+        self.report_list.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
+
         self.refresh_list()
 
     def refresh_list(self):
-        """Met à jour la liste des rapports affichée."""
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
+        """Met à jour la liste des rapports affichée (première page, la suite est chargée au défilement)."""
         selected_young_filter = self.filter_menu.get()
-        young_id_filter = self.youngs_map.get(selected_young_filter) if selected_young_filter != "Tous les jeunes" else None
-
-        all_reports = get_all_reports(young_id=young_id_filter)
+        self.young_id_filter = self.youngs_map.get(selected_young_filter) if selected_young_filter != "Tous les jeunes" else None
 
-        for i, report in enumerate(all_reports):
-            date_fr = date_util.format_date_to_french(report['date_redaction']) or "En attente"
-            status_text = "Validé" if report['statut'] == 'validé' else "Brouillon"
-            
-            text = f"[{status_text}] {report['type_rapport']} pour {report['young_prenom']} {report['young_nom'].upper()} | Rédigé par {report['author_prenom']} {report['author_nom'].upper()} | Date: {date_fr}"
-            
-            radio_button = ctk.CTkRadioButton(self.scrollable_frame, text=text, variable=self.radio_var, value=report['id'],
-                                              command=lambda r=report: self.on_select(r))
-            radio_button.grid(row=i, column=0, padx=10, pady=5, sticky="w")
+        reports, self.next_cursor = get_reports_page(young_id=self.young_id_filter)
+        self.page_generation = getattr(self, 'page_generation', 0) + 1
+        self.radio_var.set(0)
+        self.report_list.set_items(reports)
         
         self.on_select(None)
 
+    def load_next_page(self):
+        """Charge la page suivante en arrière-plan quand la fin de la liste est atteinte."""
+        if not self.next_cursor: return
+        generation = self.page_generation
+        data_loader.run_async(self, get_reports_page, self.young_id_filter, self.next_cursor,
+                              callback=lambda page: self.on_page_loaded(generation, page), key="reports_page")
+
+    def on_page_loaded(self, generation, page):
+        if generation != self.page_generation: return  # liste rafraîchie entre-temps
+        reports, self.next_cursor = page
+        self.report_list.append_items(reports)
+
+    def create_report_row(self, slot):
+        radio_button = ctk.CTkRadioButton(slot, text="", variable=self.radio_var, value=0)
+        radio_button.pack(anchor="w", padx=10, pady=5)
+        return radio_button
+
+    def update_report_row(self, radio_button, report):
+        date_fr = date_util.format_date_to_french(report['date_redaction']) or "En attente"
+        status_text = "Validé" if report['statut'] == 'validé' else "Brouillon"
+        
+        text = f"[{status_text}] {report['type_rapport']} pour {report['young_prenom']} {report['young_nom'].upper()} | Rédigé par {report['author_prenom']} {report['author_nom'].upper()} | Date: {date_fr}"
+        set_radio_row(radio_button, self.radio_var, text, report['id'], command=lambda r=report: self.on_select(r))
+
     def on_filter_change(self, choice):
         self.refresh_list()
 
@@ -122,7 +139,7 @@ class ReportsView(ctk.CTkFrame):
     def export_report(self):
         """Exporte le rapport sélectionné en PDF."""
         if self.selected_report_id and self.selected_report_status == 'validé':
-            details = get_report_details(self.selected_report_id)
+            details = get_report_for_export(self.selected_report_id)
             pdf_export.export_report_to_pdf(details)
         else:
             messagebox.showwarning("Exportation impossible", "Veuillez sélectionner un rapport validé pour l'exporter.", parent=self)
@@ -0,0 +1,74 @@
+# Fichier : gui/search_view.py
+# Description : Résultats de la recherche globale (transmissions, rapports, projets personnalisés).
+
+import customtkinter as ctk
+from models.search.search import search
+from utils import date_util
+from . import data_loader
+from .keyed_rows import KeyedRows
+from .transmissions_form import TransmissionForm
+from .report_form import ReportForm
+from .projet_p_form import ProjetPersonnaliseForm
+
+KIND_LABELS = {"transmission": "Transmission", "report": "Rapport", "projet": "Projet personnalisé",
+               "objectif": "Objectif (projet)", "moyen": "Moyen (projet)"}
+
+class SearchView(ctk.CTkFrame):
+    def __init__(self, parent, user_info, query=""):
+        super().__init__(parent, corner_radius=0, fg_color="transparent")
+        self.user_info = user_info
+        self.query = query
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.title_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=18, weight="bold"))
+        self.title_label.grid(row=0, column=0, padx=20, pady=(10, 10), sticky="w")
+
+        self.results_frame = ctk.CTkScrollableFrame(self, label_text="Résultats (par pertinence)")
+        self.results_frame.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
+        self.results_frame.grid_columnconfigure(0, weight=1)
+        self.result_rows = KeyedRows(self.results_frame, key=lambda r: (r['kind'], r['ref_id']), create_row=self.create_result_row,
+                                     update_row=self.update_result_row, empty_text="Aucun résultat.")
+
+        self.search(query)
+
+    def search(self, query):
+        """Lance la recherche en arrière-plan et affiche les résultats à leur arrivée."""
+        self.query = query.strip()
+        self.title_label.configure(text=f"Recherche : « {self.query} »")
+        if not self.query:
+            self.result_rows.reconcile([])
+            return
+        self.result_rows.show_message("Recherche en cours...")
+        data_loader.run_async(self, search, self.query, callback=self.result_rows.reconcile, key="search")
+
+    def create_result_row(self, container, i):
+        row = {'frame': ctk.CTkFrame(container, border_width=1)}
+        row['frame'].grid(row=i, column=0, sticky="ew", padx=5, pady=5)
+        row['frame'].grid_columnconfigure(0, weight=1)
+        row['header'] = ctk.CTkLabel(row['frame'], text="", font=ctk.CTkFont(size=12, weight="bold"), anchor="w")
+        row['header'].grid(row=0, column=0, sticky="w", padx=10, pady=(5, 0))
+        row['open_btn'] = ctk.CTkButton(row['frame'], text="Ouvrir", width=70, height=24)
+        row['open_btn'].grid(row=0, column=1, rowspan=2, padx=10, pady=5)
+        row['snippet'] = ctk.CTkLabel(row['frame'], text="", wraplength=700, justify="left", anchor="w")
+        row['snippet'].grid(row=1, column=0, sticky="w", padx=10, pady=(0, 5))
+        return row
+
+    def update_result_row(self, row, result):
+        date_text = date_util.format_date_to_french((result['date'] or "")[:10])
+        parts = [KIND_LABELS.get(result['kind'], result['kind']), result['title'], result['label'], date_text]
+        row['header'].configure(text=" | ".join(part for part in parts if part))
+        row['snippet'].configure(text=(result['snippet'] or "").strip())
+        row['open_btn'].configure(command=lambda r=result: self.open_result(r))
+
+    def open_result(self, result):
+        if result['kind'] == 'transmission':
+            form = TransmissionForm(self, user_info=self.user_info, transmission_id=result['ref_id'])
+        elif result['kind'] == 'report':
+            form = ReportForm(self, user_info=self.user_info, report_id=result['ref_id'])
+        else:
+            form = ProjetPersonnaliseForm(self, user_info=self.user_info, projet_id=result['projet_id'])
+        if form.show(): self.refresh_list()
+
+    def refresh_list(self): self.search(self.query)
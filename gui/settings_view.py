@@ -42,10 +42,12 @@ class SettingsView(ctk.CTkFrame):
 
     def save_and_apply_settings(self):
         """Sauvegarde les nouveaux paramètres et les applique immédiatement."""
-        new_settings = {
+        # On part des paramètres existants pour ne pas perdre les autres sections (ex : "database")
+        new_settings = dict(self.current_settings)
+        new_settings.update({
             "appearance_mode": self.appearance_menu.get(),
             "color_theme": self.color_theme_menu.get()
-        }
+        })
         
         if settings.save_settings(new_settings):
             settings.apply_settings(new_settings)
@@ -44,7 +44,7 @@ class TaskListView(ctk.CTkFrame):
         self.scroll_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
         self.scroll_frame.grid_columnconfigure(0, weight=1)
         
-        self.status_colors = {"urgent": "#D32F2F", "à faire": "#388E3C", "réalisée": "gray50"}
+        self.status_colors = {"en retard": "#B71C1C", "urgent": "#D32F2F", "à faire": "#388E3C", "réalisée": "gray50"}
         self.radio_var = ctk.IntVar(value=0)
 
         self.refresh_list()
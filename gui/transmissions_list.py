@@ -9,6 +9,8 @@ from .calendar_popup import CalendarPopup # Importer le nouveau widget
 from models.transmissions.transmissions import get_transmissions_for_period, delete_transmission
 from models.services.services import get_all_services_for_form
 from utils import date_util
+from .virtual_list import VirtualList
+from .period_cache import PeriodCache
 import locale
 
 try:
@@ -20,6 +22,49 @@ except locale.Error:
         print("Locale 'fr_FR' non disponible.")
 
 
+# Hauteur fixe d'une carte de transmission dans la liste virtualisée ; le contenu
+# trop long (en caractères ou en lignes) est tronqué et le bouton "Lire" affiche le texte complet.
+TRANSMISSION_ROW_HEIGHT = 160
+CONTENT_PREVIEW_LENGTH = 400
+CONTENT_PREVIEW_LINES = 3
+
+
+def load_day_transmissions(iso_date, service_id):
+    return get_transmissions_for_period(iso_date, iso_date, service_id)
+
+
+def content_preview(contenu):
+    """Retourne (aperçu, tronqué) : le début du contenu tenant dans une carte de la liste."""
+    lines = contenu.splitlines()
+    if len(lines) <= CONTENT_PREVIEW_LINES and len(contenu) <= CONTENT_PREVIEW_LENGTH:
+        return contenu, False
+    preview = "\n".join(lines[:CONTENT_PREVIEW_LINES])[:CONTENT_PREVIEW_LENGTH]
+    return preview.rstrip() + "…", True
+
+
+class TransmissionReader(ctk.CTkToplevel):
+    """Fenêtre en lecture seule affichant le texte complet d'une transmission."""
+    def __init__(self, parent, trans_data):
+        super().__init__(parent)
+        self.transient(parent)
+
+        dt_obj = datetime.fromisoformat(trans_data['datetime_transmission'])
+        self.title(f"Transmission du {dt_obj.strftime('%d/%m/%Y à %H:%M')} - {trans_data['nom_service']}")
+        self.geometry("750x550")
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        ctk.CTkLabel(self, text=f"Par {trans_data['user_prenom']} {trans_data['user_nom'].upper()} - Catégorie : {trans_data['categorie'].capitalize()}",
+                     font=ctk.CTkFont(size=12, weight="bold")).grid(row=0, column=0, padx=20, pady=(20, 5), sticky="w")
+        textbox = ctk.CTkTextbox(self, wrap="word", font=("Arial", 14))
+        textbox.grid(row=1, column=0, padx=20, pady=5, sticky="nsew")
+        textbox.insert("1.0", trans_data['contenu'])
+        textbox.configure(state="disabled")
+        ctk.CTkLabel(self, text=f"Concernés : {trans_data['linked_youngs']}", font=ctk.CTkFont(size=11, weight="bold")).grid(row=2, column=0, padx=20, pady=5, sticky="w")
+        ctk.CTkButton(self, text="Fermer", command=self.destroy).grid(row=3, column=0, padx=20, pady=(5, 20), sticky="e")
+
+
 class TransmissionsView(ctk.CTkFrame):
     def __init__(self, parent, user_info):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
@@ -27,6 +72,9 @@ class TransmissionsView(ctk.CTkFrame):
         
         self.current_date = date.today()
         self.selected_service_id = None
+        self.displayed_params = None
+        # Jour affiché et jours voisins préchargés : la navigation jour par jour est immédiate
+        self.day_cache = PeriodCache(load_day_transmissions, ('transmissions', 'youngs'))
         
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
@@ -64,9 +112,10 @@ class TransmissionsView(ctk.CTkFrame):
         self.add_button = ctk.CTkButton(self.control_frame, text="Rédiger", command=self.add_transmission, height=28)
         self.add_button.grid(row=0, column=4, padx=10, pady=5, sticky="e")
 
-        self.scroll_frame = ctk.CTkScrollableFrame(self, label_text="Transmissions")
-        self.scroll_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
-        self.scroll_frame.grid_columnconfigure(0, weight=1)
+        self.transmissions_list = VirtualList(self, row_height=TRANSMISSION_ROW_HEIGHT, create_row=self.create_transmission_widget,
+                                              update_row=self.update_transmission_widget, label_text="Transmissions",
+                                              empty_text="Aucune transmission enregistrée pour ce jour.")
+        self.transmissions_list.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
 
     def load_services(self):
         """Charge la liste des services et ajoute l'option 'Tous les services'."""
@@ -86,57 +135,80 @@ class TransmissionsView(ctk.CTkFrame):
         self.refresh_transmissions()
 
     def refresh_transmissions(self):
-        """Met à jour l'affichage des transmissions en fonction du filtre."""
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
-            
+        """Met à jour l'affichage des transmissions en fonction du filtre (requête en arrière-plan)."""
         self.date_label.configure(text=self.current_date.strftime("%A %d %B %Y").capitalize())
         
         iso_date = self.current_date.isoformat()
-        transmissions_data = get_transmissions_for_period(iso_date, iso_date, self.selected_service_id)
-        
-        if not transmissions_data:
-            ctk.CTkLabel(self.scroll_frame, text="Aucune transmission enregistrée pour ce jour.").pack(pady=20)
-            return
-            
-        for trans in transmissions_data:
-            self.create_transmission_widget(trans)
-
-    def create_transmission_widget(self, trans_data):
-        """Crée un widget pour une seule transmission."""
-        border_color = self.color_map.get(trans_data.get('couleur'), "gray50")
+        params = (iso_date, self.selected_service_id)
+        # Même jour et même filtre : on garde les cartes affichées, seules les différences seront appliquées.
+        from_cache = self.day_cache.load(self, params, lambda data: self.display_transmissions(params, data), async_key="transmissions")
+        if not from_cache and params != self.displayed_params:
+            self.transmissions_list.show_message("Chargement...")
+
+    def display_transmissions(self, params, transmissions_data):
+        reset_scroll = params != self.displayed_params
+        self.displayed_params = params
+        self.transmissions_list.set_items(transmissions_data, reset_scroll=reset_scroll)
+        shown_date = date.fromisoformat(params[0])
+        self.day_cache.prefetch(self, [((shown_date + timedelta(days=step)).isoformat(), params[1]) for step in (-1, 1)])
+
+    def create_transmission_widget(self, slot):
+        """Crée le squelette d'une carte de transmission, recyclée d'un élément à l'autre."""
+        row = {}
+        row["frame"] = ctk.CTkFrame(slot, border_width=2)
+        row["frame"].pack(fill="both", expand=True, padx=5, pady=5)
+        row["frame"].grid_columnconfigure(1, weight=1)
+
+        row["color_dot"] = ctk.CTkFrame(row["frame"], width=15, height=15, corner_radius=10)
+        row["color_dot"].grid(row=0, column=0, rowspan=3, padx=10, pady=10, sticky="n")
         
-        trans_frame = ctk.CTkFrame(self.scroll_frame, border_width=2, border_color=border_color)
-        trans_frame.pack(fill="x", padx=5, pady=5, anchor="n")
-        trans_frame.grid_columnconfigure(1, weight=1)
-
-        color_dot = ctk.CTkFrame(trans_frame, fg_color=border_color, width=15, height=15, corner_radius=10)
-        color_dot.grid(row=0, column=0, rowspan=3, padx=10, pady=10, sticky="n")
-        
-        header_frame = ctk.CTkFrame(trans_frame, fg_color="transparent")
+        header_frame = ctk.CTkFrame(row["frame"], fg_color="transparent")
         header_frame.grid(row=0, column=1, sticky="ew", padx=10, pady=(5,0))
         header_frame.grid_columnconfigure(1, weight=1)
         
-        dt_obj = datetime.fromisoformat(trans_data['datetime_transmission'])
-        author_text = f"Par {trans_data['user_prenom']} {trans_data['user_nom'].upper()} le {dt_obj.strftime('%d/%m/%Y à %H:%M')}"
-        ctk.CTkLabel(header_frame, text=author_text, font=ctk.CTkFont(size=11, slant="italic"), text_color="gray").grid(row=0, column=0, sticky="w")
-        
-        ctk.CTkLabel(header_frame, text=f"Service : {trans_data['nom_service']}", font=ctk.CTkFont(size=12, weight="bold")).grid(row=0, column=1, sticky="w", padx=20)
+        row["author"] = ctk.CTkLabel(header_frame, text="", font=ctk.CTkFont(size=11, slant="italic"), text_color="gray")
+        row["author"].grid(row=0, column=0, sticky="w")
+        row["service"] = ctk.CTkLabel(header_frame, text="", font=ctk.CTkFont(size=12, weight="bold"))
+        row["service"].grid(row=0, column=1, sticky="w", padx=20)
 
         button_frame = ctk.CTkFrame(header_frame, fg_color="transparent")
         button_frame.grid(row=0, column=2, sticky="e")
+        # Affiché seulement quand le contenu est tronqué
+        row["read_btn"] = ctk.CTkButton(button_frame, text="Lire", width=50, height=24)
+        row["edit_btn"] = ctk.CTkButton(button_frame, text="Modifier", width=70, height=24)
+        row["edit_btn"].pack(side="left", padx=(0,5))
+        row["delete_btn"] = ctk.CTkButton(button_frame, text="Supprimer", width=80, height=24, fg_color="#D32F2F", hover_color="#B71C1C")
+        row["delete_btn"].pack(side="left")
         
-        edit_btn = ctk.CTkButton(button_frame, text="Modifier", width=70, height=24, 
-                                 command=lambda t_id=trans_data['id']: self.edit_transmission(t_id))
-        edit_btn.pack(side="left", padx=(0,5))
-
-        delete_btn = ctk.CTkButton(button_frame, text="Supprimer", width=80, height=24, fg_color="#D32F2F", hover_color="#B71C1C",
-                                   command=lambda t_id=trans_data['id']: self.delete_transmission(t_id))
-        delete_btn.pack(side="left")
+        row["category"] = ctk.CTkLabel(row["frame"], text="", font=ctk.CTkFont(size=12, weight="bold"))
+        row["category"].grid(row=1, column=1, sticky="w", padx=10, pady=(5,0))
+        row["content"] = ctk.CTkLabel(row["frame"], text="", wraplength=700, justify="left", anchor="w")
+        row["content"].grid(row=2, column=1, sticky="w", padx=10, pady=5)
+        row["youngs"] = ctk.CTkLabel(row["frame"], text="", font=ctk.CTkFont(size=11, weight="bold"))
+        row["youngs"].grid(row=3, column=1, sticky="w", padx=10, pady=(0,5))
+        return row
+
+    def update_transmission_widget(self, row, trans_data):
+        """Remplit une carte avec les données d'une transmission."""
+        border_color = self.color_map.get(trans_data.get('couleur'), "gray50")
+        row["frame"].configure(border_color=border_color)
+        row["color_dot"].configure(fg_color=border_color)
+        
+        dt_obj = datetime.fromisoformat(trans_data['datetime_transmission'])
+        row["author"].configure(text=f"Par {trans_data['user_prenom']} {trans_data['user_nom'].upper()} le {dt_obj.strftime('%d/%m/%Y à %H:%M')}")
+        row["service"].configure(text=f"Service : {trans_data['nom_service']}")
+        row["edit_btn"].configure(command=lambda t_id=trans_data['id']: self.edit_transmission(t_id))
+        row["delete_btn"].configure(command=lambda t_id=trans_data['id']: self.delete_transmission(t_id))
         
-        ctk.CTkLabel(trans_frame, text=f"Catégorie : {trans_data['categorie'].capitalize()}", font=ctk.CTkFont(size=12, weight="bold")).grid(row=1, column=1, sticky="w", padx=10, pady=(5,0))
-        ctk.CTkLabel(trans_frame, text=trans_data['contenu'], wraplength=700, justify="left", anchor="w").grid(row=2, column=1, sticky="w", padx=10, pady=5)
-        ctk.CTkLabel(trans_frame, text=f"Concernés : {trans_data['linked_youngs']}", font=ctk.CTkFont(size=11, weight="bold")).grid(row=3, column=1, sticky="w", padx=10, pady=(0,5))
+        contenu, truncated = content_preview(trans_data['contenu'])
+        if truncated:
+            row["read_btn"].configure(command=lambda t=trans_data: TransmissionReader(self, t))
+            row["read_btn"].pack(side="left", padx=(0,5), before=row["edit_btn"])
+        else:
+            row["read_btn"].pack_forget()
+        row["category"].configure(text=f"Catégorie : {trans_data['categorie'].capitalize()}")
+        row["content"].configure(text=contenu)
+        row["youngs"].configure(text=f"Concernés : {trans_data['linked_youngs']}")
         
     def add_transmission(self):
         form = TransmissionForm(self, user_info=self.user_info)
@@ -164,4 +236,7 @@ class TransmissionsView(ctk.CTkFrame):
 
     def go_to_previous_day(self): self.current_date -= timedelta(days=1); self.refresh_transmissions()
     def go_to_next_day(self): self.current_date += timedelta(days=1); self.refresh_transmissions()
-    def refresh_list(self): self.refresh_transmissions()
+    def refresh_list(self):
+        # Rafraîchissement explicite : le jour affiché est relu, seuls les jours voisins restent en cache
+        self.day_cache.discard((self.current_date.isoformat(), self.selected_service_id))
+        self.refresh_transmissions()
@@ -4,8 +4,10 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from .trip_form import TripForm
+from .virtual_list import VirtualList, set_radio_row
+from . import data_loader
 # Imports directs des fonctions pour éviter les conflits
-from models.trips.trips import get_all_trips, delete_trip
+from models.trips.trips import get_trips_page, delete_trip
 from utils import date_util
 
 class TripListView(ctk.CTkFrame):
@@ -32,34 +34,46 @@ class TripListView(ctk.CTkFrame):
         self.delete_button.pack(side="left", padx=10, pady=10)
 
         # --- Cadre pour la liste ---
-        self.scroll_frame = ctk.CTkScrollableFrame(self, label_text="Historique des trajets")
-        self.scroll_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
-        self.scroll_frame.grid_columnconfigure(0, weight=1)
-        
         self.radio_var = ctk.IntVar(value=0)
+        self.trip_list = VirtualList(self, row_height=34, create_row=self.create_trip_row, update_row=self.update_trip_row,
+                                     label_text="Historique des trajets", empty_text="Aucun trajet enregistré.",
+                                     on_reach_end=self.load_next_page)
+        self.trip_list.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        
         self.refresh_list()
 
     def refresh_list(self):
-        """Met à jour la liste des trajets affichée."""
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
-
-        all_trips = get_all_trips()
-
-        if not all_trips:
-            ctk.CTkLabel(self.scroll_frame, text="Aucun trajet enregistré.").pack(pady=20)
-            return
-            
-        for i, trip in enumerate(all_trips):
-            date_fr = date_util.format_date_to_french(trip['date_trajet'])
-            text = f"Date: {date_fr} | Motif: {trip['motif'] or 'N/A'} | Conducteur: {trip['professional_name']} | Véhicule: {trip['vehicle_name']}"
-            
-            radio_button = ctk.CTkRadioButton(self.scroll_frame, text=text, variable=self.radio_var, value=trip['id'],
-                                              command=self.on_select)
-            radio_button.grid(row=i, column=0, padx=10, pady=5, sticky="w")
+        """Met à jour la liste des trajets affichée (première page, la suite est chargée au défilement)."""
+        trips, self.next_cursor = get_trips_page()
+        self.page_generation = getattr(self, 'page_generation', 0) + 1
+        self.trip_list.set_items(trips, reset_scroll=False)
         
+        if self.radio_var.get() not in [trip['id'] for trip in trips]:
+            self.radio_var.set(0)
         self.on_select()
 
+    def load_next_page(self):
+        """Charge la page suivante en arrière-plan quand la fin de la liste est atteinte."""
+        if not self.next_cursor: return
+        generation = self.page_generation
+        data_loader.run_async(self, get_trips_page, self.next_cursor,
+                              callback=lambda page: self.on_page_loaded(generation, page), key="trips_page")
+
+    def on_page_loaded(self, generation, page):
+        if generation != self.page_generation: return  # liste rafraîchie entre-temps
+        trips, self.next_cursor = page
+        self.trip_list.append_items(trips)
+
+    def create_trip_row(self, slot):
+        radio_button = ctk.CTkRadioButton(slot, text="", variable=self.radio_var, value=0, command=self.on_select)
+        radio_button.pack(anchor="w", padx=10, pady=5)
+        return radio_button
+
+    def update_trip_row(self, radio_button, trip):
+        date_fr = date_util.format_date_to_french(trip['date_trajet'])
+        text = f"Date: {date_fr} | Motif: {trip['motif'] or 'N/A'} | Conducteur: {trip['professional_name']} | Véhicule: {trip['vehicle_name']}"
+        set_radio_row(radio_button, self.radio_var, text, trip['id'])
+
     def on_select(self):
         """Active les boutons d'action lors de la sélection."""
         self.selected_trip_id = self.radio_var.get()
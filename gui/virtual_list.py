@@ -0,0 +1,191 @@
+# Fichier : gui/virtual_list.py
+# Description : Liste défilante virtualisée : seules les lignes visibles sont dessinées
+#               et les widgets de ligne sont recyclés au défilement.
+
+import sys
+import customtkinter as ctk
+
+WHEEL_STEP_PX = 40
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Remplace un CTkScrollableFrame pour les longues listes à hauteur de ligne fixe.
+    create_row(slot) construit une ligne vide dans le cadre 'slot' et renvoie un objet
+    (widget, dictionnaire de widgets...) ; update_row(row, item) le remplit avec un élément.
+    Seules les lignes visibles (plus une) existent, quel que soit le nombre d'éléments.
+    """
+    def __init__(self, parent, row_height, create_row, update_row, label_text=None, empty_text="", on_reach_end=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.update_row = update_row
+        self.empty_text = empty_text
+        # Appelé une fois par taille de liste quand la dernière ligne devient visible (chargement par pages).
+        self.on_reach_end = on_reach_end
+        self._end_notified_for = None
+
+        self.items = []
+        self._offset = 0
+        self._slots = []  # [cadre, ligne, index affiché, élément affiché]
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        if label_text:
+            self.label = ctk.CTkLabel(self, text=label_text, corner_radius=self.cget("corner_radius"),
+                                      fg_color=ctk.ThemeManager.theme["CTkScrollableFrame"]["label_fg_color"])
+            self.label.grid(row=0, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.body.grid(row=1, column=0, padx=(5, 0), pady=5, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, padx=(0, 5), pady=5, sticky="ns")
+
+        self.message_label = ctk.CTkLabel(self.body, text="", text_color="gray")
+
+        self.body.bind("<Configure>", lambda e: self._render(), add="+")
+        # Liaisons globales (la molette vise le widget survolé, souvent une ligne) retirées dans destroy()
+        wheel_sequences = ["<MouseWheel>"] if sys.platform.startswith("win") or sys.platform == "darwin" else ["<Button-4>", "<Button-5>"]
+        self._wheel_bindings = [(sequence, self.bind_all(sequence, self._on_mouse_wheel, add="+")) for sequence in wheel_sequences]
+
+    def destroy(self):
+        for sequence, funcid in self._wheel_bindings:
+            # unbind_all retirerait aussi les gestionnaires des autres listes et des CTkScrollableFrame :
+            # on ne retire que la ligne de ce gestionnaire dans le script lié à "all".
+            script = self.tk.call("bind", "all", sequence)
+            kept = "\n".join(line for line in script.split("\n") if funcid not in line)
+            self.tk.call("bind", "all", sequence, kept)
+            self.deletecommand(funcid)
+        self._wheel_bindings = []
+        super().destroy()
+
+    # --- API publique ---
+
+    def set_items(self, items, reset_scroll=True, empty_text=None):
+        """
+        Remplace les éléments affichés. Ne crée aucun widget si les lignes existent déjà,
+        et une ligne visible dont l'élément n'a pas changé n'est pas reconfigurée.
+        """
+        self.items = list(items)
+        if empty_text is not None:
+            self.empty_text = empty_text
+        if reset_scroll:
+            self._offset = 0
+        self._end_notified_for = None
+        self._render()
+
+    def append_items(self, items):
+        """Ajoute des éléments en fin de liste (page suivante) sans toucher aux lignes visibles."""
+        self.items.extend(items)
+        self._render()
+
+    def show_message(self, text):
+        """Vide la liste et affiche un message (chargement, erreur...)."""
+        self.items = []
+        self._offset = 0
+        self._render(message=text)
+
+    def refresh_rows(self):
+        """Redessine les lignes visibles, par exemple après un changement de sélection."""
+        for slot in self._slots:
+            slot[2] = slot[3] = None
+        self._render()
+
+    def scroll_to_index(self, index):
+        """Fait défiler la liste pour que l'élément d'indice donné soit visible."""
+        top = index * self.row_height
+        view = self._view_height()
+        if top < self._offset:
+            self._offset = top
+        elif top + self.row_height > self._offset + view:
+            self._offset = top + self.row_height - view
+        self._render()
+
+    # --- Rendu ---
+
+    def _view_height(self):
+        scaling = self._get_widget_scaling()
+        return max(int(self.body.winfo_height() / scaling), 1)
+
+    def _ensure_slots(self, count):
+        while len(self._slots) < count:
+            slot = ctk.CTkFrame(self.body, height=self.row_height, fg_color="transparent", corner_radius=0)
+            slot.grid_propagate(False)
+            slot.pack_propagate(False)
+            self._slots.append([slot, self.create_row(slot), None, None])
+
+    def _render(self, message=None):
+        view = self._view_height()
+        total = len(self.items) * self.row_height
+        self._offset = max(0, min(self._offset, total - view))
+
+        first = self._offset // self.row_height
+        shift = self._offset % self.row_height
+        self._ensure_slots(min(len(self.items), view // self.row_height + 2))
+
+        for i, slot in enumerate(self._slots):
+            frame, row, shown_index, shown_item = slot
+            index = first + i
+            if index >= len(self.items) or i * self.row_height - shift >= view:
+                frame.place_forget()
+                slot[2] = slot[3] = None
+                continue
+            item = self.items[index]
+            if shown_index != index or shown_item != item:
+                self.update_row(row, item)
+                slot[2], slot[3] = index, item
+            frame.place(x=0, y=i * self.row_height - shift, relwidth=1.0)
+
+        text = message if message is not None else (self.empty_text if not self.items else "")
+        if text:
+            self.message_label.configure(text=text)
+            self.message_label.place(relx=0.5, y=20, anchor="n")
+        else:
+            self.message_label.place_forget()
+
+        if total <= view:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, (self._offset + view) / total)
+
+        if self.on_reach_end and self.items and self._offset + view >= total and self._end_notified_for != len(self.items):
+            self._end_notified_for = len(self.items)
+            self.on_reach_end()
+
+    # --- Défilement ---
+
+    def _scroll_by(self, pixels):
+        self._offset += int(pixels)
+        self._render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        total = len(self.items) * self.row_height
+        if action == "moveto":
+            self._offset = int(float(value) * total)
+            self._render()
+        elif action == "scroll":
+            step = self._view_height() if unit == "pages" else WHEEL_STEP_PX
+            self._scroll_by(float(value) * step)
+
+    def _on_mouse_wheel(self, event):
+        widget_path, body_path = str(event.widget), str(self.body)
+        if widget_path != body_path and not widget_path.startswith(body_path + "."):
+            return
+        if sys.platform.startswith("win"):
+            self._scroll_by(-event.delta / 120 * WHEEL_STEP_PX)
+        elif sys.platform == "darwin":
+            self._scroll_by(-event.delta * 8)
+        else:
+            self._scroll_by(-WHEEL_STEP_PX if event.num == 4 else WHEEL_STEP_PX)
+
+
+def set_radio_row(radio_button, variable, text, value, command=None):
+    """Recycle un CTkRadioButton pour un nouvel élément en synchronisant son état coché."""
+    radio_button.configure(text=text, value=value)
+    if command is not None:
+        radio_button.configure(command=command)
+    if variable.get() == value:
+        radio_button.select(from_variable_callback=True)
+    else:
+        radio_button.deselect(from_variable_callback=True)
@@ -16,7 +16,7 @@ except locale.Error:
 
 
 class WeeklyMealSummaryView(ctk.CTkToplevel):
-    def __init__(self, parent, start_of_week):
+    def __init__(self, parent, start_of_week, service_id=None):
         super().__init__(parent)
         self.transient(parent)
         self.grab_set()
@@ -24,6 +24,7 @@ class WeeklyMealSummaryView(ctk.CTkToplevel):
         self.title(f"Récapitulatif des repas pour la semaine du {start_of_week.strftime('%d/%m/%Y')}")
         self.geometry("900x550")
         self.resizable(True, True)
+        self.service_id = service_id
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -36,7 +37,7 @@ class WeeklyMealSummaryView(ctk.CTkToplevel):
     def populate_view(self, start_of_week):
         """Remplit le tableau avec les données de la semaine."""
         end_of_week = start_of_week + timedelta(days=6)
-        summary_data = get_weekly_meal_summary(start_of_week, end_of_week)
+        summary_data = get_weekly_meal_summary(start_of_week, end_of_week, service_id=self.service_id)
         
         # En-têtes du tableau
         headers = ["Jour", "Catégorie", "Normal", "Sans Porc", "Végétarien", "TOTAL"]
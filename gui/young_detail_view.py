@@ -2,21 +2,37 @@
 # Description : Vue détaillée de la fiche d'un jeune, avec des onglets.
 
 import customtkinter as ctk
+from collections import OrderedDict
 from datetime import datetime
 from tkinter import messagebox
 # Imports directs des fonctions pour éviter les conflits
-from models.youngs.youngs import get_young_details
-from models.permissions.permissions import get_user_details
-from models.services.services import get_service_details
+from models.youngs.youngs import get_young_profile
 from models.reports.reports import get_all_reports
 from models.projet_p.projet_p import get_all_projets
 from models.transmissions.transmissions import get_transmissions_for_young
 from models.events.events import get_events_for_young
+from models.database.cache import get_data_stamp
 from utils import date_util
+from . import data_loader
 from .contacts_list import ContactsListView
 from .report_form import ReportForm
 from .projet_p_form import ProjetPersonnaliseForm
 
+# Données déjà chargées, par (young_id, onglet) : (marqueur de fraîcheur, données), les plus
+# anciennes étant évincées au-delà de TAB_CACHE_MAX_ENTRIES. Une écriture locale (invalidate) ou
+# d'un autre poste change le marqueur (voir get_data_stamp) et rend l'entrée périmée.
+_tab_cache = OrderedDict()
+TAB_CACHE_MAX_ENTRIES = 30
+
+# Caches modèles (voir models/database/cache.py) dont dépend chaque onglet.
+TAB_DEPENDENCIES = {
+    "Informations": ('youngs', 'users', 'services'),
+    "Agenda": ('events',),
+    "Transmissions": ('transmissions', 'users', 'services'),
+    "Projet Personnalisé": ('projets',),
+    "Rapports": ('reports',),
+}
+
 class YoungDetailView(ctk.CTkFrame):
     def __init__(self, parent, young_id, user_info):
         """
@@ -39,7 +55,7 @@ class YoungDetailView(ctk.CTkFrame):
         self.title_label.pack(side="left", padx=10, pady=10)
 
         # --- Système d'onglets ---
-        self.tab_view = ctk.CTkTabview(self, anchor="nw")
+        self.tab_view = ctk.CTkTabview(self, anchor="nw", command=self.on_tab_change)
         self.tab_view.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
 
         self.tab_view.add("Informations")
@@ -50,24 +66,68 @@ class YoungDetailView(ctk.CTkFrame):
         self.tab_view.add("Rapports")
 
         # --- Remplissage des onglets ---
-        self.populate_all_tabs()
+        # Chaque onglet n'est chargé qu'à sa première ouverture (les données sont mises en cache par jeune).
+        self.rendered_tabs = {}
+        self.tab_loaders = {
+            "Informations": (get_young_profile, self.populate_info_tab),
+            "Agenda": (get_events_for_young, self.populate_agenda_tab),
+            "Transmissions": (get_transmissions_for_young, self.populate_transmissions_tab),
+            "Projet Personnalisé": (self.load_projet_data, self.populate_projets_tab),
+            "Rapports": (lambda young_id: get_all_reports(young_id=young_id), self.populate_reports_tab),
+        }
+        self.populate_tab(self.tab_view.get())
 
+    def on_tab_change(self):
+        self.populate_tab(self.tab_view.get())
 
     def populate_all_tabs(self):
-        """Remplit ou met à jour tous les onglets avec les dernières informations."""
-        tab_names = ["Informations", "Contacts", "Agenda", "Transmissions", "Projet Personnalisé", "Rapports"]
-        for tab_name in tab_names:
-             for widget in self.tab_view.tab(tab_name).winfo_children():
-                widget.destroy()
-
-        self.populate_info_tab(self.tab_view.tab("Informations"))
-        self.populate_contacts_tab(self.tab_view.tab("Contacts"))
-        self.populate_agenda_tab(self.tab_view.tab("Agenda"))
-        self.populate_transmissions_tab(self.tab_view.tab("Transmissions"))
-        self.populate_projets_tab(self.tab_view.tab("Projet Personnalisé"))
-        self.populate_reports_tab(self.tab_view.tab("Rapports"))
-
-    def populate_info_tab(self, tab):
+        """Met à jour la fiche après une modification : l'onglet affiché est rechargé, les autres le seront à leur ouverture."""
+        self.rendered_tabs = {name: stamp for name, stamp in self.rendered_tabs.items() if name == "Contacts"}
+        self.populate_tab(self.tab_view.get())
+
+    def populate_tab(self, tab_name):
+        """Affiche un onglet depuis le cache si ses données sont à jour, sinon les charge en arrière-plan."""
+        tab = self.tab_view.tab(tab_name)
+        if tab_name == "Contacts":
+            if tab_name not in self.rendered_tabs:
+                self.populate_contacts_tab(tab)
+                self.rendered_tabs[tab_name] = None
+            return
+
+        stamp = get_data_stamp(*TAB_DEPENDENCIES[tab_name])
+        if self.rendered_tabs.get(tab_name) == stamp:
+            return
+        loader, populate = self.tab_loaders[tab_name]
+
+        def render(data):
+            for widget in tab.winfo_children(): widget.destroy()
+            populate(tab, data)
+            self.rendered_tabs[tab_name] = stamp
+
+        cache_key = (self.young_id, tab_name)
+        cached = _tab_cache.get(cache_key)
+        if cached and cached[0] == stamp:
+            _tab_cache.move_to_end(cache_key)
+            render(cached[1])
+            return
+
+        def on_loaded(data):
+            # Le marqueur relevé avant la requête : une écriture pendant le chargement rendra l'entrée périmée.
+            _tab_cache[cache_key] = (stamp, data)
+            _tab_cache.move_to_end(cache_key)
+            while len(_tab_cache) > TAB_CACHE_MAX_ENTRIES:
+                _tab_cache.popitem(last=False)
+            render(data)
+
+        data_loader.show_loading(tab)
+        data_loader.run_async(self, loader, self.young_id, callback=on_loaded, key=f"tab_{tab_name}")
+
+    @staticmethod
+    def load_projet_data(young_id):
+        projets = get_all_projets(young_id=young_id)
+        return projets[0] if projets else None
+
+    def populate_info_tab(self, tab, details):
         """Remplit l'onglet 'Informations' avec les détails du jeune."""
         tab.grid_rowconfigure(0, weight=1)
         tab.grid_columnconfigure(0, weight=1)
@@ -76,7 +136,6 @@ class YoungDetailView(ctk.CTkFrame):
         info_scroll_frame.grid(row=0, column=0, sticky="nsew")
         info_scroll_frame.grid_columnconfigure(1, weight=1)
         
-        details = get_young_details(self.young_id)
         if not details:
             ctk.CTkLabel(info_scroll_frame, text="Impossible de charger les informations.").pack(padx=20, pady=20)
             return
@@ -92,7 +151,7 @@ class YoungDetailView(ctk.CTkFrame):
             "Placement": details.get('type_placement'),
             "Accompagnement": details.get('type_accompagnement'),
             "--- Suivi ---": "",
-            "Référent": "Chargement...", "Co-référent": "Chargement...", "Service": "Chargement...",
+            "Référent": details.get('referent_nom'), "Co-référent": details.get('co_referent_nom'), "Service": details.get('service_nom'),
             "--- Échéances ---": "",
             "Échéance placement": date_util.format_date_to_french(details.get('date_echeance_placement')),
             "Date d'audience": date_util.format_date_to_french(details.get('date_audience')),
@@ -101,21 +160,6 @@ class YoungDetailView(ctk.CTkFrame):
             "Date de sortie": date_util.format_date_to_french(details.get('date_sortie'))
         }
 
-        if details.get('referent_id'):
-            ref_details = get_user_details(details.get('referent_id'))
-            labels_map["Référent"] = f"{ref_details[2]} {ref_details[1].upper()}" if ref_details else "Inconnu"
-        else: labels_map["Référent"] = "Aucun"
-        
-        if details.get('co_referent_id'):
-            coref_details = get_user_details(details.get('co_referent_id'))
-            labels_map["Co-référent"] = f"{coref_details[2]} {coref_details[1].upper()}" if coref_details else "Inconnu"
-        else: labels_map["Co-référent"] = "Aucun"
-
-        if details.get('service_id'):
-            srv_details = get_service_details(details.get('service_id'))
-            labels_map["Service"] = srv_details[1] if srv_details else "Inconnu"
-        else: labels_map["Service"] = "Aucun"
-
         row = 0
         for label_text, value_text in labels_map.items():
             if "---" in label_text: 
@@ -129,15 +173,13 @@ class YoungDetailView(ctk.CTkFrame):
         contacts_view = ContactsListView(tab, self.young_id, self.user_info[1])
         contacts_view.pack(expand=True, fill="both")
         
-    def populate_agenda_tab(self, tab):
+    def populate_agenda_tab(self, tab, events_data):
         """Remplit l'onglet 'Agenda' avec l'historique des événements du jeune."""
         tab.grid_columnconfigure(0, weight=1)
         tab.grid_rowconfigure(0, weight=1)
 
         scroll_frame = ctk.CTkScrollableFrame(tab, label_text="Historique des événements")
         scroll_frame.grid(row=0, column=0, sticky="nsew")
-        
-        events_data = get_events_for_young(self.young_id)
 
         if not events_data:
             ctk.CTkLabel(scroll_frame, text="Aucun événement enregistré pour ce jeune.").pack(pady=20)
@@ -155,7 +197,7 @@ class YoungDetailView(ctk.CTkFrame):
             ctk.CTkLabel(event_frame, text=label_text).pack(anchor="w")
 
 
-    def populate_transmissions_tab(self, tab):
+    def populate_transmissions_tab(self, tab, transmissions_data):
         """Remplit l'onglet 'Transmissions' avec l'historique du jeune."""
         tab.grid_columnconfigure(0, weight=1)
         tab.grid_rowconfigure(0, weight=1)
@@ -164,8 +206,6 @@ class YoungDetailView(ctk.CTkFrame):
         scroll_frame.grid(row=0, column=0, sticky="nsew")
         scroll_frame.grid_columnconfigure(0, weight=1)
 
-        transmissions_data = get_transmissions_for_young(self.young_id)
-
         if not transmissions_data:
             ctk.CTkLabel(scroll_frame, text="Aucune transmission enregistrée pour ce jeune.").pack(pady=20)
             return
@@ -184,11 +224,9 @@ class YoungDetailView(ctk.CTkFrame):
             
             ctk.CTkLabel(trans_frame, text=trans['contenu'], wraplength=500, justify="left", anchor="w").grid(row=1, column=1, sticky="w", padx=10, pady=5)
             
-    def populate_projets_tab(self, tab):
+    def populate_projets_tab(self, tab, young_projet):
         """Remplit l'onglet 'Projet Personnalisé'."""
         tab.grid_columnconfigure(0, weight=1)
-        projets = get_all_projets()
-        young_projet = next((p for p in projets if p['young_id'] == self.young_id), None)
 
         if not young_projet:
             ctk.CTkLabel(tab, text="Aucun projet personnalisé enregistré pour ce jeune.").pack(pady=20)
@@ -199,10 +237,9 @@ class YoungDetailView(ctk.CTkFrame):
         text = f"Projet du {date_fr}"
         ctk.CTkButton(tab, text=text, command=lambda: self.open_projet_form(young_projet['id'])).pack(fill="x", padx=20, pady=10)
 
-    def populate_reports_tab(self, tab):
+    def populate_reports_tab(self, tab, reports):
         """Remplit l'onglet 'Rapports' avec la liste des rapports du jeune."""
         tab.grid_columnconfigure(0, weight=1)
-        reports = get_all_reports(young_id=self.young_id)
 
         if not reports:
             ctk.CTkLabel(tab, text="Aucun rapport enregistré pour ce jeune.").pack(pady=20)
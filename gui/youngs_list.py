@@ -5,6 +5,7 @@ import customtkinter as ctk
 from tkinter import messagebox
 from .youngs_form import YoungForm
 from .young_detail_view import YoungDetailView 
+from .virtual_list import VirtualList, set_radio_row
 from models.youngs.youngs import get_all_youngs, delete_young
 from models.services.services import get_all_services_for_form
 from utils import date_util
@@ -68,31 +69,29 @@ class YoungsView(ctk.CTkFrame):
             self.delete_button.pack(side="left")
         
         # Le cadre de la liste est maintenant sur la ligne 1
-        self.scroll_frame = ctk.CTkScrollableFrame(self.list_container, label_text="Liste des jeunes suivis")
-        self.scroll_frame.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
-        self.scroll_frame.grid_columnconfigure(0, weight=1)
-        
-        self.radio_buttons = []
         self.radio_var = ctk.IntVar(value=0)
+        self.young_list = VirtualList(self.list_container, row_height=34, create_row=self.create_young_row, update_row=self.update_young_row,
+                                      label_text="Liste des jeunes suivis")
+        self.young_list.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
+
+    def create_young_row(self, slot):
+        radio_button = ctk.CTkRadioButton(slot, text="", variable=self.radio_var, value=0, command=self.on_select)
+        radio_button.pack(anchor="w", padx=10, pady=5)
+        return radio_button
+
+    def update_young_row(self, radio_button, young_data):
+        young_id, nom, prenom, _, _, _, _ = young_data
+        set_radio_row(radio_button, self.radio_var, f"{prenom.capitalize()} {nom.upper()}", young_id)
 
     def refresh_list(self):
         """Met à jour la liste des jeunes affichée en fonction du filtre."""
         current_selection = self.radio_var.get()
         
-        for widget in self.scroll_frame.winfo_children(): widget.destroy()
-        self.radio_buttons.clear()
-        
         selected_service_name = self.service_filter_menu.get()
         service_id_filter = self.services_map.get(selected_service_name) if selected_service_name != "Tous les services" else None
         
         self.all_youngs = get_all_youngs(service_id=service_id_filter)
-        for i, young_data in enumerate(self.all_youngs):
-            young_id, nom, prenom, _, _, _, _ = young_data
-            text = f"{prenom.capitalize()} {nom.upper()}"
-            
-            radio_button = ctk.CTkRadioButton(self.scroll_frame, text=text, variable=self.radio_var, value=young_id, command=self.on_select)
-            radio_button.grid(row=i, column=0, padx=10, pady=5, sticky="w")
-            self.radio_buttons.append(radio_button)
+        self.young_list.set_items(self.all_youngs, reset_scroll=False, empty_text="Aucun jeune enregistré.")
         
         if current_selection in [y[0] for y in self.all_youngs]:
             self.radio_var.set(current_selection)
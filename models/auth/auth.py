@@ -3,7 +3,8 @@
 
 import hashlib
 import sqlite3
-from ..database.database import create_connection
+from ..database.database import get_connection
+from ..database.cache import invalidate
 
 def hash_password(password):
     """
@@ -34,36 +35,34 @@ def check_user(identifiant, password):
         tuple: Un tuple contenant (user_id, niveau_authentification) si la connexion réussit,
                sinon None.
     """
-    conn = create_connection()
-    if conn is None:
-        print("Erreur de connexion à la base de données pour l'authentification.")
-        return None
+    with get_connection() as conn:
+        if conn is None:
+            print("Erreur de connexion à la base de données pour l'authentification.")
+            return None
 
-    try:
-        cursor = conn.cursor()
+        try:
+            cursor = conn.cursor()
         
-        # Hachage du mot de passe fourni pour le comparer à celui dans la BDD
-        hashed_password = hash_password(password)
+            # Hachage du mot de passe fourni pour le comparer à celui dans la BDD
+            hashed_password = hash_password(password)
 
-        # Récupération de l'utilisateur par son identifiant et son mot de passe haché
-        cursor.execute(
-            "SELECT id, niveau_authentification FROM users WHERE identifiant = ? AND mot_de_passe = ?",
-            (identifiant, hashed_password)
-        )
+            # Récupération de l'utilisateur par son identifiant et son mot de passe haché
+            cursor.execute(
+                "SELECT id, niveau_authentification FROM users WHERE identifiant = ? AND mot_de_passe = ?",
+                (identifiant, hashed_password)
+            )
         
-        user_data = cursor.fetchone() # fetchone() récupère la première ligne correspondante
+            user_data = cursor.fetchone() # fetchone() récupère la première ligne correspondante
 
-        if user_data:
-            print(f"Authentification réussie pour l'utilisateur ID: {user_data[0]}")
-            return user_data  # Retourne (id, niveau_authentification)
-        else:
-            print("Échec de l'authentification : identifiant ou mot de passe incorrect.")
+            if user_data:
+                print(f"Authentification réussie pour l'utilisateur ID: {user_data[0]}")
+                return user_data  # Retourne (id, niveau_authentification)
+            else:
+                print("Échec de l'authentification : identifiant ou mot de passe incorrect.")
+                return None
+        except sqlite3.Error as e:
+            print(f"Erreur de base de données lors de la vérification de l'utilisateur : {e}")
             return None
-    except sqlite3.Error as e:
-        print(f"Erreur de base de données lors de la vérification de l'utilisateur : {e}")
-        return None
-    finally:
-        conn.close()
 
 # --- Section pour tester et ajouter un premier utilisateur ---
 def add_first_admin_user():
@@ -71,36 +70,35 @@ def add_first_admin_user():
     Ajoute un utilisateur administrateur par défaut si aucun utilisateur n'existe.
     À n'utiliser que pour l'initialisation.
     """
-    conn = create_connection()
-    if conn is None:
-        return
+    with get_connection() as conn:
+        if conn is None:
+            return
 
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(id) FROM users")
-        user_count = cursor.fetchone()[0]
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(id) FROM users")
+            user_count = cursor.fetchone()[0]
 
-        if user_count == 0:
-            print("Aucun utilisateur trouvé. Création de l'administrateur par défaut...")
-            admin_id = "admin"
-            admin_pass = "admin123" # Mot de passe à changer à la première connexion
+            if user_count == 0:
+                print("Aucun utilisateur trouvé. Création de l'administrateur par défaut...")
+                admin_id = "admin"
+                admin_pass = "admin123" # Mot de passe à changer à la première connexion
             
-            hashed_pass = hash_password(admin_pass)
+                hashed_pass = hash_password(admin_pass)
 
-            cursor.execute("""
-                INSERT INTO users (nom, prenom, identifiant, mot_de_passe, niveau_authentification)
-                VALUES (?, ?, ?, ?, ?)
-            """, ("Admin", "System", admin_id, hashed_pass, "gestion administrative"))
+                cursor.execute("""
+                    INSERT INTO users (nom, prenom, identifiant, mot_de_passe, niveau_authentification)
+                    VALUES (?, ?, ?, ?, ?)
+                """, ("Admin", "System", admin_id, hashed_pass, "gestion administrative"))
             
-            conn.commit()
-            print(f"Utilisateur admin créé avec l'identifiant '{admin_id}' et le mot de passe '{admin_pass}'.")
-        else:
-            print("La base de données contient déjà des utilisateurs.")
+                conn.commit()
+                invalidate('users', 'referents')
+                print(f"Utilisateur admin créé avec l'identifiant '{admin_id}' et le mot de passe '{admin_pass}'.")
+            else:
+                print("La base de données contient déjà des utilisateurs.")
 
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la création de l'utilisateur admin : {e}")
-    finally:
-        conn.close()
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la création de l'utilisateur admin : {e}")
 
 if __name__ == '__main__':
     # Cette fonction sera appelée si vous exécutez ce script directement.
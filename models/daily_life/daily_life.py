@@ -2,282 +2,249 @@
 # Description : Fonctions pour la gestion de la présence et des repas.
 
 import sqlite3
-from models.database.database import create_connection
-from datetime import timedelta
+from models.database.database import get_connection
+from models.database.cache import invalidate
+from datetime import date, timedelta
 
-def get_meal_counts_for_date(date_str, service_id=None):
-    """Calcule et retourne le nombre total de repas pour une date donnée."""
-    conn = create_connection()
-    if conn is None: return {}
-    
-    counts = {
-        'jeunes': {'midi': {}, 'soir': {}},
-        'pros': {'midi': {}, 'soir': {}}
-    }
-    meal_types = ['normal', 'sans_porc', 'vegetarien', 'total']
+MEAL_TYPES = ['normal', 'sans_porc', 'vegetarien']
+
+def _meal_rows_sql(date_condition, date_params, service_id=None):
+    """
+    Construit la sous-requête qui déplie les repas des jeunes et des professionnels
+    en lignes (date, service_id, category, moment, meal_type), sans les repas 'aucun' ou vides.
+    'date_condition' porte sur une colonne nommée 'date' (ex : "date = ?").
+    """
+    parts, params = [], []
+    sources = [
+        ('jeunes', "daily_presence dp JOIN youngs y ON dp.young_id = y.id", "dp", "y"),
+        ('pros', "professional_meals pm JOIN users u ON pm.user_id = u.id", "pm", "u"),
+    ]
+    for category, source, alias, owner_alias in sources:
+        for moment in ('midi', 'soir'):
+            sql = (f"SELECT {alias}.date AS date, {owner_alias}.service_id AS service_id, "
+                   f"'{category}' AS category, '{moment}' AS moment, "
+                   f"{alias}.repas_{moment} AS meal_type FROM {source} "
+                   f"WHERE {alias}.{date_condition}")
+            params.extend(date_params)
+            if service_id:
+                sql += f" AND {owner_alias}.service_id = ?"
+                params.append(service_id)
+            parts.append(sql)
+    sql = f"""
+        SELECT * FROM ({' UNION ALL '.join(parts)})
+        WHERE meal_type IS NOT NULL AND meal_type NOT IN ('', 'aucun')
+    """
+    return sql, params
+
+def _empty_meal_counts():
+    counts = {'jeunes': {'midi': {}, 'soir': {}}, 'pros': {'midi': {}, 'soir': {}}}
     for category in counts:
         for moment in counts[category]:
-            for m_type in meal_types: counts[category][moment][m_type] = 0
+            for m_type in MEAL_TYPES + ['total']: counts[category][moment][m_type] = 0
+    return counts
 
-    try:
-        cursor = conn.cursor()
-        
-        # CORRECTION: La logique de comptage est plus robuste.
-        # Repas des jeunes
-        sql_jeunes = "SELECT dp.repas_midi, dp.repas_soir FROM daily_presence dp JOIN youngs y ON dp.young_id = y.id WHERE dp.date = ?"
-        params_jeunes = [date_str]
-        if service_id:
-            sql_jeunes += " AND y.service_id = ?"
-            params_jeunes.append(service_id)
-        cursor.execute(sql_jeunes, params_jeunes)
-        for repas_midi, repas_soir in cursor.fetchall():
-            if repas_midi and repas_midi != 'aucun':
-                counts['jeunes']['midi'][repas_midi] = counts['jeunes']['midi'].get(repas_midi, 0) + 1
-                counts['jeunes']['midi']['total'] += 1
-            if repas_soir and repas_soir != 'aucun':
-                counts['jeunes']['soir'][repas_soir] = counts['jeunes']['soir'].get(repas_soir, 0) + 1
-                counts['jeunes']['soir']['total'] += 1
-                
-        # Repas des professionnels
-        sql_pros = "SELECT pm.repas_midi, pm.repas_soir FROM professional_meals pm JOIN users u ON pm.user_id = u.id WHERE pm.date = ?"
-        params_pros = [date_str]
-        if service_id:
-            sql_pros += " AND u.service_id = ?"
-            params_pros.append(service_id)
-        cursor.execute(sql_pros, params_pros)
-        for repas_midi, repas_soir in cursor.fetchall():
-            if repas_midi and repas_midi != 'aucun':
-                counts['pros']['midi'][repas_midi] = counts['pros']['midi'].get(repas_midi, 0) + 1
-                counts['pros']['midi']['total'] += 1
-            if repas_soir and repas_soir != 'aucun':
-                counts['pros']['soir'][repas_soir] = counts['pros']['soir'].get(repas_soir, 0) + 1
-                counts['pros']['soir']['total'] += 1
-        
-        return counts
-    except sqlite3.Error as e:
-        print(f"Erreur lors du calcul des effectifs repas : {e}")
-        return {}
-    finally:
-        conn.close()
+# --- Table de synthèse journalière (daily_rollup) ---
+# Une ligne par (date, service, catégorie, moment, type de repas) avec son effectif :
+# category 'jeunes' / 'pros', moment 'midi' / 'soir'. Les présences n'y figurent pas :
+# leur synthèse est détaillée par jeune et se lit directement dans daily_presence.
+# Elle est recalculée pour les dates concernées dans la même transaction que les sauvegardes.
+# Le service retenu est celui du jeune / professionnel au moment du calcul.
+
+def _refresh_daily_rollup(cursor, date_condition, date_params):
+    """Recalcule les lignes de daily_rollup des dates répondant à 'date_condition' (colonne 'date')."""
+    cursor.execute(f"DELETE FROM daily_rollup WHERE {date_condition}", date_params)
+
+    rows_sql, params = _meal_rows_sql(date_condition, date_params)
+    cursor.execute(f"""
+        INSERT INTO daily_rollup (date, service_id, category, moment, item, count)
+        SELECT date, service_id, category, moment, meal_type, COUNT(*)
+        FROM ({rows_sql})
+        GROUP BY date, service_id, category, moment, meal_type
+    """, params)
+
+def refresh_daily_rollup_for_date(cursor, date_str):
+    """Recalcule la synthèse d'une journée (à appeler dans la transaction de la sauvegarde)."""
+    _refresh_daily_rollup(cursor, "date = ?", [date_str])
+
+def refresh_daily_rollup_for_owner(cursor, category, owner_id):
+    """
+    Recalcule la synthèse de toutes les journées où figure un jeune ('jeunes')
+    ou un professionnel ('pros'), par exemple après un changement de service ou une suppression.
+    """
+    if category == 'jeunes':
+        condition = "date IN (SELECT date FROM daily_presence WHERE young_id = ?)"
+    else:
+        condition = "date IN (SELECT date FROM professional_meals WHERE user_id = ?)"
+    _refresh_daily_rollup(cursor, condition, [owner_id])
+
+def rebuild_daily_rollup(cursor):
+    """Reconstruit entièrement la synthèse à partir des données brutes."""
+    _refresh_daily_rollup(cursor, "date IS NOT NULL", [])
+
+def get_meal_counts_for_date(date_str, service_id=None):
+    """
+    Retourne le nombre total de repas pour une date donnée,
+    lu dans la synthèse journalière (coût constant quel que soit l'effectif).
+    """
+    return get_meal_counts_for_range(date_str, date_str, service_id).get(date_str, {})
 
 def get_presence_for_date(date_str, service_id=None):
     """
     Récupère les infos de présence pour les jeunes. Filtre par service si un ID est fourni.
     """
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        sql = "SELECT id, prenom, nom FROM youngs WHERE statut_accueil != 'sorti'"
-        params = []
-        if service_id:
-            sql += " AND service_id = ?"
-            params.append(service_id)
-        sql += " ORDER BY nom, prenom"
-        
-        cursor.execute(sql, params)
-        all_youngs = [dict(row) for row in cursor.fetchall()]
-        
-        cursor.execute("SELECT * FROM daily_presence WHERE date = ?", (date_str,))
-        presence_data = {row['young_id']: dict(row) for row in cursor.fetchall()}
-        
-        full_day_data = []
-        for young in all_youngs:
-            y_id = young['id']
-            data = { "young_id": y_id, "prenom": young['prenom'], "nom": young['nom'],
-                     "presence_status": presence_data.get(y_id, {}).get('presence_status', 'Présent (journée)'),
-                     "repas_midi": presence_data.get(y_id, {}).get('repas_midi', 'normal'),
-                     "repas_soir": presence_data.get(y_id, {}).get('repas_soir', 'normal')}
-            full_day_data.append(data)
-        return full_day_data
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+        
+            sql = "SELECT id, prenom, nom FROM youngs WHERE statut_accueil != 'sorti'"
+            params = []
+            if service_id:
+                sql += " AND service_id = ?"
+                params.append(service_id)
+            sql += " ORDER BY nom, prenom"
+        
+            cursor.execute(sql, params)
+            all_youngs = [dict(row) for row in cursor.fetchall()]
+        
+            cursor.execute("SELECT * FROM daily_presence WHERE date = ?", (date_str,))
+            presence_data = {row['young_id']: dict(row) for row in cursor.fetchall()}
+        
+            full_day_data = []
+            for young in all_youngs:
+                y_id = young['id']
+                data = { "young_id": y_id, "prenom": young['prenom'], "nom": young['nom'],
+                         "presence_status": presence_data.get(y_id, {}).get('presence_status', 'Présent (journée)'),
+                         "repas_midi": presence_data.get(y_id, {}).get('repas_midi', 'normal'),
+                         "repas_soir": presence_data.get(y_id, {}).get('repas_soir', 'normal')}
+                full_day_data.append(data)
+            return full_day_data
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération de la présence : {e}")
+            return []
 
 def save_day_presence(date_str, presence_list):
     """Sauvegarde toutes les informations de présence et de repas pour une journée."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        sql = "INSERT OR REPLACE INTO daily_presence (date, young_id, presence_status, repas_midi, repas_soir) VALUES (?, ?, ?, ?, ?)"
-        data_to_save = [(date_str, item['young_id'], item['presence_status'], item['repas_midi'], item['repas_soir']) for item in presence_list]
-        cursor.executemany(sql, data_to_save)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la sauvegarde de la présence : {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
-
-def get_meal_counts_for_date(date_str, service_id=None):
-    """Calcule et retourne le nombre total de repas pour une date donnée."""
-    conn = create_connection()
-    if conn is None: return {}
-    
-    counts = {'jeunes': {'midi': {}, 'soir': {}}, 'pros': {'midi': {}, 'soir': {}}}
-    meal_types = ['normal', 'sans_porc', 'vegetarien', 'total']
-    for category in counts:
-        for moment in counts[category]:
-            for m_type in meal_types: counts[category][moment][m_type] = 0
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            sql = "INSERT OR REPLACE INTO daily_presence (date, young_id, presence_status, repas_midi, repas_soir) VALUES (?, ?, ?, ?, ?)"
+            data_to_save = [(date_str, item['young_id'], item['presence_status'], item['repas_midi'], item['repas_soir']) for item in presence_list]
+            cursor.executemany(sql, data_to_save)
+            refresh_daily_rollup_for_date(cursor, date_str)
+            conn.commit()
+            invalidate('daily_life')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la sauvegarde de la présence : {e}")
+            conn.rollback()
+            return False
 
-    try:
-        cursor = conn.cursor()
-        
-        # CORRECTION : La logique est plus directe et ne se base plus sur le statut de présence.
-        # Repas des jeunes
-        sql_jeunes = "SELECT dp.repas_midi, dp.repas_soir FROM daily_presence dp JOIN youngs y ON dp.young_id = y.id WHERE dp.date = ?"
-        params_jeunes = [date_str]
-        if service_id:
-            sql_jeunes += " AND y.service_id = ?"
-            params_jeunes.append(service_id)
-        cursor.execute(sql_jeunes, params_jeunes)
-        
-        for repas_midi, repas_soir in cursor.fetchall():
-            if repas_midi and repas_midi != 'aucun':
-                counts['jeunes']['midi'][repas_midi] = counts['jeunes']['midi'].get(repas_midi, 0) + 1
-                counts['jeunes']['midi']['total'] += 1
-            if repas_soir and repas_soir != 'aucun':
-                counts['jeunes']['soir'][repas_soir] = counts['jeunes']['soir'].get(repas_soir, 0) + 1
-                counts['jeunes']['soir']['total'] += 1
-                
-        # Repas des professionnels
-        sql_pros = "SELECT pm.repas_midi, pm.repas_soir FROM professional_meals pm JOIN users u ON pm.user_id = u.id WHERE pm.date = ?"
-        params_pros = [date_str]
-        if service_id:
-            sql_pros += " AND u.service_id = ?"
-            params_pros.append(service_id)
-        cursor.execute(sql_pros, params_pros)
-        
-        for repas_midi, repas_soir in cursor.fetchall():
-            if repas_midi and repas_midi != 'aucun':
-                counts['pros']['midi'][repas_midi] = counts['pros']['midi'].get(repas_midi, 0) + 1
-                counts['pros']['midi']['total'] += 1
-            if repas_soir and repas_soir != 'aucun':
-                counts['pros']['soir'][repas_soir] = counts['pros']['soir'].get(repas_soir, 0) + 1
-                counts['pros']['soir']['total'] += 1
-        
-        return counts
-    finally:
-        conn.close()
-        
 def get_presence_summary(start_date, end_date, service_id=None):
     """Calcule la synthèse des présences. Filtre par service si un ID est fourni."""
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
 
-        sql_youngs = "SELECT id, prenom, nom FROM youngs WHERE statut_accueil != 'sorti'"
-        params_youngs = []
-        if service_id:
-            sql_youngs += " AND service_id = ?"
-            params_youngs.append(service_id)
-        cursor.execute(sql_youngs, params_youngs)
-        all_youngs = {row['id']: f"{row['prenom']} {row['nom'].upper()}" for row in cursor.fetchall()}
-        
-        sql_summary = """
-            SELECT dp.young_id, CASE WHEN dp.presence_status LIKE 'Présent%' THEN 'Présent' ELSE dp.presence_status END as simplified_status, COUNT(*) as count 
-            FROM daily_presence dp JOIN youngs y ON dp.young_id = y.id
-            WHERE dp.date BETWEEN ? AND ?
-        """
-        params_summary = [start_date, end_date]
-        if service_id:
-            sql_summary += " AND y.service_id = ?"
-            params_summary.append(service_id)
-        sql_summary += " GROUP BY dp.young_id, simplified_status"
-        
-        cursor.execute(sql_summary, params_summary)
-        
-        summary_data = {y_id: {'name': name} for y_id, name in all_youngs.items()}
-        for row in cursor.fetchall():
-            y_id = row['young_id']
-            if y_id in summary_data:
-                summary_data[y_id][row['simplified_status']] = row['count']
-        return list(summary_data.values())
-    finally:
-        conn.close()
+            sql_youngs = "SELECT id, prenom, nom FROM youngs WHERE statut_accueil != 'sorti'"
+            params_youngs = []
+            if service_id:
+                sql_youngs += " AND service_id = ?"
+                params_youngs.append(service_id)
+            cursor.execute(sql_youngs, params_youngs)
+            all_youngs = {row['id']: f"{row['prenom']} {row['nom'].upper()}" for row in cursor.fetchall()}
+        
+            sql_summary = """
+                SELECT dp.young_id, CASE WHEN dp.presence_status LIKE 'Présent%' THEN 'Présent' ELSE dp.presence_status END as simplified_status, COUNT(*) as count 
+                FROM daily_presence dp JOIN youngs y ON dp.young_id = y.id
+                WHERE dp.date BETWEEN ? AND ?
+            """
+            params_summary = [start_date, end_date]
+            if service_id:
+                sql_summary += " AND y.service_id = ?"
+                params_summary.append(service_id)
+            sql_summary += " GROUP BY dp.young_id, simplified_status"
+        
+            cursor.execute(sql_summary, params_summary)
+        
+            summary_data = {y_id: {'name': name} for y_id, name in all_youngs.items()}
+            for row in cursor.fetchall():
+                y_id = row['young_id']
+                if y_id in summary_data:
+                    summary_data[y_id][row['simplified_status']] = row['count']
+            return list(summary_data.values())
+        except sqlite3.Error as e:
+            print(f"Erreur lors du calcul de la synthèse des présences : {e}")
+            return []
 
 # ... (les autres fonctions restent les mêmes) ...
 
 def save_professional_meals(date_str, meals_list):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        sql = "INSERT OR REPLACE INTO professional_meals (date, user_id, repas_midi, repas_soir) VALUES (?, ?, ?, ?)"
-        data_to_save = [(date_str, item['user_id'], item['repas_midi'], item['repas_soir']) for item in meals_list]
-        cursor.executemany(sql, data_to_save)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la sauvegarde des repas pro : {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
-
-def get_presence_summary(start_date, end_date, service_id=None):
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        sql_youngs = "SELECT id, prenom, nom FROM youngs WHERE statut_accueil != 'sorti'"
-        params_youngs = []
-        if service_id:
-            sql_youngs += " AND service_id = ?"
-            params_youngs.append(service_id)
-        cursor.execute(sql_youngs, params_youngs)
-        all_youngs = {row['id']: f"{row['prenom']} {row['nom'].upper()}" for row in cursor.fetchall()}
-        
-        sql_summary = "SELECT young_id, CASE WHEN presence_status LIKE 'Présent%' THEN 'Présent' ELSE presence_status END as simplified_status, COUNT(*) as count FROM daily_presence WHERE date BETWEEN ? AND ? GROUP BY young_id, simplified_status"
-        params_summary = [start_date, end_date]
-        if service_id:
-            sql_summary = "SELECT dp.young_id, CASE WHEN dp.presence_status LIKE 'Présent%' THEN 'Présent' ELSE dp.presence_status END as simplified_status, COUNT(*) as count FROM daily_presence dp JOIN youngs y ON dp.young_id = y.id WHERE dp.date BETWEEN ? AND ? AND y.service_id = ? GROUP BY dp.young_id, simplified_status"
-            params_summary.append(service_id)
-        
-        cursor.execute(sql_summary, params_summary)
-        summary_data = {y_id: {'name': name} for y_id, name in all_youngs.items()}
-        for row in cursor.fetchall():
-            y_id = row['young_id']
-            if y_id in summary_data:
-                summary_data[y_id][row['simplified_status']] = row['count']
-        return list(summary_data.values())
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            sql = "INSERT OR REPLACE INTO professional_meals (date, user_id, repas_midi, repas_soir) VALUES (?, ?, ?, ?)"
+            data_to_save = [(date_str, item['user_id'], item['repas_midi'], item['repas_soir']) for item in meals_list]
+            cursor.executemany(sql, data_to_save)
+            refresh_daily_rollup_for_date(cursor, date_str)
+            conn.commit()
+            invalidate('daily_life')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la sauvegarde des repas pro : {e}")
+            conn.rollback()
+            return False
 
+def get_meal_counts_for_range(start_date, end_date, service_id=None):
+    """
+    Retourne les effectifs repas de chaque jour d'une période (bornes incluses),
+    lus en une seule requête dans la synthèse journalière.
+    Accepte des dates 'AAAA-MM-JJ' ou des objets date.
 
-def save_day_presence(date_str, presence_list):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        sql = "INSERT OR REPLACE INTO daily_presence (date, young_id, presence_status, repas_midi, repas_soir) VALUES (?, ?, ?, ?, ?)"
-        data_to_save = []
-        for item in presence_list:
-            data_to_save.append((date_str, item['young_id'], item['presence_status'], item['repas_midi'], item['repas_soir']))
-        cursor.executemany(sql, data_to_save)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la sauvegarde de la présence : {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+    Returns:
+        dict: {'AAAA-MM-JJ': structure identique à get_meal_counts_for_date} pour chaque jour de la période.
+    """
+    if isinstance(start_date, str): start_date = date.fromisoformat(start_date)
+    if isinstance(end_date, str): end_date = date.fromisoformat(end_date)
 
-def get_weekly_meal_summary(start_date, end_date):
     summary = {}
     current_date = start_date
     while current_date <= end_date:
-        date_str = current_date.isoformat()
-        daily_counts = get_meal_counts_for_date(date_str)
-        summary[date_str] = daily_counts
+        summary[current_date.isoformat()] = _empty_meal_counts()
         current_date += timedelta(days=1)
-    return summary
+    if not summary: return summary
+
+    with get_connection() as conn:
+        if conn is None: return {}
+        try:
+            cursor = conn.cursor()
+            sql = """
+                SELECT date, category, moment, item, SUM(count)
+                FROM daily_rollup
+                WHERE date BETWEEN ? AND ? AND moment IN ('midi', 'soir')
+            """
+            params = [start_date.isoformat(), end_date.isoformat()]
+            if service_id:
+                sql += " AND service_id = ?"
+                params.append(service_id)
+            sql += " GROUP BY date, category, moment, item"
+            cursor.execute(sql, params)
+
+            for day_str, category, moment, meal_type, count in cursor.fetchall():
+                counts = summary.get(day_str)
+                if counts is None: continue
+                counts[category][moment][meal_type] = count
+                counts[category][moment]['total'] += count
+            return summary
+        except sqlite3.Error as e:
+            print(f"Erreur lors du calcul des effectifs repas sur la période : {e}")
+            return {}
 
+def get_weekly_meal_summary(start_date, end_date, service_id=None):
+    """Synthèse des repas jour par jour sur la période (voir get_meal_counts_for_range)."""
+    return get_meal_counts_for_range(start_date, end_date, service_id)
@@ -0,0 +1,126 @@
+# Fichier : models/database/cache.py
+# Description : Cache mémoire en lecture pour les listes de référence (services, utilisateurs, jeunes...).
+
+import sqlite3
+import threading
+from functools import wraps
+from .database import get_connection
+
+# Un cache par nom de jeu de données : {nom: {clé des arguments: résultat}}
+_caches = {}
+_stats = {}
+# Compteur d'invalidations par cache, pour détecter les écritures concurrentes
+_generations = {}
+_lock = threading.Lock()
+# Dernier PRAGMA data_version relevé par chaque thread (voir _check_external_writes)
+_seen_data_version = threading.local()
+
+class _Uncached:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+def uncached(value):
+    """
+    Marque le résultat d'une fonction décorée par cached_query pour qu'il soit renvoyé
+    sans être mémorisé : à utiliser pour la valeur de repli en cas d'erreur (base verrouillée,
+    connexion impossible...), afin que l'appel suivant interroge de nouveau la base.
+    """
+    return _Uncached(value)
+
+def cached_query(name):
+    """
+    Décorateur de mise en cache d'une fonction de lecture.
+    Le résultat est mémorisé par combinaison d'arguments (le filtre) jusqu'à
+    l'appel de invalidate(name) par une fonction d'écriture, ou jusqu'à une écriture
+    d'un autre poste, qui vide tous les caches (voir _check_external_writes).
+    Une copie superficielle est renvoyée pour que l'appelant puisse modifier la liste.
+    Les résultats marqués par uncached() (erreurs) ne sont pas mémorisés.
+    """
+    def decorator(func):
+        with _lock:
+            _caches.setdefault(name, {})
+            _stats.setdefault(name, {'hits': 0, 'misses': 0})
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            _check_external_writes()
+            with _lock:
+                entries = _caches[name]
+                if key in entries:
+                    _stats[name]['hits'] += 1
+                    return list(entries[key])
+                _stats[name]['misses'] += 1
+                generation = _generations.get(name, 0)
+
+            result = func(*args, **kwargs)
+            if isinstance(result, _Uncached):
+                return list(result.value)
+
+            with _lock:
+                # On ne mémorise pas un résultat lu avant une invalidation survenue pendant la requête
+                if _generations.get(name, 0) == generation:
+                    _caches[name][key] = result
+            return list(result)
+        return wrapper
+    return decorator
+
+def invalidate(*names):
+    """Vide les caches nommés (tous si aucun nom n'est fourni)."""
+    with _lock:
+        for name in (names or list(_caches)):
+            _caches.get(name, {}).clear()
+            _generations[name] = _generations.get(name, 0) + 1
+
+def _check_external_writes():
+    """
+    Vide tous les caches si une autre connexion a validé une écriture depuis le dernier
+    contrôle fait par ce thread (data_version est propre à chaque connexion, donc à chaque thread).
+    Au premier contrôle d'un thread, rien ne permet de comparer : les caches sont vidés par prudence.
+    """
+    version = get_data_version()
+    previous = getattr(_seen_data_version, 'value', None)
+    _seen_data_version.value = version
+    if version is None or version != previous:
+        invalidate()
+
+def get_generation(*names):
+    """
+    Retourne le nombre d'invalidations de chaque nom, sous forme de tuple.
+    Permet à un cache tenu ailleurs (ex. l'interface) de savoir si ses données sont périmées.
+    """
+    with _lock:
+        return tuple(_generations.get(name, 0) for name in names)
+
+def get_data_version():
+    """
+    Retourne PRAGMA data_version pour la connexion du thread courant (None si illisible).
+    La valeur change dès qu'une autre connexion (un autre poste, ou un autre thread de
+    l'application) a validé une écriture dans la base ; les écritures faites par cette
+    connexion ne la changent pas, elles sont signalées par invalidate().
+    """
+    with get_connection() as conn:
+        if conn is None: return None
+        try:
+            return conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la lecture de data_version : {e}")
+            return None
+
+def get_data_stamp(*names):
+    """
+    Retourne un marqueur de fraîcheur des données qui dépendent des caches nommés, pour un
+    cache tenu par l'interface : il change après invalidate() de l'un de ces noms ou après
+    une écriture d'un autre poste. Deux marqueurs égaux signifient des données inchangées.
+    À appeler depuis le thread de l'interface (data_version est propre à chaque connexion).
+    """
+    data_version = get_data_version()
+    # Sans data_version, le marqueur n'est égal à aucun autre : les données seront relues.
+    return get_generation(*names), data_version if data_version is not None else object()
+
+def get_cache_stats():
+    """Retourne {nom: {'hits': n, 'misses': n, 'entries': n}} pour chaque cache."""
+    with _lock:
+        return {name: {**_stats[name], 'entries': len(_caches[name])} for name in _caches}
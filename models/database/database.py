@@ -4,17 +4,135 @@
 import sqlite3
 from sqlite3 import Error
 import os
+import threading
+from contextlib import contextmanager
+from .migrations import apply_migrations
 
 DATABASE_NAME = "mecs_app.db"
 
+# Profil appliqué à chaque nouvelle connexion. Les valeurs peuvent être surchargées
+# depuis la clé "database" de settings.json (voir set_database_profile).
+# Remarque : le mode WAL suppose que tous les postes accèdent au fichier via un système
+# de fichiers local ; sur un partage réseau (SMB/NFS), utiliser "journal_mode": "DELETE".
+DEFAULT_DATABASE_PROFILE = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,        # Valeur négative = taille en Kio (ici ~16 Mo)
+    "mmap_size": 67108864,       # 64 Mo
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,        # En millisecondes
+    # Désactivé : l'activer rendrait effectives les clauses ON DELETE CASCADE du schéma
+    # (supprimer un utilisateur ou un service effacerait ses transmissions et rapports) et
+    # bloquerait la suppression d'un utilisateur ou d'un véhicule ayant des trajets.
+    # Les chemins de suppression doivent d'abord conserver l'historique et la base existante
+    # passer PRAGMA foreign_key_check avant d'activer ce paramètre.
+    "foreign_keys": False,
+}
+
+_PROFILE_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+
+_database_profile = dict(DEFAULT_DATABASE_PROFILE)
+
+# Une connexion par thread, ouverte à la première utilisation puis réutilisée
+# par tous les appels suivants (sqlite3 interdit le partage entre threads).
+_local = threading.local()
+
 def create_connection():
     conn = None
     try:
         conn = sqlite3.connect(DATABASE_NAME)
+        apply_database_profile(conn)
     except Error as e:
         print(f"Erreur lors de la connexion à la base de données : {e}")
     return conn
 
+def set_database_profile(overrides=None):
+    """
+    Définit le profil de la base de données à partir des valeurs par défaut
+    et des surcharges fournies (dictionnaire issu de settings.json).
+    Les valeurs invalides sont ignorées. Ne concerne que les connexions ouvertes ensuite.
+    """
+    global _database_profile
+    profile = dict(DEFAULT_DATABASE_PROFILE)
+    for key, value in (overrides or {}).items():
+        if key not in DEFAULT_DATABASE_PROFILE:
+            print(f"Paramètre de base de données inconnu ignoré : {key}")
+            continue
+        if key in _PROFILE_CHOICES:
+            value = str(value).upper()
+            if value not in _PROFILE_CHOICES[key]:
+                print(f"Valeur invalide ignorée pour {key} : {value}")
+                continue
+        elif key == "foreign_keys":
+            value = bool(value)
+        else:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                print(f"Valeur invalide ignorée pour {key} : {value}")
+                continue
+        profile[key] = value
+    _database_profile = profile
+
+def get_database_profile():
+    """Retourne une copie du profil actuellement appliqué aux connexions."""
+    return dict(_database_profile)
+
+def apply_database_profile(conn):
+    """Applique les PRAGMA du profil courant à une connexion."""
+    profile = _database_profile
+    cursor = conn.cursor()
+    # busy_timeout en premier : le passage en WAL peut devoir attendre un autre poste.
+    cursor.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+    cursor.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+    cursor.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    cursor.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+    cursor.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    cursor.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+    cursor.execute(f"PRAGMA foreign_keys = {'ON' if profile['foreign_keys'] else 'OFF'}")
+    cursor.close()
+
+@contextmanager
+def get_connection():
+    """
+    Fournit la connexion du thread courant sous forme de gestionnaire de contexte.
+    La connexion reste ouverte après le bloc 'with' pour être réutilisée ;
+    une transaction laissée ouverte (ni commit ni rollback) est annulée à la sortie
+    du bloc le plus externe, comme le faisait auparavant conn.close().
+    Renvoie None si la connexion n'a pas pu être établie.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = create_connection()
+        _local.conn = conn
+        _local.depth = 0
+    if conn is None:
+        yield None
+        return
+
+    if _local.depth == 0:
+        # Chaque appelant choisit sa fabrique de lignes, on repart donc de la valeur par défaut.
+        conn.row_factory = None
+    _local.depth += 1
+    try:
+        yield conn
+    finally:
+        _local.depth -= 1
+        if _local.depth == 0 and conn.in_transaction:
+            conn.rollback()
+
+def close_connection():
+    """Ferme la connexion du thread courant (à appeler à la fermeture de l'application)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+    _local.conn = None
+    _local.depth = 0
+
 def create_table(conn, create_table_sql):
     try:
         c = conn.cursor()
@@ -23,7 +141,10 @@ def create_table(conn, create_table_sql):
         print(f"Erreur lors de la création de la table : {e}")
 
 def initialize_database():
-    """Initialise la base de données en créant toutes les tables nécessaires si elles n'existent pas."""
+    """
+    Initialise la base de données en créant toutes les tables nécessaires si elles n'existent pas,
+    puis applique les migrations de schéma en attente (voir models/database/migrations.py).
+    """
     
     # --- Définition de toutes les tables ---
     sql_create_services_table = "CREATE TABLE IF NOT EXISTS services (id INTEGER PRIMARY KEY, nom_service TEXT NOT NULL UNIQUE, adresse TEXT, telephone TEXT);"
@@ -69,8 +190,10 @@ def initialize_database():
     """
     
 
-    conn = create_connection()
-    if conn is not None:
+    with get_connection() as conn:
+        if conn is None:
+            print("Erreur ! Impossible de créer la connexion à la base de données.")
+            return
         create_table(conn, sql_create_services_table); create_table(conn, sql_create_users_table)
         create_table(conn, sql_create_youngs_table); create_table(conn, sql_create_young_contacts_table)
         create_table(conn, sql_create_events_table); create_table(conn, sql_create_event_young_link_table)
@@ -82,6 +205,12 @@ def initialize_database():
         create_table(conn, sql_create_trips_table); create_table(conn, sql_create_trip_young_link_table)
         create_table(conn, sql_create_daily_presence_table)
         create_table(conn, sql_create_professional_meals_table)
-        conn.close()
-    else:
-        print("Erreur ! Impossible de créer la connexion à la base de données.")
+        conn.commit()
+
+        # Mise à niveau en place du schéma (index, nouvelles tables...) sans perte de données
+        apply_migrations(conn)
+
+        # L'index plein texte dépend de FTS5 : s'il n'a pas pu être créé par sa migration, on réessaie.
+        # Import local : le module search dépend lui-même du module database.
+        from models.search.search import ensure_search_index
+        ensure_search_index(conn)
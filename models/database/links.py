@@ -0,0 +1,80 @@
+# Fichier : models/database/links.py
+# Description : Fonctions partagées pour les tables de liaison avec les jeunes (*_young_link) :
+#               lecture groupée des noms et écriture par différence.
+
+# Tables de liaison connues et colonne identifiant l'élément lié au jeune.
+# Les noms de tables ne pouvant pas être passés en paramètre SQL, seuls ceux-ci sont acceptés.
+YOUNG_LINK_TABLES = {
+    'event_young_link': 'event_id',
+    'task_young_link': 'task_id',
+    'transmission_young_link': 'transmission_id',
+    'trip_young_link': 'trip_id',
+}
+
+# Nombre maximal d'identifiants par requête (limite des paramètres SQLite)
+MAX_IDS_PER_QUERY = 500
+
+def _owner_column(link_table):
+    if link_table not in YOUNG_LINK_TABLES:
+        raise ValueError(f"Table de liaison inconnue : {link_table}")
+    return YOUNG_LINK_TABLES[link_table]
+
+def get_linked_young_names(cursor, link_table, owner_ids):
+    """
+    Récupère en une requête (par lot d'identifiants) les noms des jeunes liés
+    à plusieurs éléments d'une table de liaison.
+
+    Returns:
+        dict: {owner_id: ["Prénom NOM", ...]} ; les éléments sans jeune lié sont absents.
+    """
+    owner_column = _owner_column(link_table)
+    owner_ids = list(dict.fromkeys(owner_ids))
+    names = {}
+    for start in range(0, len(owner_ids), MAX_IDS_PER_QUERY):
+        batch = owner_ids[start:start + MAX_IDS_PER_QUERY]
+        placeholders = ', '.join('?' * len(batch))
+        cursor.execute(f"""
+            SELECT l.{owner_column}, y.prenom, y.nom
+            FROM {link_table} l
+            JOIN youngs y ON y.id = l.young_id
+            WHERE l.{owner_column} IN ({placeholders})
+            ORDER BY l.{owner_column}, l.young_id
+        """, batch)
+        for row in cursor.fetchall():
+            # Le passage en majuscules se fait en Python : UPPER() de SQLite ignore les accents.
+            names.setdefault(row[0], []).append(f"{row[1]} {row[2].upper()}")
+    return names
+
+def attach_linked_young_names(cursor, link_table, items, key, default):
+    """
+    Ajoute à chaque dictionnaire de 'items' la liste des jeunes liés, jointe par des virgules,
+    sous la clé 'key' (ou 'default' s'il n'y en a aucun).
+    """
+    names = get_linked_young_names(cursor, link_table, [item['id'] for item in items])
+    for item in items:
+        item[key] = ", ".join(names.get(item['id'], [])) or default
+    return items
+
+def set_linked_youngs(cursor, link_table, owner_id, young_ids):
+    """
+    Fait correspondre les jeunes liés à un élément avec young_ids, en n'insérant et ne
+    supprimant que la différence avec les liens existants.
+    S'exécute dans la transaction de l'appelant, qui reste responsable du commit.
+
+    Returns:
+        tuple: (nombre de liens ajoutés, nombre de liens supprimés)
+    """
+    owner_column = _owner_column(link_table)
+    wanted = {int(young_id) for young_id in (young_ids or [])}
+    cursor.execute(f"SELECT young_id FROM {link_table} WHERE {owner_column} = ?", (owner_id,))
+    existing = {row[0] for row in cursor.fetchall()}
+
+    to_add = sorted(wanted - existing)
+    to_remove = sorted(existing - wanted)
+    if to_remove:
+        cursor.executemany(f"DELETE FROM {link_table} WHERE {owner_column} = ? AND young_id = ?",
+                           [(owner_id, young_id) for young_id in to_remove])
+    if to_add:
+        cursor.executemany(f"INSERT INTO {link_table} ({owner_column}, young_id) VALUES (?, ?)",
+                           [(owner_id, young_id) for young_id in to_add])
+    return len(to_add), len(to_remove)
@@ -0,0 +1,143 @@
+# Fichier : models/database/migrations.py
+# Description : Migrations versionnées du schéma de la base de données.
+
+import sqlite3
+from datetime import datetime
+
+def _build_daily_rollup(cursor):
+    # Import local : le module daily_life dépend lui-même du module database.
+    from models.daily_life.daily_life import rebuild_daily_rollup
+    rebuild_daily_rollup(cursor)
+
+def _create_search_index(cursor):
+    from models.search.search import create_search_index
+    create_search_index(cursor)
+
+# Chaque migration est un tuple (version, description, étapes).
+# Une étape est soit une requête SQL, soit une fonction recevant le curseur.
+# Les versions doivent être strictement croissantes et ne jamais être modifiées
+# une fois livrées : pour corriger une migration, on en ajoute une nouvelle.
+MIGRATIONS = [
+    (1, "Index des recherches inverses sur les tables de liaison et les clés étrangères", [
+        "CREATE INDEX IF NOT EXISTS idx_event_young_link_young ON event_young_link (young_id, event_id)",
+        "CREATE INDEX IF NOT EXISTS idx_task_young_link_young ON task_young_link (young_id, task_id)",
+        "CREATE INDEX IF NOT EXISTS idx_transmission_young_link_young ON transmission_young_link (young_id, transmission_id)",
+        "CREATE INDEX IF NOT EXISTS idx_trip_young_link_young ON trip_young_link (young_id, trip_id)",
+        "CREATE INDEX IF NOT EXISTS idx_young_contacts_young ON young_contacts (young_id)",
+        "CREATE INDEX IF NOT EXISTS idx_youngs_service ON youngs (service_id)",
+        "CREATE INDEX IF NOT EXISTS idx_youngs_referent ON youngs (referent_id)",
+        "CREATE INDEX IF NOT EXISTS idx_youngs_co_referent ON youngs (co_referent_id)",
+        "CREATE INDEX IF NOT EXISTS idx_users_service ON users (service_id)",
+        "CREATE INDEX IF NOT EXISTS idx_reports_young ON reports (young_id)",
+        "CREATE INDEX IF NOT EXISTS idx_projet_p_objectifs_projet ON projet_p_objectifs (projet_p_id)",
+        "CREATE INDEX IF NOT EXISTS idx_projet_p_moyens_objectif ON projet_p_moyens (objectif_id)",
+    ]),
+    (2, "Index couvrants des requêtes par date (transmissions, agenda, présences, trajets, tâches)", [
+        "CREATE INDEX IF NOT EXISTS idx_transmissions_service_datetime ON transmissions (service_id, datetime_transmission)",
+        "CREATE INDEX IF NOT EXISTS idx_transmissions_datetime ON transmissions (datetime_transmission)",
+        "CREATE INDEX IF NOT EXISTS idx_events_debut ON events (debut_datetime)",
+        "CREATE INDEX IF NOT EXISTS idx_daily_presence_date_cover ON daily_presence (date, young_id, presence_status, repas_midi, repas_soir)",
+        "CREATE INDEX IF NOT EXISTS idx_professional_meals_date_cover ON professional_meals (date, user_id, repas_midi, repas_soir)",
+        "CREATE INDEX IF NOT EXISTS idx_trips_date ON trips (date_trajet, heure_depart)",
+        "CREATE INDEX IF NOT EXISTS idx_reports_date ON reports (date_redaction)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_statut_date ON tasks (statut, date_limite)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_hebdo_service_jour ON tasks_hebdo (service_id, jour_semaine)",
+    ]),
+    (3, "Synthèse journalière des repas et présences (daily_rollup)", [
+        """
+        CREATE TABLE IF NOT EXISTS daily_rollup (
+            date TEXT NOT NULL,
+            service_id INTEGER,
+            category TEXT NOT NULL,  -- 'jeunes' ou 'pros'
+            moment TEXT NOT NULL,    -- 'midi', 'soir' ou 'presence'
+            item TEXT NOT NULL,      -- type de repas ou statut de présence simplifié
+            count INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_daily_rollup_date ON daily_rollup (date, moment, service_id, category, item, count)",
+        _build_daily_rollup,
+    ]),
+    (4, "Index plein texte (FTS5) des transmissions, rapports et projets personnalisés", [
+        _create_search_index,
+    ]),
+    (5, "Événements récurrents (règles et exceptions)", [
+        """
+        CREATE TABLE IF NOT EXISTS event_recurrences (
+            event_id INTEGER PRIMARY KEY,
+            frequence TEXT NOT NULL,             -- 'daily', 'weekly' ou 'monthly'
+            intervalle INTEGER NOT NULL DEFAULT 1,
+            jours_semaine TEXT,                  -- jours 0 (lundi) à 6 séparés par des virgules ('weekly')
+            date_fin TEXT,                       -- dernier jour possible (inclus)
+            nombre INTEGER,                      -- nombre maximal d'occurrences
+            derniere_occurrence TEXT,            -- calculée à l'enregistrement, NULL si la série n'a pas de fin
+            FOREIGN KEY (event_id) REFERENCES events (id) ON DELETE CASCADE
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_event_recurrences_derniere ON event_recurrences (derniere_occurrence)",
+        """
+        CREATE TABLE IF NOT EXISTS event_exceptions (
+            event_id INTEGER NOT NULL,
+            date_occurrence TEXT NOT NULL,       -- jour (AAAA-MM-JJ) de l'occurrence supprimée
+            PRIMARY KEY (event_id, date_occurrence),
+            FOREIGN KEY (event_id) REFERENCES events (id) ON DELETE CASCADE
+        )
+        """,
+    ]),
+    (6, "Retrait des présences de la synthèse journalière (lues par jeune dans daily_presence)", [
+        "DELETE FROM daily_rollup WHERE moment = 'presence'",
+    ]),
+    (7, "Suppression des objectifs et moyens orphelins laissés par les suppressions de projets", [
+        "DELETE FROM projet_p_objectifs WHERE projet_p_id NOT IN (SELECT id FROM projet_p)",
+        "DELETE FROM projet_p_moyens WHERE objectif_id NOT IN (SELECT id FROM projet_p_objectifs)",
+    ]),
+    (8, "Suppression des règles de récurrence, exceptions et liens laissés par les suppressions d'événements", [
+        "DELETE FROM event_exceptions WHERE event_id NOT IN (SELECT id FROM events)",
+        "DELETE FROM event_recurrences WHERE event_id NOT IN (SELECT id FROM events)",
+        "DELETE FROM event_young_link WHERE event_id NOT IN (SELECT id FROM events)",
+    ]),
+]
+
+def get_schema_version(conn):
+    """Retourne la version du schéma enregistrée dans la base (0 si aucune migration)."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+def apply_migrations(conn):
+    """
+    Applique, dans l'ordre, les migrations dont la version est supérieure à celle de la base.
+    Chaque migration est exécutée dans sa propre transaction avec l'enregistrement de sa
+    version : en cas d'erreur elle est annulée entièrement et les suivantes ne sont pas jouées.
+    Retourne la version du schéma après exécution.
+    """
+    current_version = get_schema_version(conn)
+    cursor = conn.cursor()
+    for version, description, steps in MIGRATIONS:
+        if version <= current_version:
+            continue
+        try:
+            cursor.execute("BEGIN")
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, datetime.now().isoformat(timespec='seconds'))
+            )
+            conn.commit()
+            current_version = version
+            print(f"Migration {version} appliquée : {description}")
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la migration {version} ({description}) : {e}")
+            conn.rollback()
+            break
+    return current_version
@@ -2,157 +2,283 @@
 # Description : Fonctions pour la gestion des événements de l'agenda.
 
 import sqlite3
-from models.database.database import create_connection
-from datetime import datetime
+from models.database.database import get_connection
+from models.database.cache import invalidate
+from models.database.links import set_linked_youngs
+from models.events.recurrence import expand_occurrences, last_occurrence_date, normalize_rule
+from utils.date_util import iso_day_range
+from datetime import datetime, date, timedelta
+
+# CORRECTION : La requête SQL a été entièrement revue pour un filtrage correct.
+_EVENTS_SQL = """
+    SELECT
+        e.id,
+        e.nom_evenement,
+        e.debut_datetime,
+        e.fin_datetime,
+        e.type_evenement,
+        GROUP_CONCAT(y.prenom, ', ') as young_names
+    FROM events e
+    LEFT JOIN event_young_link eyl ON e.id = eyl.event_id
+    LEFT JOIN youngs y ON eyl.young_id = y.id
+    WHERE
+        {conditions}
+    -- Regroupement par (debut_datetime, id) : même résultat que par id, mais l'index sur debut_datetime reste utilisé
+    GROUP BY e.debut_datetime, e.id
+    HAVING
+        -- Condition pour afficher l'événement si:
+        -- 1. Aucun filtre de service n'est appliqué
+        ? IS NULL
+        -- 2. OU si l'événement n'est lié à aucun jeune (événement général)
+        OR COUNT(y.id) = 0
+        -- 3. OU si au moins un des jeunes liés appartient au service filtré
+        OR MAX(CASE WHEN y.service_id = ? THEN 1 ELSE 0 END) = 1
+    ORDER BY e.debut_datetime
+"""
 
 def get_events_for_period(start_date, end_date, service_id=None):
     """
     Récupère les événements pour une période donnée.
     Filtre par service en se basant sur les jeunes associés.
     Les événements sans jeunes associés sont considérés comme généraux et toujours affichés.
+    Les événements récurrents sont développés en occurrences sur la seule période demandée
+    (clés supplémentaires 'recurrent' et 'date_occurrence', l'id restant celui de la série).
     """
-    conn = create_connection()
-    if conn is None: return []
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            # Bornes semi-ouvertes pour que l'index sur debut_datetime soit utilisé
+            range_start, range_end = iso_day_range(start_date, end_date)
+
+            # Événements simples
+            cursor.execute(_EVENTS_SQL.format(conditions="""
+                e.debut_datetime >= ? AND e.debut_datetime < ?
+                AND NOT EXISTS (SELECT 1 FROM event_recurrences er WHERE er.event_id = e.id)
+            """), (range_start, range_end, service_id, service_id))
+            events = [dict(row, recurrent=False) for row in cursor.fetchall()]
+
+            # Séries commencées avant la fin de la période et pas encore terminées à son début
+            cursor.execute(_EVENTS_SQL.format(conditions="""
+                e.debut_datetime < ?
+                AND e.id IN (SELECT event_id FROM event_recurrences
+                             WHERE derniere_occurrence IS NULL OR derniere_occurrence >= ?)
+            """), (range_end, range_start, service_id, service_id))
+            series = [dict(row) for row in cursor.fetchall()]
+            if series:
+                rules = _get_recurrence_rules(cursor, [event['id'] for event in series])
+                window_start, window_end = date.fromisoformat(range_start), date.fromisoformat(range_end) - timedelta(days=1)
+                for event in series:
+                    if event['id'] in rules:
+                        events.extend(_expand_event(event, rules[event['id']], window_start, window_end))
+                events.sort(key=lambda event: _parse_datetime(event['debut_datetime']) or datetime.min)
+            return events
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des événements par période : {e}")
+            return []
+
+def _get_recurrence_rules(cursor, event_ids):
+    """Récupère les règles de récurrence (avec leurs exceptions) de plusieurs événements : {event_id: règle}."""
+    placeholders = ", ".join("?" for _ in event_ids)
+    cursor.execute(f"""
+        SELECT event_id, frequence, intervalle, jours_semaine, date_fin, nombre
+        FROM event_recurrences WHERE event_id IN ({placeholders})
+    """, list(event_ids))
+    rules = {}
+    for row in cursor.fetchall():
+        rules[row[0]] = {
+            'frequence': row[1], 'intervalle': row[2] or 1,
+            'jours_semaine': [int(day) for day in row[3].split(',')] if row[3] else [],
+            'date_fin': row[4], 'nombre': row[5], 'exceptions': [],
+        }
+    cursor.execute(f"""
+        SELECT event_id, date_occurrence FROM event_exceptions
+        WHERE event_id IN ({placeholders}) ORDER BY date_occurrence
+    """, list(event_ids))
+    for event_id, date_occurrence in cursor.fetchall():
+        if event_id in rules:
+            rules[event_id]['exceptions'].append(date_occurrence)
+    return rules
+
+def _expand_event(event, rule, window_start, window_end):
+    """Produit une copie de l'événement pour chacune de ses occurrences comprises dans la fenêtre."""
+    debut = _parse_datetime(event['debut_datetime'])
+    if debut is None: return []
+    fin = _parse_datetime(event['fin_datetime'])
+    duration = fin - debut if fin else None
+    # Même format que l'événement d'origine, pour que le tri par texte reste chronologique
+    sep = ' ' if event['debut_datetime'][10:11] == ' ' else 'T'
+    occurrences = []
+    for occurrence in expand_occurrences(debut, rule, window_start, window_end):
+        occurrences.append(dict(
+            event, recurrent=True, date_occurrence=occurrence.date().isoformat(),
+            debut_datetime=occurrence.isoformat(sep=sep),
+            fin_datetime=(occurrence + duration).isoformat(sep=sep) if duration is not None else event['fin_datetime'],
+        ))
+    return occurrences
+
+def _save_recurrence(cursor, event_id, debut_datetime, recurrence):
+    """Enregistre (ou retire si recurrence vaut None) la règle de récurrence d'un événement et ses exceptions."""
+    cursor.execute("DELETE FROM event_exceptions WHERE event_id = ?", (event_id,))
+    if recurrence is None:
+        cursor.execute("DELETE FROM event_recurrences WHERE event_id = ?", (event_id,))
+        return
+    rule = normalize_rule(recurrence)
+    last = last_occurrence_date(datetime.fromisoformat(debut_datetime), rule)
+    cursor.execute("""
+        INSERT OR REPLACE INTO event_recurrences
+            (event_id, frequence, intervalle, jours_semaine, date_fin, nombre, derniere_occurrence)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (event_id, rule['frequence'], rule['intervalle'], ",".join(str(day) for day in rule['jours_semaine']) or None,
+          rule['date_fin'], rule['nombre'], last.isoformat() if last else None))
+    cursor.executemany("INSERT INTO event_exceptions (event_id, date_occurrence) VALUES (?, ?)",
+                       [(event_id, day) for day in rule['exceptions']])
+
+def _parse_datetime(value):
     try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # CORRECTION : La requête SQL a été entièrement revue pour un filtrage correct.
-        sql = """
-            SELECT
-                e.id,
-                e.nom_evenement,
-                e.debut_datetime,
-                e.fin_datetime,
-                e.type_evenement,
-                GROUP_CONCAT(y.prenom, ', ') as young_names
-            FROM events e
-            LEFT JOIN event_young_link eyl ON e.id = eyl.event_id
-            LEFT JOIN youngs y ON eyl.young_id = y.id
-            WHERE
-                DATE(e.debut_datetime) BETWEEN ? AND ?
-            GROUP BY e.id
-            HAVING
-                -- Condition pour afficher l'événement si:
-                -- 1. Aucun filtre de service n'est appliqué
-                ? IS NULL
-                -- 2. OU si l'événement n'est lié à aucun jeune (événement général)
-                OR COUNT(y.id) = 0
-                -- 3. OU si au moins un des jeunes liés appartient au service filtré
-                OR MAX(CASE WHEN y.service_id = ? THEN 1 ELSE 0 END) = 1
-            ORDER BY e.debut_datetime
-        """
-        params = (start_date, end_date, service_id, service_id)
-        
-        cursor.execute(sql, params)
-        events = [dict(row) for row in cursor.fetchall()]
-        return events
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des événements par période : {e}")
-        return []
-    finally:
-        conn.close()
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+def get_events_by_day(start_date, end_date, service_id=None):
+    """
+    Récupère les événements d'une période (mêmes règles de filtrage que get_events_for_period)
+    regroupés par jour en un seul passage.
+    Retourne {'AAAA-MM-JJ': [événements triés par heure de début]} pour chaque jour de la période
+    (liste vide si aucun événement). Chaque événement porte en plus 'debut_dt' et 'fin_dt', ses dates déjà converties.
+    """
+    if isinstance(start_date, str): start_date = date.fromisoformat(start_date)
+    if isinstance(end_date, str): end_date = date.fromisoformat(end_date)
+    by_day = {(start_date + timedelta(days=i)).isoformat(): [] for i in range((end_date - start_date).days + 1)}
+
+    for event in get_events_for_period(start_date.isoformat(), end_date.isoformat(), service_id=service_id):
+        event['debut_dt'] = _parse_datetime(event['debut_datetime'])
+        event['fin_dt'] = _parse_datetime(event['fin_datetime'])
+        if event['debut_dt'] is None: continue
+        # Les événements arrivent triés par debut_datetime : chaque jour reste trié
+        by_day.setdefault(event['debut_dt'].date().isoformat(), []).append(event)
+    return by_day
 
 def get_events_for_young(young_id):
     """Récupère tous les événements associés à un jeune spécifique, classés par date."""
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, nom_evenement, debut_datetime, fin_datetime, type_evenement FROM events e JOIN event_young_link eyl ON e.id = eyl.event_id WHERE eyl.young_id = ? ORDER BY e.debut_datetime DESC", (young_id,))
-        return [dict(row) for row in cursor.fetchall()]
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des événements pour le jeune : {e}")
-        return []
-    finally: conn.close()
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, nom_evenement, debut_datetime, fin_datetime, type_evenement FROM events e JOIN event_young_link eyl ON e.id = eyl.event_id WHERE eyl.young_id = ? ORDER BY e.debut_datetime DESC", (young_id,))
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des événements pour le jeune : {e}")
+            return []
 
 def get_event_details(event_id):
-    """Récupère les détails d'un événement, y compris les participants."""
-    conn = create_connection()
-    if conn is None: return None, []
+    """Récupère les détails d'un événement, y compris les participants et sa règle de récurrence ('recurrence', None si aucune)."""
+    with get_connection() as conn:
+        if conn is None: return None, []
     
-    details, linked_youngs = None, []
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,))
-        details_row = cursor.fetchone()
-        if details_row:
-            details = dict(details_row)
-
-        cursor.execute("SELECT young_id FROM event_young_link WHERE event_id = ?", (event_id,))
-        linked_youngs_rows = cursor.fetchall()
-        linked_youngs = [row['young_id'] for row in linked_youngs_rows]
+        details, linked_youngs = None, []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,))
+            details_row = cursor.fetchone()
+            if details_row:
+                details = dict(details_row)
+                details['recurrence'] = _get_recurrence_rules(cursor, [event_id]).get(event_id)
+
+            cursor.execute("SELECT young_id FROM event_young_link WHERE event_id = ?", (event_id,))
+            linked_youngs_rows = cursor.fetchall()
+            linked_youngs = [row['young_id'] for row in linked_youngs_rows]
         
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des détails de l'événement : {e}")
-    finally:
-        conn.close()
-    return details, linked_youngs
-
-def add_event(data, young_ids):
-    """Ajoute un nouvel événement et le lie aux jeunes sélectionnés."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        sql = '''INSERT INTO events(nom_evenement, debut_datetime, fin_datetime, type_evenement, user_id)
-                 VALUES(:nom_evenement, :debut_datetime, :fin_datetime, :type_evenement, :user_id)'''
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des détails de l'événement : {e}")
+        return details, linked_youngs
+
+def add_event(data, young_ids, recurrence=None):
+    """
+    Ajoute un nouvel événement et le lie aux jeunes sélectionnés.
+    recurrence : règle optionnelle {'frequence': 'daily' | 'weekly' | 'monthly', 'intervalle', 'jours_semaine',
+    'date_fin', 'nombre', 'exceptions'} ; l'événement en est alors la première occurrence.
+    """
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            sql = '''INSERT INTO events(nom_evenement, debut_datetime, fin_datetime, type_evenement, user_id)
+                     VALUES(:nom_evenement, :debut_datetime, :fin_datetime, :type_evenement, :user_id)'''
         
-        cursor.execute(sql, data)
-        event_id = cursor.lastrowid
-
-        if event_id and young_ids:
-            for young_id in young_ids:
-                cursor.execute("INSERT INTO event_young_link (event_id, young_id) VALUES (?, ?)", (event_id, young_id))
-
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de l'ajout de l'événement : {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
-
-def update_event(event_id, data, young_ids):
-    """Met à jour un événement et la liste des jeunes associés."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        sql = '''UPDATE events SET nom_evenement = :nom_evenement, debut_datetime = :debut_datetime,
-                                    fin_datetime = :fin_datetime, type_evenement = :type_evenement, user_id = :user_id
-                 WHERE id = :id'''
-        data['id'] = event_id
-        cursor.execute(sql, data)
-
-        cursor.execute("DELETE FROM event_young_link WHERE event_id = ?", (event_id,))
-        if young_ids:
-            for young_id in young_ids:
-                cursor.execute("INSERT INTO event_young_link (event_id, young_id) VALUES (?, ?)", (event_id, young_id))
-
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la mise à jour de l'événement : {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+            cursor.execute(sql, data)
+            event_id = cursor.lastrowid
+
+            set_linked_youngs(cursor, 'event_young_link', event_id, young_ids)
+            if recurrence is not None:
+                _save_recurrence(cursor, event_id, data['debut_datetime'], recurrence)
+
+            conn.commit()
+            invalidate('events')
+            return True
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Erreur lors de l'ajout de l'événement : {e}")
+            conn.rollback()
+            return False
+
+def update_event(event_id, data, young_ids, recurrence=None):
+    """Met à jour un événement, la liste des jeunes associés et sa règle de récurrence (None : événement simple)."""
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            sql = '''UPDATE events SET nom_evenement = :nom_evenement, debut_datetime = :debut_datetime,
+                                        fin_datetime = :fin_datetime, type_evenement = :type_evenement, user_id = :user_id
+                     WHERE id = :id'''
+            data['id'] = event_id
+            cursor.execute(sql, data)
+
+            set_linked_youngs(cursor, 'event_young_link', event_id, young_ids)
+            _save_recurrence(cursor, event_id, data['debut_datetime'], recurrence)
+
+            conn.commit()
+            invalidate('events')
+            return True
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Erreur lors de la mise à jour de l'événement : {e}")
+            conn.rollback()
+            return False
 
 def delete_event(event_id):
     """Supprime un événement de la base de données."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la suppression de l'événement : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            # Les clés étrangères ne sont pas appliquées : sans ces suppressions, un événement
+            # recréé avec le même id hériterait de la règle, des exceptions et des jeunes liés.
+            cursor.execute("DELETE FROM event_exceptions WHERE event_id = ?", (event_id,))
+            cursor.execute("DELETE FROM event_recurrences WHERE event_id = ?", (event_id,))
+            cursor.execute("DELETE FROM event_young_link WHERE event_id = ?", (event_id,))
+            cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
+            conn.commit()
+            invalidate('events')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression de l'événement : {e}")
+            conn.rollback()
+            return False
+
+def add_event_exception(event_id, date_occurrence):
+    """Supprime une seule occurrence (jour AAAA-MM-JJ) d'un événement récurrent."""
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR IGNORE INTO event_exceptions (event_id, date_occurrence) VALUES (?, ?)", (event_id, date_occurrence))
+            conn.commit()
+            invalidate('events')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression de l'occurrence : {e}")
+            conn.rollback()
+            return False
@@ -0,0 +1,112 @@
+# Fichier : models/events/recurrence.py
+# Description : Règles de récurrence des événements et calcul de leurs occurrences
+#               (uniquement sur la période demandée, sans rien stocker par occurrence).
+
+from datetime import date, timedelta
+
+FREQUENCIES = ('daily', 'weekly', 'monthly')
+
+def _add_months(year, month, months):
+    month_index = year * 12 + month - 1 + months
+    return month_index // 12, month_index % 12 + 1
+
+def _first_period_index(start, rule, window_start):
+    """Index de la première période (jour, semaine ou mois de la règle) pouvant toucher window_start."""
+    interval = rule['intervalle']
+    if rule['frequence'] == 'daily':
+        elapsed = (window_start - start.date()).days
+    elif rule['frequence'] == 'weekly':
+        start_monday = start.date() - timedelta(days=start.weekday())
+        elapsed = (window_start - start_monday).days // 7
+    else:
+        elapsed = (window_start.year - start.year) * 12 + window_start.month - start.month
+    return max(0, elapsed // interval)
+
+def _candidates(start, rule, from_index):
+    """Génère, dans l'ordre, les dates/heures prévues par la règle à partir de la période from_index."""
+    interval = rule['intervalle']
+    period = from_index
+    if rule['frequence'] == 'weekly':
+        weekdays = sorted(set(rule.get('jours_semaine') or [start.weekday()]))
+        start_monday = start - timedelta(days=start.weekday())
+    while True:
+        if rule['frequence'] == 'daily':
+            yield start + timedelta(days=period * interval)
+        elif rule['frequence'] == 'weekly':
+            monday = start_monday + timedelta(weeks=period * interval)
+            for weekday in weekdays:
+                occurrence = monday + timedelta(days=weekday)
+                if occurrence >= start:
+                    yield occurrence
+        else:
+            # Mensuelle : même jour du mois ; les mois qui n'ont pas ce jour (31, 29 février...) sont sautés
+            year, month = _add_months(start.year, start.month, period * interval)
+            try:
+                yield start.replace(year=year, month=month)
+            except ValueError:
+                pass
+        period += 1
+
+def iter_occurrences(start, rule, window_start=None):
+    """
+    Parcourt les occurrences de la règle dans l'ordre chronologique, en s'arrêtant à date_fin
+    ou après 'nombre' occurrences. Sans limite de nombre, le parcours commence directement
+    près de window_start. Les exceptions ne sont pas retirées (elles comptent dans 'nombre').
+    """
+    until = date.fromisoformat(rule['date_fin']) if rule.get('date_fin') else None
+    count = rule.get('nombre')
+    from_index = 0 if count or window_start is None else _first_period_index(start, rule, window_start)
+    for n, occurrence in enumerate(_candidates(start, rule, from_index)):
+        if until and occurrence.date() > until:
+            return
+        if count and n >= count:
+            return
+        yield occurrence
+
+def expand_occurrences(start, rule, window_start, window_end):
+    """
+    Retourne les dates/heures de début des occurrences dont le jour est compris entre
+    window_start et window_end (objets date, bornes incluses), exceptions retirées.
+    """
+    exceptions = set(rule.get('exceptions') or [])
+    occurrences = []
+    for occurrence in iter_occurrences(start, rule, window_start):
+        day = occurrence.date()
+        if day > window_end:
+            break
+        if day >= window_start and day.isoformat() not in exceptions:
+            occurrences.append(occurrence)
+    return occurrences
+
+def last_occurrence_date(start, rule):
+    """Jour de la dernière occurrence de la règle, ou None si elle n'a pas de fin."""
+    if rule.get('nombre'):
+        last = None
+        for last in iter_occurrences(start, rule):
+            pass
+        return last.date() if last else start.date()
+    if rule.get('date_fin'):
+        return date.fromisoformat(rule['date_fin'])
+    return None
+
+def normalize_rule(rule):
+    """Vérifie une règle saisie et la complète (intervalle par défaut, jours triés). Lève ValueError si invalide."""
+    if rule.get('frequence') not in FREQUENCIES:
+        raise ValueError(f"Fréquence de récurrence inconnue : {rule.get('frequence')}")
+    try:
+        interval = int(rule.get('intervalle') or 1)
+        count = int(rule['nombre']) if rule.get('nombre') else None
+    except (TypeError, ValueError):
+        raise ValueError("L'intervalle et le nombre d'occurrences doivent être des nombres entiers.")
+    if interval < 1 or (count is not None and count < 1):
+        raise ValueError("L'intervalle et le nombre d'occurrences doivent être positifs.")
+    weekdays = sorted({int(day) for day in rule.get('jours_semaine') or []})
+    if any(day < 0 or day > 6 for day in weekdays):
+        raise ValueError("Jour de la semaine invalide.")
+    date_fin = rule.get('date_fin') or None
+    if date_fin:
+        date.fromisoformat(date_fin)
+    return {
+        'frequence': rule['frequence'], 'intervalle': interval, 'jours_semaine': weekdays,
+        'date_fin': date_fin, 'nombre': count, 'exceptions': sorted(set(rule.get('exceptions') or [])),
+    }
@@ -2,133 +2,131 @@
 # Description : Fonctions pour la gestion des utilisateurs (professionnels).
 
 import sqlite3
-from models.database.database import create_connection
+from models.database.database import get_connection
+from models.database.cache import cached_query, invalidate, uncached
 from models.auth.auth import hash_password
+from models.daily_life.daily_life import refresh_daily_rollup_for_owner
 
+@cached_query('users')
 def get_all_users(service_id=None):
     """
     Récupère tous les utilisateurs de la base de données, triés par ordre alphabétique.
     Si service_id est fourni, filtre les utilisateurs pour ce service.
     """
-    conn = create_connection()
-    if conn is None:
-        return []
-    try:
-        cursor = conn.cursor()
-        sql = """
-            SELECT u.id, u.nom, u.prenom, u.identifiant, u.niveau_authentification, COALESCE(s.nom_service, 'N/A') as service_name
-            FROM users u
-            LEFT JOIN services s ON u.service_id = s.id
-        """
-        params = []
-        if service_id is not None:
-            sql += " WHERE u.service_id = ?"
-            params.append(service_id)
+    with get_connection() as conn:
+        if conn is None:
+            return uncached([])
+        try:
+            cursor = conn.cursor()
+            sql = """
+                SELECT u.id, u.nom, u.prenom, u.identifiant, u.niveau_authentification, COALESCE(s.nom_service, 'N/A') as service_name
+                FROM users u
+                LEFT JOIN services s ON u.service_id = s.id
+            """
+            params = []
+            if service_id is not None:
+                sql += " WHERE u.service_id = ?"
+                params.append(service_id)
         
-        # CORRECTION: Ajout du tri par nom puis prénom.
-        sql += " ORDER BY u.nom, u.prenom"
+            # CORRECTION: Ajout du tri par nom puis prénom.
+            sql += " ORDER BY u.nom, u.prenom"
 
-        cursor.execute(sql, params)
-        users = cursor.fetchall()
-        return users
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des utilisateurs : {e}")
-        return []
-    finally:
-        conn.close()
+            cursor.execute(sql, params)
+            users = cursor.fetchall()
+            return users
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des utilisateurs : {e}")
+            return uncached([])
 
 def get_users_for_service(service_id):
     """Récupère les utilisateurs associés à un service spécifique."""
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, prenom, nom FROM users WHERE service_id = ? ORDER BY nom, prenom", (service_id,))
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des utilisateurs par service : {e}")
-        return []
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, prenom, nom FROM users WHERE service_id = ? ORDER BY nom, prenom", (service_id,))
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des utilisateurs par service : {e}")
+            return []
 
 # ... (les autres fonctions du fichier ne changent pas) ...
 
 def get_user_details(user_id):
-    conn = create_connection()
-    if conn is None: return None
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-        user_details = cursor.fetchone()
-        return user_details
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des détails de l'utilisateur : {e}")
-        return None
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return None
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+            user_details = cursor.fetchone()
+            return user_details
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des détails de l'utilisateur : {e}")
+            return None
 
 def add_user(data):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        data['mot_de_passe'] = hash_password(data['mot_de_passe'])
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            data['mot_de_passe'] = hash_password(data['mot_de_passe'])
         
-        sql = '''INSERT INTO users(nom, prenom, identifiant, mot_de_passe, niveau_authentification, adresse, telephone, email, service_id)
-                 VALUES(:nom, :prenom, :identifiant, :mot_de_passe, :niveau_authentification, :adresse, :telephone, :email, :service_id)'''
+            sql = '''INSERT INTO users(nom, prenom, identifiant, mot_de_passe, niveau_authentification, adresse, telephone, email, service_id)
+                     VALUES(:nom, :prenom, :identifiant, :mot_de_passe, :niveau_authentification, :adresse, :telephone, :email, :service_id)'''
         
-        cursor = conn.cursor()
-        cursor.execute(sql, data)
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError as e:
-        error_msg = str(e).lower()
-        if "unique constraint failed: users.identifiant" in error_msg:
-            return "identifiant_exists"
-        if "unique constraint failed: users.email" in error_msg:
-            return "email_exists"
-        print(f"Erreur d'intégrité inattendue : {e}")
-        return False
-    except sqlite3.Error as e:
-        print(f"Erreur lors de l'ajout de l'utilisateur : {e}")
-        return False
-    finally:
-        conn.close()
+            cursor = conn.cursor()
+            cursor.execute(sql, data)
+            conn.commit()
+            invalidate('users', 'referents', 'youngs')
+            return True
+        except sqlite3.IntegrityError as e:
+            error_msg = str(e).lower()
+            if "unique constraint failed: users.identifiant" in error_msg:
+                return "identifiant_exists"
+            if "unique constraint failed: users.email" in error_msg:
+                return "email_exists"
+            print(f"Erreur d'intégrité inattendue : {e}")
+            return False
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'ajout de l'utilisateur : {e}")
+            return False
 
 def update_user(user_id, data):
-    conn = create_connection()
-    if conn is None: return False
+    with get_connection() as conn:
+        if conn is None: return False
     
-    if data.get('mot_de_passe'):
-        data['mot_de_passe'] = hash_password(data['mot_de_passe'])
-        sql_set_parts = [f"{key} = :{key}" for key in data.keys()]
-    else:
-        data.pop('mot_de_passe', None) 
-        sql_set_parts = [f"{key} = :{key}" for key in data.keys()]
+        if data.get('mot_de_passe'):
+            data['mot_de_passe'] = hash_password(data['mot_de_passe'])
+            sql_set_parts = [f"{key} = :{key}" for key in data.keys()]
+        else:
+            data.pop('mot_de_passe', None) 
+            sql_set_parts = [f"{key} = :{key}" for key in data.keys()]
 
-    sql = f"UPDATE users SET {', '.join(sql_set_parts)} WHERE id = :id"
-    data['id'] = user_id
+        sql = f"UPDATE users SET {', '.join(sql_set_parts)} WHERE id = :id"
+        data['id'] = user_id
 
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, data)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la mise à jour de l'utilisateur : {e}")
-        return False
-    finally:
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, data)
+            if 'service_id' in data:
+                # Les effectifs de la synthèse journalière sont ventilés par service
+                refresh_daily_rollup_for_owner(cursor, 'pros', user_id)
+            conn.commit()
+            invalidate('users', 'referents', 'youngs')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la mise à jour de l'utilisateur : {e}")
+            return False
 
 def delete_user(user_id):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la suppression de l'utilisateur : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            refresh_daily_rollup_for_owner(cursor, 'pros', user_id)
+            conn.commit()
+            invalidate('users', 'referents', 'youngs')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression de l'utilisateur : {e}")
+            return False
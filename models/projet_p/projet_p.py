@@ -2,129 +2,211 @@
 # Description : Fonctions pour la gestion des projets personnalisés.
 
 import sqlite3
-from models.database.database import create_connection
+from models.database.database import get_connection
+from models.database.cache import invalidate
 from datetime import datetime, date
 
-def get_all_projets():
-    """Récupère tous les projets personnalisés avec les noms des jeunes."""
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 
-                pp.id, pp.date_projet, pp.young_id,
-                y.prenom, y.nom
-            FROM projet_p pp
-            JOIN youngs y ON pp.young_id = y.id
-            ORDER BY pp.date_projet DESC
-        """)
-        return [dict(row) for row in cursor.fetchall()]
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des projets personnalisés : {e}")
-        return []
-    finally:
-        conn.close()
+# Un projet personnalisé est à renouveler un an après sa date (voir calculate_next_project_date).
+RENEWAL_PERIOD = '+1 year'
+
+def get_all_projets(young_id=None, service_id=None, date_from=None, date_to=None, due_before=None):
+    """
+    Récupère les projets personnalisés avec les noms des jeunes, du plus récent au plus ancien.
+    Filtres optionnels, appliqués en SQL :
+      - young_id, service_id : projets d'un jeune ou des jeunes d'un service ;
+      - date_from, date_to : date du projet comprise entre ces bornes (AAAA-MM-JJ, incluses) ;
+      - due_before : projets dont le renouvellement (un an après) tombe au plus tard à cette date.
+    """
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            sql = """
+                SELECT 
+                    pp.id, pp.date_projet, pp.young_id,
+                    y.prenom, y.nom
+                FROM projet_p pp
+                JOIN youngs y ON pp.young_id = y.id
+            """
+            conditions, params = [], []
+            if young_id is not None:
+                conditions.append("pp.young_id = ?")
+                params.append(young_id)
+            if service_id is not None:
+                conditions.append("y.service_id = ?")
+                params.append(service_id)
+            if date_from:
+                conditions.append("pp.date_projet >= ?")
+                params.append(str(date_from))
+            if date_to:
+                conditions.append("pp.date_projet <= ?")
+                params.append(str(date_to))
+            if due_before:
+                conditions.append(f"date(pp.date_projet, '{RENEWAL_PERIOD}') <= ?")
+                params.append(str(due_before))
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " ORDER BY pp.date_projet DESC"
+
+            cursor.execute(sql, params)
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des projets personnalisés : {e}")
+            return []
 
 def get_projet_details(projet_id):
     """Récupère les détails d'un projet, y compris les objectifs, catégories, évaluations et moyens associés."""
-    conn = create_connection()
-    if conn is None: return None
-    
-    results = {}
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM projet_p WHERE id = ?", (projet_id,))
-        projet_details = cursor.fetchone()
-        if not projet_details: return None
-        results['details'] = dict(projet_details)
-
-        # Récupère la catégorie avec l'objectif et son évaluation
-        cursor.execute("SELECT id, objectif, categorie, evaluation FROM projet_p_objectifs WHERE projet_p_id = ?", (projet_id,))
-        objectifs_data = [dict(row) for row in cursor.fetchall()]
-
-        # Pour chaque objectif, récupérer les moyens liés
-        for obj in objectifs_data:
-            cursor.execute("SELECT moyen FROM projet_p_moyens WHERE objectif_id = ?", (obj['id'],))
-            obj['moyens'] = [row['moyen'] for row in cursor.fetchall()]
-        
-        results['objectifs'] = objectifs_data
-        
-        return results
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des détails du projet : {e}")
-        return None
-    finally:
-        conn.close()
+    return get_projets_details([projet_id]).get(projet_id)
+
+def get_projets_details(projet_ids):
+    """
+    Récupère les détails de plusieurs projets en un nombre constant de requêtes
+    (une pour les projets, une pour leurs objectifs et moyens).
+    Retourne {projet_id: {'details': {...}, 'objectifs': [{..., 'moyens': [...]}]}} ;
+    les projets introuvables sont absents du dictionnaire.
+    """
+    projet_ids = list(dict.fromkeys(projet_ids))
+    if not projet_ids: return {}
+    with get_connection() as conn:
+        if conn is None: return {}
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            placeholders = ", ".join("?" for _ in projet_ids)
+
+            cursor.execute(f"SELECT * FROM projet_p WHERE id IN ({placeholders})", projet_ids)
+            results = {row['id']: {'details': dict(row), 'objectifs': []} for row in cursor.fetchall()}
+
+            # Objectifs et moyens en une jointure, regroupés en un seul passage (ordre d'insertion conservé)
+            cursor.execute(f"""
+                SELECT o.projet_p_id, o.id, o.objectif, o.categorie, o.evaluation, m.moyen
+                FROM projet_p_objectifs o
+                LEFT JOIN projet_p_moyens m ON m.objectif_id = o.id
+                WHERE o.projet_p_id IN ({placeholders})
+                ORDER BY o.projet_p_id, o.id, m.id
+            """, projet_ids)
+            current = None
+            for row in cursor.fetchall():
+                if current is None or current['id'] != row['id']:
+                    current = {'id': row['id'], 'objectif': row['objectif'], 'categorie': row['categorie'],
+                               'evaluation': row['evaluation'], 'moyens': []}
+                    results[row['projet_p_id']]['objectifs'].append(current)
+                if row['moyen'] is not None:
+                    current['moyens'].append(row['moyen'])
+
+            return results
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des détails du projet : {e}")
+            return {}
 
 def add_or_update_projet(data, projet_id=None):
-    """Ajoute ou met à jour un projet personnalisé et toutes ses données imbriquées."""
-    conn = create_connection()
-    if conn is None: return False
+    """
+    Ajoute ou met à jour un projet personnalisé et toutes ses données imbriquées.
+    Chaque objectif de data['objectifs'] peut porter l''id' d'un objectif existant : il est alors
+    mis à jour sur place, les objectifs sans id sont insérés et ceux qui ont disparu supprimés.
+    """
+    with get_connection() as conn:
+        if conn is None: return False
     
-    try:
-        cursor = conn.cursor()
+        try:
+            cursor = conn.cursor()
         
-        objectifs_data = data.pop('objectifs', [])
+            objectifs_data = [obj for obj in data.pop('objectifs', []) if obj.get('objectif')]
         
-        if projet_id is None: # Mode Ajout
-            sql_projet = '''INSERT INTO projet_p(date_projet, young_id, rappel_situation, attentes_jeune, attentes_famille)
-                            VALUES(:date_projet, :young_id, :rappel_situation, :attentes_jeune, :attentes_famille)'''
-            cursor.execute(sql_projet, data)
-            projet_id = cursor.lastrowid
-        else: # Mode Modification
-            cursor.execute("DELETE FROM projet_p_objectifs WHERE projet_p_id = ?", (projet_id,))
-            
-            sql_projet = '''UPDATE projet_p SET date_projet = :date_projet, young_id = :young_id, rappel_situation = :rappel_situation,
-                                            attentes_jeune = :attentes_jeune, attentes_famille = :attentes_famille
-                            WHERE id = :id'''
-            data['id'] = projet_id
-            cursor.execute(sql_projet, data)
-
-        # Insérer les nouveaux objectifs et moyens
-        for obj_dict in objectifs_data:
-            objectif_text = obj_dict.get('objectif')
-            if objectif_text:
-                sql_objectif = "INSERT INTO projet_p_objectifs (projet_p_id, objectif, categorie, evaluation) VALUES (?, ?, ?, ?)"
-                cursor.execute(sql_objectif, (projet_id, objectif_text, obj_dict.get('categorie'), obj_dict.get('evaluation')))
-                objectif_id = cursor.lastrowid
-                
-                for moyen_text in obj_dict.get('moyens', []):
-                    if moyen_text:
-                        sql_moyen = "INSERT INTO projet_p_moyens (objectif_id, moyen) VALUES (?, ?)"
-                        cursor.execute(sql_moyen, (objectif_id, moyen_text))
+            if projet_id is None: # Mode Ajout
+                sql_projet = '''INSERT INTO projet_p(date_projet, young_id, rappel_situation, attentes_jeune, attentes_famille)
+                                VALUES(:date_projet, :young_id, :rappel_situation, :attentes_jeune, :attentes_famille)'''
+                cursor.execute(sql_projet, data)
+                projet_id = cursor.lastrowid
+            else: # Mode Modification
+                sql_projet = '''UPDATE projet_p SET date_projet = :date_projet, young_id = :young_id, rappel_situation = :rappel_situation,
+                                                attentes_jeune = :attentes_jeune, attentes_famille = :attentes_famille
+                                WHERE id = :id'''
+                data['id'] = projet_id
+                cursor.execute(sql_projet, data)
+
+            _save_objectifs(cursor, projet_id, objectifs_data)
         
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        print("Erreur: Un projet personnalisé existe déjà pour ce jeune.")
-        conn.rollback()
-        return "exists"
-    except sqlite3.Error as e:
-        print(f"Erreur lors de l'ajout/mise à jour du projet : {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+            conn.commit()
+            invalidate('projets')
+            return True
+        except sqlite3.IntegrityError:
+            print("Erreur: Un projet personnalisé existe déjà pour ce jeune.")
+            conn.rollback()
+            return "exists"
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'ajout/mise à jour du projet : {e}")
+            conn.rollback()
+            return False
+
+def _save_objectifs(cursor, projet_id, objectifs_data):
+    """
+    Met les objectifs et moyens du projet en conformité avec objectifs_data en ne touchant
+    qu'aux lignes modifiées, ajoutées ou retirées (les identifiants existants sont conservés).
+    Les moyens d'un objectif sont comparés par position.
+    """
+    cursor.execute("SELECT id, objectif, categorie, evaluation FROM projet_p_objectifs WHERE projet_p_id = ?", (projet_id,))
+    existing = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+    cursor.execute("""
+        SELECT m.objectif_id, m.id, m.moyen FROM projet_p_moyens m
+        JOIN projet_p_objectifs o ON m.objectif_id = o.id
+        WHERE o.projet_p_id = ? ORDER BY m.objectif_id, m.id
+    """, (projet_id,))
+    existing_moyens = {}
+    for objectif_id, moyen_id, moyen in cursor.fetchall():
+        existing_moyens.setdefault(objectif_id, []).append((moyen_id, moyen))
+
+    objectif_updates, moyen_updates, moyen_inserts, moyen_deletes = [], [], [], []
+    kept_ids = set()
+    for obj in objectifs_data:
+        values = (obj.get('objectif'), obj.get('categorie'), obj.get('evaluation'))
+        objectif_id = obj.get('id')
+        if objectif_id in existing and objectif_id not in kept_ids:
+            kept_ids.add(objectif_id)
+            if existing[objectif_id] != values:
+                objectif_updates.append(values + (objectif_id,))
+        else:
+            # Nouvel objectif : son id est nécessaire pour rattacher ses moyens
+            cursor.execute("INSERT INTO projet_p_objectifs (projet_p_id, objectif, categorie, evaluation) VALUES (?, ?, ?, ?)",
+                           (projet_id,) + values)
+            objectif_id = cursor.lastrowid
+
+        old_moyens = existing_moyens.get(objectif_id, [])
+        new_moyens = [moyen for moyen in obj.get('moyens', []) if moyen]
+        for (moyen_id, old_text), new_text in zip(old_moyens, new_moyens):
+            if old_text != new_text:
+                moyen_updates.append((new_text, moyen_id))
+        moyen_inserts.extend((objectif_id, text) for text in new_moyens[len(old_moyens):])
+        moyen_deletes.extend((moyen_id,) for moyen_id, _ in old_moyens[len(new_moyens):])
+
+    objectif_deletes = [(objectif_id,) for objectif_id in existing if objectif_id not in kept_ids]
+
+    # Les clés étrangères ne sont pas appliquées : les moyens des objectifs retirés sont supprimés explicitement
+    cursor.executemany("DELETE FROM projet_p_moyens WHERE objectif_id = ?", objectif_deletes)
+    cursor.executemany("DELETE FROM projet_p_objectifs WHERE id = ?", objectif_deletes)
+    cursor.executemany("UPDATE projet_p_objectifs SET objectif = ?, categorie = ?, evaluation = ? WHERE id = ?", objectif_updates)
+    cursor.executemany("DELETE FROM projet_p_moyens WHERE id = ?", moyen_deletes)
+    cursor.executemany("UPDATE projet_p_moyens SET moyen = ? WHERE id = ?", moyen_updates)
+    cursor.executemany("INSERT INTO projet_p_moyens (objectif_id, moyen) VALUES (?, ?)", moyen_inserts)
 
 def delete_projet(projet_id):
     """Supprime un projet personnalisé et toutes ses données associées."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        # La suppression en cascade s'occupe des objectifs et moyens
-        cursor.execute("DELETE FROM projet_p WHERE id = ?", (projet_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la suppression du projet : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            # Les clés étrangères ne sont pas appliquées : moyens puis objectifs sont supprimés explicitement
+            cursor.execute("DELETE FROM projet_p_moyens WHERE objectif_id IN (SELECT id FROM projet_p_objectifs WHERE projet_p_id = ?)", (projet_id,))
+            cursor.execute("DELETE FROM projet_p_objectifs WHERE projet_p_id = ?", (projet_id,))
+            cursor.execute("DELETE FROM projet_p WHERE id = ?", (projet_id,))
+            conn.commit()
+            invalidate('projets')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression du projet : {e}")
+            conn.rollback()
+            return False
 
 
 def calculate_next_project_date(start_date_str):
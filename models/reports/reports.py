@@ -2,140 +2,208 @@
 # Description : Fonctions pour la gestion des rapports.
 
 import sqlite3
-from models.database.database import create_connection
+from models.database.database import get_connection
+from models.database.cache import invalidate
 from datetime import date
 
+REPORTS_PAGE_SIZE = 100
+
+_REPORTS_SELECT = """
+    SELECT
+        r.id, r.type_rapport, r.date_redaction, r.statut,
+        y.prenom as young_prenom, y.nom as young_nom,
+        u.prenom as author_prenom, u.nom as author_nom
+    FROM reports r
+    JOIN youngs y ON r.young_id = y.id
+    JOIN users u ON r.redacteur_id = u.id
+"""
+
 def get_all_reports(young_id=None):
     """
     Récupère tous les rapports, avec des informations sur le jeune et l'auteur.
     Si young_id est fourni, filtre les rapports pour ce jeune uniquement.
     """
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
         
-        sql = """
-            SELECT
-                r.id, r.type_rapport, r.date_redaction, r.statut,
-                y.prenom as young_prenom, y.nom as young_nom,
-                u.prenom as author_prenom, u.nom as author_nom
-            FROM reports r
-            JOIN youngs y ON r.young_id = y.id
-            JOIN users u ON r.redacteur_id = u.id
-        """
-        params = []
-        if young_id:
-            sql += " WHERE r.young_id = ?"
-            params.append(young_id)
+            sql = _REPORTS_SELECT
+            params = []
+            if young_id:
+                sql += " WHERE r.young_id = ?"
+                params.append(young_id)
             
-        sql += " ORDER BY r.date_redaction DESC, y.nom"
+            sql += " ORDER BY r.date_redaction DESC, y.nom"
         
-        cursor.execute(sql, params)
-        reports = [dict(row) for row in cursor.fetchall()]
-        return reports
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des rapports : {e}")
-        return []
-    finally:
-        conn.close()
+            cursor.execute(sql, params)
+            reports = [dict(row) for row in cursor.fetchall()]
+            return reports
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des rapports : {e}")
+            return []
+
+def get_reports_page(young_id=None, after=None, limit=REPORTS_PAGE_SIZE):
+    """
+    Récupère une page de rapports, du plus récent au plus ancien puis les brouillons
+    (date_redaction NULL) en dernier, départagés par id décroissant.
+    after est le curseur (date_redaction, id) renvoyé par l'appel précédent.
+    Retourne (rapports, curseur_suivant) ; curseur_suivant vaut None s'il n'y a plus rien à charger.
+    """
+    with get_connection() as conn:
+        if conn is None: return [], None
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            sql = _REPORTS_SELECT
+            conditions, params = [], []
+            if young_id:
+                conditions.append("r.young_id = ?")
+                params.append(young_id)
+            if after:
+                after_date, after_id = after
+                if after_date is None:
+                    conditions.append("r.date_redaction IS NULL AND r.id < ?")
+                    params.append(after_id)
+                else:
+                    conditions.append("(r.date_redaction < ? OR (r.date_redaction = ? AND r.id < ?) OR r.date_redaction IS NULL)")
+                    params.extend([after_date, after_date, after_id])
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " ORDER BY r.date_redaction DESC, r.id DESC LIMIT ?"
+            params.append(limit + 1)
+
+            cursor.execute(sql, params)
+            reports = [dict(row) for row in cursor.fetchall()]
+            has_more = len(reports) > limit
+            reports = reports[:limit]
+
+            next_cursor = (reports[-1]['date_redaction'], reports[-1]['id']) if has_more else None
+            return reports, next_cursor
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des rapports : {e}")
+            return [], None
 
 def get_report_details(report_id):
     """Récupère tous les détails d'un rapport spécifique."""
-    conn = create_connection()
-    if conn is None: return None
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM reports WHERE id = ?", (report_id,))
-        details = cursor.fetchone()
-        return dict(details) if details else None
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des détails du rapport : {e}")
-        return None
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return None
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM reports WHERE id = ?", (report_id,))
+            details = cursor.fetchone()
+            return dict(details) if details else None
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des détails du rapport : {e}")
+            return None
+
+def get_report_for_export(report_id):
+    """
+    Récupère un rapport avec, en une seule requête, les informations du jeune et les noms
+    du rédacteur et du validateur (clés young_*, author_* et validator_*), pour l'export PDF.
+    """
+    with get_connection() as conn:
+        if conn is None: return None
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    r.*,
+                    y.prenom as young_prenom, y.nom as young_nom, y.date_naissance as young_date_naissance,
+                    y.date_entree as young_date_entree, y.type_placement as young_type_placement,
+                    a.prenom as author_prenom, a.nom as author_nom,
+                    v.prenom as validator_prenom, v.nom as validator_nom
+                FROM reports r
+                LEFT JOIN youngs y ON r.young_id = y.id
+                LEFT JOIN users a ON r.redacteur_id = a.id
+                LEFT JOIN users v ON r.validateur_id = v.id
+                WHERE r.id = ?
+            """, (report_id,))
+            details = cursor.fetchone()
+            return dict(details) if details else None
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération du rapport à exporter : {e}")
+            return None
 
 def add_report(data):
     """Ajoute un nouveau rapport dans la base de données."""
-    conn = create_connection()
-    if conn is None: return None
-    try:
-        # On ne met pas la date de rédaction ni le validateur à l'ajout
-        # La date sera ajoutée à la validation
-        sql = '''INSERT INTO reports(type_rapport, young_id, redacteur_id, rappel_situation, accueil, 
-                                     scolarite, soin_sante, famille, psychologique, preconisations, statut)
-                 VALUES(:type_rapport, :young_id, :redacteur_id, :rappel_situation, :accueil, 
-                        :scolarite, :soin_sante, :famille, :psychologique, :preconisations, 'en attente')'''
+    with get_connection() as conn:
+        if conn is None: return None
+        try:
+            # On ne met pas la date de rédaction ni le validateur à l'ajout
+            # La date sera ajoutée à la validation
+            sql = '''INSERT INTO reports(type_rapport, young_id, redacteur_id, rappel_situation, accueil, 
+                                         scolarite, soin_sante, famille, psychologique, preconisations, statut)
+                     VALUES(:type_rapport, :young_id, :redacteur_id, :rappel_situation, :accueil, 
+                            :scolarite, :soin_sante, :famille, :psychologique, :preconisations, 'en attente')'''
         
-        cursor = conn.cursor()
-        cursor.execute(sql, data)
-        report_id = cursor.lastrowid
-        conn.commit()
-        return report_id
-    except sqlite3.Error as e:
-        print(f"Erreur lors de l'ajout du rapport : {e}")
-        return None
-    finally:
-        conn.close()
+            cursor = conn.cursor()
+            cursor.execute(sql, data)
+            report_id = cursor.lastrowid
+            conn.commit()
+            invalidate('reports')
+            return report_id
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'ajout du rapport : {e}")
+            return None
 
 def update_report(report_id, data):
     """Met à jour le contenu d'un rapport."""
-    conn = create_connection()
-    if conn is None: return False
+    with get_connection() as conn:
+        if conn is None: return False
     
-    # On ne met à jour que les champs modifiables par l'éducateur
-    sql = '''UPDATE reports SET type_rapport = :type_rapport, rappel_situation = :rappel_situation, accueil = :accueil,
-                                scolarite = :scolarite, soin_sante = :soin_sante, famille = :famille, 
-                                psychologique = :psychologique, preconisations = :preconisations
-             WHERE id = :id'''
-    data['id'] = report_id
+        # On ne met à jour que les champs modifiables par l'éducateur
+        sql = '''UPDATE reports SET type_rapport = :type_rapport, rappel_situation = :rappel_situation, accueil = :accueil,
+                                    scolarite = :scolarite, soin_sante = :soin_sante, famille = :famille, 
+                                    psychologique = :psychologique, preconisations = :preconisations
+                 WHERE id = :id'''
+        data['id'] = report_id
     
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, data)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la mise à jour du rapport : {e}")
-        return False
-    finally:
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, data)
+            conn.commit()
+            invalidate('reports')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la mise à jour du rapport : {e}")
+            return False
 
 def validate_report(report_id, validator_id):
     """Valide un rapport, ajoutant la date de rédaction et l'ID du validateur."""
-    conn = create_connection()
-    if conn is None: return False
+    with get_connection() as conn:
+        if conn is None: return False
     
-    sql = '''UPDATE reports SET statut = 'validé', 
-                                validateur_id = ?,
-                                date_redaction = ?
-             WHERE id = ?'''
+        sql = '''UPDATE reports SET statut = 'validé', 
+                                    validateur_id = ?,
+                                    date_redaction = ?
+                 WHERE id = ?'''
     
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, (validator_id, date.today().isoformat(), report_id))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la validation du rapport : {e}")
-        return False
-    finally:
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, (validator_id, date.today().isoformat(), report_id))
+            conn.commit()
+            invalidate('reports')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la validation du rapport : {e}")
+            return False
 
 
 def delete_report(report_id):
     """Supprime un rapport de la base de données."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM reports WHERE id = ?", (report_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la suppression du rapport : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+            conn.commit()
+            invalidate('reports')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression du rapport : {e}")
+            return False
@@ -0,0 +1,184 @@
+# Fichier : models/search/search.py
+# Description : Recherche plein texte (FTS5) dans les transmissions, les rapports et les projets personnalisés.
+
+import re
+import sqlite3
+from models.database.database import get_connection
+
+SEARCH_LIMIT = 50
+
+# Colonnes rédactionnelles des rapports indexées pour la recherche.
+REPORT_TEXT_COLUMNS = ['rappel_situation', 'accueil', 'scolarite', 'soin_sante', 'famille', 'psychologique', 'preconisations']
+PROJET_TEXT_COLUMNS = ['rappel_situation', 'attentes_jeune', 'attentes_famille']
+
+def _concat(row, columns):
+    return " || ' ' || ".join(f"COALESCE({row}.{col}, '')" for col in columns)
+
+# Sources indexées. Le rowid de l'index vaut id * 8 + code : une ligne source se
+# retrouve ainsi directement par son rowid, sans parcourir l'index.
+# Les expressions utilisent {row} (new, old ou l'alias de la table pour la reconstruction).
+SEARCH_SOURCES = [
+    {"table": "transmissions", "code": 1, "kind": "transmission", "columns": ["categorie", "contenu"],
+     "title": "{row}.categorie", "body": "{row}.contenu", "projet_id": "NULL"},
+    {"table": "reports", "code": 2, "kind": "report", "columns": ["type_rapport"] + REPORT_TEXT_COLUMNS,
+     "title": "{row}.type_rapport", "body": _concat("{row}", REPORT_TEXT_COLUMNS), "projet_id": "NULL"},
+    {"table": "projet_p", "code": 3, "kind": "projet", "columns": PROJET_TEXT_COLUMNS,
+     "title": "'Projet personnalisé'", "body": _concat("{row}", PROJET_TEXT_COLUMNS), "projet_id": "{row}.id"},
+    {"table": "projet_p_objectifs", "code": 4, "kind": "objectif", "columns": ["objectif", "categorie", "evaluation", "projet_p_id"],
+     "title": "COALESCE({row}.categorie, 'Objectif')", "body": "{row}.objectif || ' ' || COALESCE({row}.evaluation, '')",
+     "projet_id": "{row}.projet_p_id"},
+    {"table": "projet_p_moyens", "code": 5, "kind": "moyen", "columns": ["moyen", "objectif_id"],
+     "title": "'Moyen'", "body": "{row}.moyen",
+     "projet_id": "(SELECT projet_p_id FROM projet_p_objectifs WHERE id = {row}.objectif_id)"},
+]
+
+def _index_values(source, row):
+    return ", ".join([
+        f"{row}.id * 8 + {source['code']}", f"'{source['kind']}'", f"{row}.id",
+        source['projet_id'].format(row=row), source['title'].format(row=row), source['body'].format(row=row)
+    ])
+
+def _insert_sql(source, row):
+    return f"INSERT INTO search_index (rowid, kind, ref_id, projet_id, title, body) VALUES ({_index_values(source, row)})"
+
+def _delete_sql(source, row):
+    return f"DELETE FROM search_index WHERE rowid = {row}.id * 8 + {source['code']}"
+
+def is_fts5_available(cursor):
+    """Vérifie que la version de SQLite embarquée fournit le module FTS5."""
+    try:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if cursor.fetchone()[0]:
+            return True
+        cursor.execute("SELECT 1 FROM pragma_module_list WHERE name = 'fts5'")
+        return cursor.fetchone() is not None
+    except sqlite3.Error:
+        return False
+
+def create_search_index(cursor):
+    """
+    Crée l'index plein texte, les déclencheurs qui le tiennent à jour et le remplit.
+    Sans FTS5, l'index n'est pas créé et la recherche renvoie une liste vide ;
+    ensure_search_index() le créera à un démarrage ultérieur si FTS5 devient disponible.
+    """
+    if not is_fts5_available(cursor):
+        print("Recherche plein texte indisponible : SQLite a été compilé sans FTS5.")
+        return False
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            kind UNINDEXED, ref_id UNINDEXED, projet_id UNINDEXED, title, body,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    for source in SEARCH_SOURCES:
+        table = source['table']
+        watched = ", ".join(source['columns'])
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_insert AFTER INSERT ON {table} BEGIN {_insert_sql(source, 'new')}; END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_update AFTER UPDATE OF {watched} ON {table} "
+                       f"BEGIN {_delete_sql(source, 'old')}; {_insert_sql(source, 'new')}; END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_delete AFTER DELETE ON {table} BEGIN {_delete_sql(source, 'old')}; END")
+    rebuild_search_index(cursor)
+    return True
+
+def ensure_search_index(conn):
+    """
+    Crée l'index plein texte s'il est absent alors que FTS5 est disponible : c'est le cas d'une
+    base dont la migration 4 a été jouée avec un SQLite sans FTS5, mis à jour depuis.
+    Appelée à chaque démarrage, en dehors des migrations versionnées. Retourne True si l'index a été créé.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'search_index'")
+    if cursor.fetchone() is not None or not is_fts5_available(cursor):
+        return False
+    try:
+        cursor.execute("BEGIN")
+        create_search_index(cursor)
+        conn.commit()
+        print("Index de recherche plein texte créé.")
+        return True
+    except sqlite3.Error as e:
+        print(f"Erreur lors de la création de l'index de recherche : {e}")
+        conn.rollback()
+        return False
+
+def rebuild_search_index(cursor):
+    """Vide et reconstruit entièrement l'index à partir des tables sources."""
+    cursor.execute("DELETE FROM search_index")
+    for source in SEARCH_SOURCES:
+        cursor.execute(f"INSERT INTO search_index (rowid, kind, ref_id, projet_id, title, body) "
+                       f"SELECT {_index_values(source, 'src')} FROM {source['table']} src")
+
+def _build_fts_query(text):
+    """Transforme la saisie de l'utilisateur en requête FTS5 sûre (mots entre guillemets, dernier mot en préfixe)."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+def search(text, limit=SEARCH_LIMIT):
+    """
+    Recherche un texte libre dans les transmissions, les rapports et les projets personnalisés.
+    Retourne une liste de dictionnaires triés par pertinence avec les clés :
+    kind, ref_id, projet_id, title, snippet (extrait avec les termes entre [ ]), date et label.
+    """
+    fts_query = _build_fts_query(text)
+    if fts_query is None:
+        return []
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'search_index'")
+            if cursor.fetchone() is None:
+                return []
+
+            cursor.execute("""
+                SELECT kind, ref_id, projet_id, title,
+                       snippet(search_index, 4, '[', ']', '…', 16) AS snippet
+                FROM search_index
+                WHERE search_index MATCH ?
+                ORDER BY bm25(search_index, 0, 0, 0, 2.0, 1.0)
+                LIMIT ?
+            """, (fts_query, limit))
+            results = [dict(row) for row in cursor.fetchall()]
+            _attach_context(cursor, results)
+            return results
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la recherche : {e}")
+            return []
+
+def _attach_context(cursor, results):
+    """Ajoute la date et le libellé (service ou jeune concerné) de chaque résultat, en une requête par type."""
+    def fetch(sql, ids):
+        if not ids: return {}
+        placeholders = ", ".join("?" for _ in ids)
+        cursor.execute(sql.format(placeholders=placeholders), list(ids))
+        return {row[0]: row for row in cursor.fetchall()}
+
+    transmissions = fetch("""
+        SELECT t.id, t.datetime_transmission, s.nom_service
+        FROM transmissions t JOIN services s ON t.service_id = s.id
+        WHERE t.id IN ({placeholders})
+    """, {r['ref_id'] for r in results if r['kind'] == 'transmission'})
+    reports = fetch("""
+        SELECT r.id, r.date_redaction, y.prenom, y.nom
+        FROM reports r JOIN youngs y ON r.young_id = y.id
+        WHERE r.id IN ({placeholders})
+    """, {r['ref_id'] for r in results if r['kind'] == 'report'})
+    projets = fetch("""
+        SELECT p.id, p.date_projet, y.prenom, y.nom
+        FROM projet_p p JOIN youngs y ON p.young_id = y.id
+        WHERE p.id IN ({placeholders})
+    """, {r['projet_id'] for r in results if r['projet_id'] is not None})
+
+    for result in results:
+        result['date'], result['label'] = None, ""
+        if result['kind'] == 'transmission':
+            row = transmissions.get(result['ref_id'])
+            if row: result['date'], result['label'] = row['datetime_transmission'], row['nom_service']
+            continue
+        row = reports.get(result['ref_id']) if result['kind'] == 'report' else projets.get(result['projet_id'])
+        if row:
+            result['date'] = row[1]
+            result['label'] = f"{row['prenom']} {row['nom'].upper()}"
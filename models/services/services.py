@@ -4,96 +4,90 @@
 print("\n[DIAGNOSTIC] >>> Le fichier 'models/services/services.py' est en cours de chargement.\n")
 
 import sqlite3
-from models.database.database import create_connection
+from models.database.database import get_connection
+from models.database.cache import cached_query, invalidate, uncached
 
 def get_all_services():
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, nom_service, adresse, telephone FROM services ORDER BY nom_service")
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des services : {e}")
-        return []
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, nom_service, adresse, telephone FROM services ORDER BY nom_service")
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des services : {e}")
+            return []
 
 def get_service_details(service_id):
-    conn = create_connection()
-    if conn is None: return None
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM services WHERE id = ?", (service_id,))
-        return cursor.fetchone()
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des détails du service : {e}")
-        return None
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return None
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM services WHERE id = ?", (service_id,))
+            return cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des détails du service : {e}")
+            return None
 
 def add_service(data):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        sql = '''INSERT INTO services(nom_service, adresse, telephone)
-                 VALUES(:nom_service, :adresse, :telephone)'''
-        cursor = conn.cursor()
-        cursor.execute(sql, data)
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        return "exists"
-    except sqlite3.Error as e:
-        print(f"Erreur lors de l'ajout du service : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            sql = '''INSERT INTO services(nom_service, adresse, telephone)
+                     VALUES(:nom_service, :adresse, :telephone)'''
+            cursor = conn.cursor()
+            cursor.execute(sql, data)
+            conn.commit()
+            invalidate('services', 'users', 'youngs')
+            return True
+        except sqlite3.IntegrityError:
+            return "exists"
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'ajout du service : {e}")
+            return False
 
 def update_service(service_id, data):
-    conn = create_connection()
-    if conn is None: return False
-    sql = '''UPDATE services SET nom_service = :nom_service, adresse = :adresse, telephone = :telephone
-             WHERE id = :id'''
-    data['id'] = service_id
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, data)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la mise à jour du service : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        sql = '''UPDATE services SET nom_service = :nom_service, adresse = :adresse, telephone = :telephone
+                 WHERE id = :id'''
+        data['id'] = service_id
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, data)
+            conn.commit()
+            invalidate('services', 'users', 'youngs')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la mise à jour du service : {e}")
+            return False
 
 def delete_service(service_id):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        cursor.execute("UPDATE users SET service_id = NULL WHERE service_id = ?", (service_id,))
-        cursor.execute("UPDATE youngs SET service_id = NULL WHERE service_id = ?", (service_id,))
-        cursor.execute("DELETE FROM services WHERE id = ?", (service_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la suppression du service : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE users SET service_id = NULL WHERE service_id = ?", (service_id,))
+            cursor.execute("UPDATE youngs SET service_id = NULL WHERE service_id = ?", (service_id,))
+            cursor.execute("UPDATE daily_rollup SET service_id = NULL WHERE service_id = ?", (service_id,))
+            cursor.execute("DELETE FROM services WHERE id = ?", (service_id,))
+            conn.commit()
+            invalidate('services', 'users', 'youngs')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression du service : {e}")
+            return False
 
+@cached_query('services')
 def get_all_services_for_form():
     """Récupère tous les services pour les utiliser dans un formulaire."""
     print("[DIAGNOSTIC] >>> Appel de la fonction 'get_all_services_for_form' dans services.py")
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, nom_service FROM services ORDER BY nom_service")
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des services : {e}")
-        return []
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return uncached([])
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, nom_service FROM services ORDER BY nom_service")
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des services : {e}")
+            return uncached([])
@@ -2,175 +2,164 @@
 # Description : Fonctions pour la gestion des tâches ponctuelles.
 
 import sqlite3
-from models.database.database import create_connection
+from models.database.database import get_connection
+from models.database.links import attach_linked_young_names, set_linked_youngs
 from datetime import date, timedelta
 
-def get_all_tasks_with_details(service_id=None):
+# Nombre de jours avant l'échéance à partir duquel une tâche devient urgente
+URGENT_DELAY_DAYS = 3
+
+def get_all_tasks_with_details(service_id=None, reference_date=None, urgent_only=False):
     """
-    Récupère toutes les tâches non réalisées.
+    Récupère toutes les tâches non réalisées, avec leur urgence calculée en SQL :
+    'en retard' (échéance dépassée), 'urgent' (échéance dans URGENT_DELAY_DAYS jours ou moins)
+    ou 'à faire' (échéance plus lointaine ou absente).
     Si service_id est fourni, filtre pour n'inclure que les tâches assignées
     à des utilisateurs de ce service ou les tâches assignées à "Tout le monde".
+    Si urgent_only est vrai, seules les tâches 'urgent' et 'en retard' sont renvoyées.
+    La date de référence est aujourd'hui par défaut.
     """
-    conn = create_connection()
-    if conn is None: return []
-    
-    today = date.today()
-    urgent_limit_date = today + timedelta(days=3)
-    
-    tasks = []
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        sql = """
-            SELECT id, tache_a_realiser, date_limite, user_id, statut 
-            FROM tasks 
-            WHERE statut != 'réalisée'
-        """
-        params = []
-        if service_id is not None:
-            sql += " AND (user_id IN (SELECT id FROM users WHERE service_id = ?) OR user_id IS NULL)"
-            params.append(service_id)
-        
-        sql += " ORDER BY CASE WHEN statut = 'réalisée' THEN 1 ELSE 0 END, date_limite ASC"
-        
-        cursor.execute(sql, tuple(params))
-        
-        task_list = [dict(row) for row in cursor.fetchall()]
-
-        for task in task_list:
-            # ... (la logique d'enrichissement des données reste la même) ...
-            if task['statut'] != 'réalisée':
-                if task['date_limite']:
-                    due_date = date.fromisoformat(task['date_limite'])
-                    if due_date <= urgent_limit_date: task['statut'] = 'urgent'
-                    else: task['statut'] = 'à faire'
-                else: task['statut'] = 'à faire'
-            # ... etc ...
-
-        return tasks
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des tâches : {e}")
-        return []
-    finally:
-        conn.close()
+    reference_date = reference_date or date.today()
+    if isinstance(reference_date, str):
+        reference_date = date.fromisoformat(reference_date)
+    today_iso = reference_date.isoformat()
+    urgent_limit_iso = (reference_date + timedelta(days=URGENT_DELAY_DAYS)).isoformat()
+
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            sql = """
+                SELECT
+                    t.id, t.tache_a_realiser, t.date_limite, t.user_id,
+                    CASE
+                        WHEN t.date_limite IS NULL OR t.date_limite = '' THEN 'à faire'
+                        WHEN t.date_limite < :today THEN 'en retard'
+                        WHEN t.date_limite <= :urgent_limit THEN 'urgent'
+                        ELSE 'à faire'
+                    END AS statut,
+                    COALESCE(u.prenom || ' ' || u.nom, 'Tout le monde') AS user_name
+                FROM tasks t
+                LEFT JOIN users u ON t.user_id = u.id
+                WHERE t.statut != 'réalisée'
+            """
+            params = {'today': today_iso, 'urgent_limit': urgent_limit_iso}
+            if service_id is not None:
+                sql += " AND (t.user_id IN (SELECT id FROM users WHERE service_id = :service_id) OR t.user_id IS NULL)"
+                params['service_id'] = service_id
+            if urgent_only:
+                sql += " AND t.date_limite IS NOT NULL AND t.date_limite != '' AND t.date_limite <= :urgent_limit"
+
+            sql += " ORDER BY t.date_limite ASC"
+
+            cursor.execute(sql, params)
+            tasks = [dict(row) for row in cursor.fetchall()]
+            return attach_linked_young_names(cursor, 'task_young_link', tasks, 'youngs_names', "Aucun")
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des tâches : {e}")
+            return []
 
 def get_task_details(task_id):
-    conn = create_connection()
-    if conn is None: return None, []
+    with get_connection() as conn:
+        if conn is None: return None, []
     
-    details = None
-    linked_youngs = []
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-        details_row = cursor.fetchone()
-        if details_row:
-            details = dict(details_row)
-
-        cursor.execute("SELECT young_id FROM task_young_link WHERE task_id = ?", (task_id,))
-        linked_youngs_rows = cursor.fetchall()
-        linked_youngs = [row['young_id'] for row in linked_youngs_rows]
-
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des détails de la tâche : {e}")
-    finally:
-        conn.close()
-    return details, linked_youngs
+        details = None
+        linked_youngs = []
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
+            details_row = cursor.fetchone()
+            if details_row:
+                details = dict(details_row)
+
+            cursor.execute("SELECT young_id FROM task_young_link WHERE task_id = ?", (task_id,))
+            linked_youngs_rows = cursor.fetchall()
+            linked_youngs = [row['young_id'] for row in linked_youngs_rows]
+
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des détails de la tâche : {e}")
+        return details, linked_youngs
 
 
 def add_task(data, young_ids):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        sql = '''INSERT INTO tasks (tache_a_realiser, date_limite, user_id, statut)
-                 VALUES (:tache_a_realiser, :date_limite, :user_id, 'à faire')'''
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            sql = '''INSERT INTO tasks (tache_a_realiser, date_limite, user_id, statut)
+                     VALUES (:tache_a_realiser, :date_limite, :user_id, 'à faire')'''
         
-        cursor.execute(sql, data)
-        task_id = cursor.lastrowid
+            cursor.execute(sql, data)
+            task_id = cursor.lastrowid
 
-        if task_id and young_ids:
-            for young_id in young_ids:
-                cursor.execute("INSERT INTO task_young_link (task_id, young_id) VALUES (?, ?)", (task_id, young_id))
+            set_linked_youngs(cursor, 'task_young_link', task_id, young_ids)
         
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de l'ajout de la tâche : {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'ajout de la tâche : {e}")
+            conn.rollback()
+            return False
 
 def update_task(task_id, data, young_ids):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        sql = '''UPDATE tasks SET tache_a_realiser = :tache_a_realiser,
-                                  date_limite = :date_limite,
-                                  user_id = :user_id
-                 WHERE id = :id'''
-        data['id'] = task_id
-        cursor.execute(sql, data)
-
-        cursor.execute("DELETE FROM task_young_link WHERE task_id = ?", (task_id,))
-        if young_ids:
-            for young_id in young_ids:
-                cursor.execute("INSERT INTO task_young_link (task_id, young_id) VALUES (?, ?)", (task_id, young_id))
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            sql = '''UPDATE tasks SET tache_a_realiser = :tache_a_realiser,
+                                      date_limite = :date_limite,
+                                      user_id = :user_id
+                     WHERE id = :id'''
+            data['id'] = task_id
+            cursor.execute(sql, data)
+
+            set_linked_youngs(cursor, 'task_young_link', task_id, young_ids)
         
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la mise à jour de la tâche : {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la mise à jour de la tâche : {e}")
+            conn.rollback()
+            return False
 
 def mark_task_as_done(task_id):
     """Met à jour le statut d'une tâche à 'réalisée'."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        cursor.execute("UPDATE tasks SET statut = 'réalisée' WHERE id = ?", (task_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la mise à jour de la tâche : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE tasks SET statut = 'réalisée' WHERE id = ?", (task_id,))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la mise à jour de la tâche : {e}")
+            return False
 
 def unmark_task_as_done(task_id):
     """Met à jour le statut d'une tâche de 'réalisée' à 'à faire'."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        cursor.execute("UPDATE tasks SET statut = 'à faire' WHERE id = ?", (task_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de l'annulation de la tâche : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE tasks SET statut = 'à faire' WHERE id = ?", (task_id,))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'annulation de la tâche : {e}")
+            return False
 
 def delete_task(task_id):
     """Supprime une tâche de la base de données."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la suppression de la tâche : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression de la tâche : {e}")
+            return False
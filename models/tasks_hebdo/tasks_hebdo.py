@@ -2,104 +2,125 @@
 # Description : Fonctions pour la gestion des tâches hebdomadaires.
 
 import sqlite3
-from models.database.database import create_connection
+from models.database.database import get_connection
+from models.database.cache import cached_query, invalidate, uncached
+
+# Jours tels qu'enregistrés dans tasks_hebdo.jour_semaine, dans l'ordre de date.weekday()
+WEEKDAYS = ['lundi', 'mardi', 'mercredi', 'jeudi', 'vendredi', 'samedi', 'dimanche']
+_WEEKDAY_ORDER_SQL = "CASE lower(jour_semaine) " + " ".join(f"WHEN '{day}' THEN {i}" for i, day in enumerate(WEEKDAYS)) + " ELSE 7 END"
 
 def get_tasks_for_day(day_name, service_id):
     """Récupère les tâches hebdomadaires pour un jour ET un service donnés."""
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, tache_hebdomadaire, jour_semaine FROM tasks_hebdo
-            WHERE jour_semaine = ? AND service_id = ?
-        """, (day_name.lower(), service_id))
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des tâches hebdomadaires : {e}")
-        return []
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return []
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, tache_hebdomadaire, jour_semaine FROM tasks_hebdo
+                WHERE jour_semaine = ? AND service_id = ?
+            """, (day_name.lower(), service_id))
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des tâches hebdomadaires : {e}")
+            return []
+
+@cached_query('tasks_hebdo')
+def get_week_schedule(service_id):
+    """
+    Récupère en une requête les tâches hebdomadaires d'un service pour toute la semaine.
+    Retourne une liste de 7 listes indexée comme date.weekday() (0 = lundi), chaque tâche
+    étant un tuple (id, tache_hebdomadaire, jour_semaine) comme pour get_tasks_for_day().
+    """
+    schedule = [[] for _ in WEEKDAYS]
+    with get_connection() as conn:
+        if conn is None: return uncached(schedule)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, tache_hebdomadaire, jour_semaine FROM tasks_hebdo
+                WHERE service_id = ? ORDER BY id
+            """, (service_id,))
+            for task in cursor.fetchall():
+                day = (task[2] or "").lower()
+                if day in WEEKDAYS:
+                    schedule[WEEKDAYS.index(day)].append(task)
+            return schedule
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération du planning hebdomadaire : {e}")
+            return uncached([[] for _ in WEEKDAYS])
 
 def get_all_hebdo_tasks():
     """Récupère toutes les tâches hebdomadaires pour les lister."""
-    conn = create_connection()
-    if conn is None:
-        return []
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, jour_semaine, tache_hebdomadaire FROM tasks_hebdo ORDER BY jour_semaine")
-        tasks = cursor.fetchall()
-        return tasks
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération de toutes les tâches hebdomadaires : {e}")
-        return []
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None:
+            return []
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT id, jour_semaine, tache_hebdomadaire FROM tasks_hebdo ORDER BY {_WEEKDAY_ORDER_SQL}, id")
+            tasks = cursor.fetchall()
+            return tasks
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération de toutes les tâches hebdomadaires : {e}")
+            return []
 
 def get_task_hebdo_details(task_id):
     """Récupère les détails d'une tâche hebdomadaire spécifique."""
-    conn = create_connection()
-    if conn is None: return None
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tasks_hebdo WHERE id = ?", (task_id,))
-        details = cursor.fetchone()
-        return dict(details) if details else None
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des détails de la tâche hebdo : {e}")
-        return None
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return None
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM tasks_hebdo WHERE id = ?", (task_id,))
+            details = cursor.fetchone()
+            return dict(details) if details else None
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des détails de la tâche hebdo : {e}")
+            return None
 
 def add_task_hebdo(data):
     """Ajoute une nouvelle tâche hebdomadaire avec un service associé."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        sql = '''INSERT INTO tasks_hebdo (jour_semaine, tache_hebdomadaire, service_id)
-                 VALUES (:jour_semaine, :tache_hebdomadaire, :service_id)'''
-        cursor.execute(sql, data)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de l'ajout de la tâche hebdomadaire : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            sql = '''INSERT INTO tasks_hebdo (jour_semaine, tache_hebdomadaire, service_id)
+                     VALUES (:jour_semaine, :tache_hebdomadaire, :service_id)'''
+            cursor.execute(sql, data)
+            conn.commit()
+            invalidate('tasks_hebdo')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'ajout de la tâche hebdomadaire : {e}")
+            return False
 
 def update_task_hebdo(task_id, data):
     """Met à jour une tâche hebdomadaire."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        sql = '''UPDATE tasks_hebdo SET jour_semaine = :jour_semaine, tache_hebdomadaire = :tache_hebdomadaire
-                 WHERE id = :id'''
-        data['id'] = task_id
-        cursor.execute(sql, data)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la mise à jour de la tâche hebdomadaire : {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            sql = '''UPDATE tasks_hebdo SET jour_semaine = :jour_semaine, tache_hebdomadaire = :tache_hebdomadaire
+                     WHERE id = :id'''
+            data['id'] = task_id
+            cursor.execute(sql, data)
+            conn.commit()
+            invalidate('tasks_hebdo')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la mise à jour de la tâche hebdomadaire : {e}")
+            conn.rollback()
+            return False
 
 def delete_task_hebdo(task_id):
     """Supprime une tâche hebdomadaire."""
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM tasks_hebdo WHERE id = ?", (task_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la suppression de la tâche hebdomadaire : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM tasks_hebdo WHERE id = ?", (task_id,))
+            conn.commit()
+            invalidate('tasks_hebdo')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression de la tâche hebdomadaire : {e}")
+            return False
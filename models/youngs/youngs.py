@@ -2,146 +2,183 @@
 # Description : Fonctions pour la gestion des jeunes suivis.
 
 import sqlite3
-from models.database.database import create_connection
+from models.database.database import get_connection
+from models.database.cache import cached_query, invalidate, uncached
+from models.daily_life.daily_life import refresh_daily_rollup_for_owner
 
+@cached_query('youngs')
 def get_all_youngs(service_id=None):
     """
     Récupère une liste simplifiée de tous les jeunes pour l'affichage,
     triée par ordre alphabétique (nom, puis prénom).
     Si service_id est fourni, filtre les résultats pour ce service.
     """
-    conn = create_connection()
-    if conn is None:
-        return []
-    try:
-        cursor = conn.cursor()
+    with get_connection() as conn:
+        if conn is None:
+            return uncached([])
+        try:
+            cursor = conn.cursor()
         
-        sql = """
-            SELECT y.id, y.nom, y.prenom, y.date_naissance, y.statut_accueil, u.nom as referent_nom, s.nom_service
-            FROM youngs y
-            LEFT JOIN users u ON y.referent_id = u.id
-            LEFT JOIN services s ON y.service_id = s.id
-        """
-        params = []
+            sql = """
+                SELECT y.id, y.nom, y.prenom, y.date_naissance, y.statut_accueil, u.nom as referent_nom, s.nom_service
+                FROM youngs y
+                LEFT JOIN users u ON y.referent_id = u.id
+                LEFT JOIN services s ON y.service_id = s.id
+            """
+            params = []
         
-        if service_id is not None:
-            sql += " WHERE y.service_id = ?"
-            params.append(service_id)
+            if service_id is not None:
+                sql += " WHERE y.service_id = ?"
+                params.append(service_id)
             
-        # CORRECTION: S'assurer que le tri est bien par nom puis prénom
-        sql += " ORDER BY y.nom, y.prenom"
+            # CORRECTION: S'assurer que le tri est bien par nom puis prénom
+            sql += " ORDER BY y.nom, y.prenom"
         
-        cursor.execute(sql, params)
-        youngs = cursor.fetchall()
-        return youngs
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des jeunes : {e}")
-        return []
-    finally:
-        conn.close()
+            cursor.execute(sql, params)
+            youngs = cursor.fetchall()
+            return youngs
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des jeunes : {e}")
+            return uncached([])
 
 # ... (les autres fonctions du fichier ne changent pas)
 
 def get_young_details(young_id):
-    conn = create_connection()
-    if conn is None: return None
-    try:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM youngs WHERE id = ?", (young_id,))
-        young_details = cursor.fetchone()
-        return dict(young_details) if young_details else None
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des détails du jeune : {e}")
-        return None
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return None
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM youngs WHERE id = ?", (young_id,))
+            young_details = cursor.fetchone()
+            return dict(young_details) if young_details else None
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des détails du jeune : {e}")
+            return None
+
+def _format_person(prenom, nom, person_id):
+    if not person_id: return "Aucun"
+    return f"{prenom} {nom.upper()}" if nom is not None else "Inconnu"
+
+def get_young_profile(young_id):
+    """
+    Récupère les détails d'un jeune avec, en une seule requête, les noms de son référent,
+    de son co-référent et de son service.
+    Retourne le dictionnaire de get_young_details() complété des clés 'referent_nom',
+    'co_referent_nom' et 'service_nom' ("Aucun" si non renseigné, "Inconnu" si introuvable).
+    """
+    with get_connection() as conn:
+        if conn is None: return None
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT y.*,
+                       r.prenom AS _referent_prenom, r.nom AS _referent_nom,
+                       c.prenom AS _co_referent_prenom, c.nom AS _co_referent_nom,
+                       s.nom_service AS _service_nom
+                FROM youngs y
+                LEFT JOIN users r ON y.referent_id = r.id
+                LEFT JOIN users c ON y.co_referent_id = c.id
+                LEFT JOIN services s ON y.service_id = s.id
+                WHERE y.id = ?
+            """, (young_id,))
+            row = cursor.fetchone()
+            if row is None: return None
+
+            profile = {key: row[key] for key in row.keys() if not key.startswith('_')}
+            profile['referent_nom'] = _format_person(row['_referent_prenom'], row['_referent_nom'], row['referent_id'])
+            profile['co_referent_nom'] = _format_person(row['_co_referent_prenom'], row['_co_referent_nom'], row['co_referent_id'])
+            if not row['service_id']: profile['service_nom'] = "Aucun"
+            else: profile['service_nom'] = row['_service_nom'] if row['_service_nom'] is not None else "Inconnu"
+            return profile
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération du profil du jeune : {e}")
+            return None
 
 def add_young(data):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join([':' + key for key in data.keys()])
-        sql = f'INSERT INTO youngs ({columns}) VALUES ({placeholders})'
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            columns = ', '.join(data.keys())
+            placeholders = ', '.join([':' + key for key in data.keys()])
+            sql = f'INSERT INTO youngs ({columns}) VALUES ({placeholders})'
         
-        cursor = conn.cursor()
-        cursor.execute(sql, data)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de l'ajout du jeune : {e}")
-        return False
-    finally:
-        conn.close()
+            cursor = conn.cursor()
+            cursor.execute(sql, data)
+            conn.commit()
+            invalidate('youngs')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'ajout du jeune : {e}")
+            return False
 
 def update_young(young_id, data):
-    conn = create_connection()
-    if conn is None: return False
+    with get_connection() as conn:
+        if conn is None: return False
     
-    sql_set_parts = [f"{key} = :{key}" for key in data.keys()]
-    sql = f"UPDATE youngs SET {', '.join(sql_set_parts)} WHERE id = :id"
-    data['id'] = young_id
+        sql_set_parts = [f"{key} = :{key}" for key in data.keys()]
+        sql = f"UPDATE youngs SET {', '.join(sql_set_parts)} WHERE id = :id"
+        data['id'] = young_id
 
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, data)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la mise à jour du jeune : {e}")
-        return False
-    finally:
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, data)
+            if 'service_id' in data:
+                # Les effectifs de la synthèse journalière sont ventilés par service
+                refresh_daily_rollup_for_owner(cursor, 'jeunes', young_id)
+            conn.commit()
+            invalidate('youngs')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la mise à jour du jeune : {e}")
+            return False
 
 def delete_young(young_id):
-    conn = create_connection()
-    if conn is None: return False
-    try:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM youngs WHERE id = ?", (young_id,))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la suppression du jeune : {e}")
-        return False
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM youngs WHERE id = ?", (young_id,))
+            refresh_daily_rollup_for_owner(cursor, 'jeunes', young_id)
+            conn.commit()
+            invalidate('youngs')
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression du jeune : {e}")
+            return False
 
+@cached_query('referents')
 def get_all_referents_for_form():
-    conn = create_connection()
-    if conn is None: return []
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, prenom, nom FROM users ORDER BY nom, prenom")
-        referents = cursor.fetchall()
-        return [(ref[0], f"{ref[1]} {ref[2].upper()}") for ref in referents]
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des référents : {e}")
-        return []
-    finally:
-        conn.close()
+    with get_connection() as conn:
+        if conn is None: return uncached([])
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, prenom, nom FROM users ORDER BY nom, prenom")
+            referents = cursor.fetchall()
+            return [(ref[0], f"{ref[1]} {ref[2].upper()}") for ref in referents]
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des référents : {e}")
+            return uncached([])
 
 def get_youngs_for_professional(user_id):
-    conn = create_connection()
-    if conn is None:
-        return {'referent_of': [], 'co_referent_of': []}
+    with get_connection() as conn:
+        if conn is None:
+            return {'referent_of': [], 'co_referent_of': []}
     
-    results = {'referent_of': [], 'co_referent_of': []}
-    try:
-        cursor = conn.cursor()
+        results = {'referent_of': [], 'co_referent_of': []}
+        try:
+            cursor = conn.cursor()
         
-        cursor.execute("SELECT prenom, nom FROM youngs WHERE referent_id = ? ORDER BY nom, prenom", (user_id,))
-        refs = cursor.fetchall()
-        results['referent_of'] = [f"{row[0]} {row[1].upper()}" for row in refs]
+            cursor.execute("SELECT prenom, nom FROM youngs WHERE referent_id = ? ORDER BY nom, prenom", (user_id,))
+            refs = cursor.fetchall()
+            results['referent_of'] = [f"{row[0]} {row[1].upper()}" for row in refs]
         
-        cursor.execute("SELECT prenom, nom FROM youngs WHERE co_referent_id = ? ORDER BY nom, prenom", (user_id,))
-        corefs = cursor.fetchall()
-        results['co_referent_of'] = [f"{row[0]} {row[1].upper()}" for row in corefs]
+            cursor.execute("SELECT prenom, nom FROM youngs WHERE co_referent_id = ? ORDER BY nom, prenom", (user_id,))
+            corefs = cursor.fetchall()
+            results['co_referent_of'] = [f"{row[0]} {row[1].upper()}" for row in corefs]
         
-        return results
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la récupération des références du professionnel : {e}")
-        return {'referent_of': [], 'co_referent_of': []}
-    finally:
-        conn.close()
+            return results
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des références du professionnel : {e}")
+            return {'referent_of': [], 'co_referent_of': []}
@@ -0,0 +1,122 @@
+# Fichier : tests/test_query_plans.py
+# Description : Vérifie avec EXPLAIN QUERY PLAN que les requêtes des modèles sur les tables
+#               volumineuses passent par un index et ne parcourent jamais une table entière.
+#               Travaille sur une base temporaire, jamais sur mecs_app.db.
+#               Usage : python -m unittest discover tests
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.database import database
+from models.database.links import get_linked_young_names, set_linked_youngs
+from models.transmissions.transmissions import get_transmissions_for_period, get_transmissions_for_young
+from models.events.events import get_events_for_period, get_events_for_young
+from models.daily_life.daily_life import (
+    get_presence_for_date, get_presence_summary, get_weekly_meal_summary,
+    get_meal_counts_for_date, get_meal_counts_for_range, refresh_daily_rollup_for_date,
+)
+
+# Instructions sans plan de requête
+_IGNORED_STATEMENTS = ('BEGIN', 'COMMIT', 'ROLLBACK', 'PRAGMA', 'SAVEPOINT', 'RELEASE')
+
+
+class QueryPlanTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.database_name = database.DATABASE_NAME
+        database.close_connection()
+        database.DATABASE_NAME = os.path.join(cls.directory.name, "plans.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.initialize_database()
+
+    @classmethod
+    def tearDownClass(cls):
+        database.close_connection()
+        database.DATABASE_NAME = cls.database_name
+        cls.directory.cleanup()
+
+    def query_plans(self, func, *args):
+        """
+        Exécute func(*args) en relevant ses requêtes (paramètres déjà remplacés par le traçage),
+        puis retourne {requête: [lignes du plan]}. Les écritures éventuelles sont annulées.
+        """
+        statements = []
+        with database.get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                func(*args)
+            finally:
+                conn.set_trace_callback(None)
+                conn.rollback()
+            plans = {}
+            for sql in statements:
+                if sql.lstrip().upper().startswith(_IGNORED_STATEMENTS):
+                    continue
+                plans[sql] = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        self.assertTrue(plans, f"Aucune requête exécutée par {func.__name__}")
+        return plans
+
+    def assertIndexedPlan(self, plans, *indexes):
+        """Échoue si une requête parcourt une table (SCAN) ou si un des index attendus n'est pas utilisé."""
+        for sql, plan in plans.items():
+            # Le parcours d'un résultat intermédiaire (sous-requête matérialisée) n'est pas celui d'une table
+            scans = [line for line in plan if line.startswith("SCAN ") and not line.startswith(("SCAN (", "SCAN CONSTANT"))]
+            self.assertFalse(scans, f"Parcours complet de table {scans} dans :\n{sql}")
+        used = "\n".join(line for plan in plans.values() for line in plan)
+        for index in indexes:
+            self.assertIn(f"INDEX {index} ", used)
+
+    def test_transmissions_for_period(self):
+        self.assertIndexedPlan(self.query_plans(get_transmissions_for_period, "2024-01-01", "2024-01-07", 1),
+                               "idx_transmissions_service_datetime")
+        self.assertIndexedPlan(self.query_plans(get_transmissions_for_period, "2024-01-01", "2024-01-07"),
+                               "idx_transmissions_datetime")
+
+    def test_events_for_period(self):
+        self.assertIndexedPlan(self.query_plans(get_events_for_period, "2024-01-01", "2024-01-07"),
+                               "idx_events_debut", "idx_event_recurrences_derniere")
+        self.assertIndexedPlan(self.query_plans(get_events_for_period, "2024-01-01", "2024-01-07", 1),
+                               "idx_events_debut")
+
+    def test_daily_presence_lookups(self):
+        self.assertIndexedPlan(self.query_plans(get_presence_for_date, "2024-01-01", 1),
+                               "idx_daily_presence_date_cover")
+        self.assertIndexedPlan(self.query_plans(get_presence_summary, "2024-01-01", "2024-03-31", 1),
+                               "idx_daily_presence_date_cover")
+
+    def test_link_table_lookups(self):
+        for link_table in ('event_young_link', 'task_young_link', 'transmission_young_link', 'trip_young_link'):
+            with self.subTest(link_table=link_table):
+                def lookups():
+                    with database.get_connection() as conn:
+                        cursor = conn.cursor()
+                        get_linked_young_names(cursor, link_table, [1, 2, 3])
+                        set_linked_youngs(cursor, link_table, 1, [1, 2])
+                self.assertIndexedPlan(self.query_plans(lookups), f"sqlite_autoindex_{link_table}_1")
+        # Recherches inverses, du jeune vers les éléments liés
+        self.assertIndexedPlan(self.query_plans(get_transmissions_for_young, 1), "idx_transmission_young_link_young")
+        self.assertIndexedPlan(self.query_plans(get_events_for_young, 1), "idx_event_young_link_young")
+
+    def test_rollup_lookups(self):
+        self.assertIndexedPlan(self.query_plans(get_weekly_meal_summary, "2024-01-01", "2024-03-31", 1), "idx_daily_rollup_date")
+        self.assertIndexedPlan(self.query_plans(get_meal_counts_for_date, "2024-01-01"), "idx_daily_rollup_date")
+        self.assertIndexedPlan(self.query_plans(get_meal_counts_for_range, "2024-01-01", "2024-03-31", 1), "idx_daily_rollup_date")
+
+    def test_rollup_refresh(self):
+        def refresh():
+            with database.get_connection() as conn:
+                refresh_daily_rollup_for_date(conn.cursor(), "2024-01-01")
+        self.assertIndexedPlan(self.query_plans(refresh), "idx_daily_rollup_date", "idx_daily_presence_date_cover")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# Fichier : tests/test_search.py
+# Description : Vérifie que la suppression d'un projet personnalisé ou de ses objectifs ne laisse
+#               ni moyens orphelins ni résultats de recherche (les clés étrangères ne sont pas appliquées).
+#               Travaille sur une base temporaire, jamais sur mecs_app.db.
+#               Usage : python -m unittest discover tests
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.database import database
+from models.projet_p.projet_p import add_or_update_projet, delete_projet, get_projet_details
+from models.search.search import search
+
+
+class ProjetSearchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.database_name = database.DATABASE_NAME
+        database.close_connection()
+        database.DATABASE_NAME = os.path.join(cls.directory.name, "search.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.initialize_database()
+        with database.get_connection() as conn:
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'search_index'").fetchone() is None:
+                raise unittest.SkipTest("FTS5 indisponible : pas d'index de recherche")
+
+    @classmethod
+    def tearDownClass(cls):
+        database.close_connection()
+        database.DATABASE_NAME = cls.database_name
+        cls.directory.cleanup()
+
+    def create_projet(self, objectifs):
+        """Crée un jeune et son projet avec les objectifs donnés, puis retourne l'id du projet."""
+        with database.get_connection() as conn:
+            young_id = conn.execute("INSERT INTO youngs (nom, prenom, statut_accueil) VALUES ('Martin', 'Léo', 'accueilli')").lastrowid
+            conn.commit()
+        data = {'date_projet': '2026-01-15', 'young_id': young_id, 'rappel_situation': None,
+                'attentes_jeune': None, 'attentes_famille': None, 'objectifs': objectifs}
+        self.assertIs(add_or_update_projet(dict(data)), True)
+        with database.get_connection() as conn:
+            projet_id = conn.execute("SELECT id FROM projet_p WHERE young_id = ?", (young_id,)).fetchone()[0]
+        self.data = data
+        return projet_id
+
+    def save_objectifs(self, projet_id, objectifs):
+        self.assertIs(add_or_update_projet(dict(self.data, objectifs=objectifs), projet_id), True)
+
+    def count_orphans(self):
+        with database.get_connection() as conn:
+            return conn.execute("""
+                SELECT (SELECT COUNT(*) FROM projet_p_objectifs WHERE projet_p_id NOT IN (SELECT id FROM projet_p))
+                     + (SELECT COUNT(*) FROM projet_p_moyens WHERE objectif_id NOT IN (SELECT id FROM projet_p_objectifs))
+            """).fetchone()[0]
+
+    def test_delete_projet_removes_objectifs_moyens_and_search_entries(self):
+        projet_id = self.create_projet([{'objectif': "Gagner en autonomie", 'categorie': 'Quotidien', 'evaluation': None,
+                                         'moyens': ["Atelier autonomie cuisine"]}])
+        self.assertTrue(search("autonomie"))
+
+        self.assertTrue(delete_projet(projet_id))
+
+        self.assertEqual(search("autonomie"), [])
+        self.assertEqual(self.count_orphans(), 0)
+
+    def test_removed_objectif_takes_its_moyens_along(self):
+        projet_id = self.create_projet([
+            {'objectif': "Reprendre une scolarité", 'categorie': 'Scolarité', 'evaluation': None, 'moyens': ["Inscription au collège"]},
+            {'objectif': "Pratiquer un sport", 'categorie': 'Loisirs', 'evaluation': None, 'moyens': ["Séances de natation"]},
+        ])
+        kept = get_projet_details(projet_id)['objectifs'][0]
+
+        self.save_objectifs(projet_id, [dict(kept)])
+
+        self.assertEqual(search("natation"), [])
+        self.assertEqual(self.count_orphans(), 0)
+
+        # Le nouvel objectif peut reprendre l'identifiant du retiré : il ne doit pas hériter de ses moyens
+        self.save_objectifs(projet_id, [dict(kept), {'objectif': "Découvrir un métier", 'categorie': 'Insertion', 'evaluation': None, 'moyens': []}])
+        objectifs = get_projet_details(projet_id)['objectifs']
+        self.assertEqual([obj['moyens'] for obj in objectifs], [["Inscription au collège"], []])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 # Fichier : utils/date_util.py
 # Description : Fonctions utilitaires pour la manipulation des dates.
 
-from datetime import datetime
+from datetime import datetime, date, timedelta
 
 def format_date_to_french(date_str):
     """
@@ -50,6 +50,25 @@ def format_date_to_iso(date_str):
     except (ValueError, TypeError):
         return None
 
+def iso_day_range(start_date, end_date):
+    """
+    Convertit une période de jours inclusifs en bornes ISO semi-ouvertes [début, fin[.
+    Permet de filtrer une colonne date/heure texte par 'col >= ? AND col < ?',
+    ce qui reste utilisable par un index (contrairement à DATE(col) BETWEEN ? AND ?).
+
+    Args:
+        start_date (str | date): Premier jour inclus, 'AAAA-MM-JJ' ou objet date.
+        end_date (str | date): Dernier jour inclus, 'AAAA-MM-JJ' ou objet date.
+
+    Returns:
+        tuple: ('AAAA-MM-JJ' du premier jour, 'AAAA-MM-JJ' du lendemain du dernier jour).
+    """
+    if isinstance(start_date, str):
+        start_date = date.fromisoformat(start_date)
+    if isinstance(end_date, str):
+        end_date = date.fromisoformat(end_date)
+    return start_date.isoformat(), (end_date + timedelta(days=1)).isoformat()
+
 # --- Exemples d'utilisation ---
 if __name__ == '__main__':
     iso_date = "2023-10-27"
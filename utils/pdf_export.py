@@ -6,7 +6,6 @@ from tkinter import filedialog, messagebox
 from datetime import datetime
 from . import date_util
 from models.youngs.youngs import get_young_details
-from models.permissions.permissions import get_user_details
 import os
 
 # --- Chemin d'accès direct au fichier de police ---
@@ -109,20 +108,17 @@ def export_report_to_pdf(report_details):
     pdf.set_title("Rapport Éducatif")
     pdf.add_page()
     
-    young_details = get_young_details(report_details['young_id'])
-    author_details = get_user_details(report_details['redacteur_id'])
-    validator_details = get_user_details(report_details['validateur_id']) if report_details.get('validateur_id') else None
-
-    young_name = f"{young_details.get('prenom', '')} {young_details.get('nom', '').upper()}" if young_details else "Inconnu"
-    author_name = f"{author_details[2]} {author_details[1].upper()}" if author_details else "Inconnu"
-    validator_name = f"{validator_details[2]} {validator_details[1].upper()}" if validator_details else "Non validé"
+    # Jeune, rédacteur et validateur sont déjà joints au rapport (voir get_report_for_export)
+    young_name = f"{report_details['young_prenom']} {report_details['young_nom'].upper()}" if report_details.get('young_nom') else "Inconnu"
+    author_name = f"{report_details['author_prenom']} {report_details['author_nom'].upper()}" if report_details.get('author_nom') else "Inconnu"
+    validator_name = f"{report_details['validator_prenom']} {report_details['validator_nom'].upper()}" if report_details.get('validator_nom') else "Non validé"
 
     pdf.chapter_title("Informations Générales")
     info = {
         "Jeune concerné": young_name,
-        "Date de naissance": date_util.format_date_to_french(young_details.get('date_naissance')),
-        "Date d'entrée": date_util.format_date_to_french(young_details.get('date_entree')),
-        "Type de placement": young_details.get('type_placement'),
+        "Date de naissance": date_util.format_date_to_french(report_details.get('young_date_naissance')),
+        "Date d'entrée": date_util.format_date_to_french(report_details.get('young_date_entree')),
+        "Type de placement": report_details.get('young_type_placement'),
         "Type de rapport": report_details['type_rapport'],
         "Date de validation": date_util.format_date_to_french(report_details['date_redaction']),
         "Rédigé par": author_name,